@@ -1,4 +1,7 @@
 # main.py
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -8,12 +11,59 @@ from routes.tarifas import tarifas
 from routes.cuotas import cuotas
 from routes.pagos import pagos          
 from routes.notificaciones import notificaciones
+from routes.admin import admin
+from routes.exportar import exportar
+from routes.reportes import reportes
 
 
+from config.db import DB_ASYNC, cerrar_async_engine, engine, medir_atraso_en_segundo_plano, read_engine
 from config.init_db import init_db
+from config.settings import settings
+from services.outbox import despachar_en_segundo_plano
+from services.planificador import planificar_en_segundo_plano
+
+if settings.metricas_habilitadas:
+    from routes.metricas import metricas
+    from services.metricas import MetricasMiddleware, volcar_en_segundo_plano
+if settings.consultas_presupuesto != "off":
+    from services.presupuesto_consultas import PresupuestoConsultasMiddleware
+if read_engine is not None and settings.leer_escrituras_propias:
+    from services.lectura_replica import LecturaReplicaMiddleware
+
+
+# 🚀 Arranque/cierre: nada toca la base al importar el módulo
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Si la base no responde o el esquema está desactualizado, el worker no arranca
+    await asyncio.to_thread(init_db)
+
+    detener = asyncio.Event()
+    en_segundo_plano = []
+    # 🔔 Despachador del outbox de notificaciones (uno por worker; se reparten los eventos)
+    if settings.outbox_habilitado:
+        en_segundo_plano.append(asyncio.create_task(despachar_en_segundo_plano(detener)))
+    # ⏰ Tareas periódicas: cada turno lo ejecuta un solo worker (advisory lock + jobs_ejecuciones)
+    if settings.scheduler_habilitado:
+        en_segundo_plano.append(asyncio.create_task(planificar_en_segundo_plano(detener)))
+    # 🪞 Atraso de la réplica: se mide acá y no dentro de los requests que leen de ella
+    if read_engine is not None:
+        en_segundo_plano.append(asyncio.create_task(medir_atraso_en_segundo_plano(detener)))
+    # 📈 Con varios workers cada uno vuelca sus métricas a METRICAS_DIR y /metrics las combina
+    if settings.metricas_habilitadas and settings.metricas_dir:
+        en_segundo_plano.append(asyncio.create_task(volcar_en_segundo_plano(detener)))
 
+    yield
 
-api_escu = FastAPI(title="ApiEscuela", version="2.0")
+    detener.set()
+    await asyncio.gather(*en_segundo_plano)
+    engine.dispose()
+    if read_engine is not None:
+        read_engine.dispose()
+    # El engine async se crea recién en la primera request con DB_ASYNC=1
+    await cerrar_async_engine()
+
+
+api_escu = FastAPI(title="ApiEscuela", version="2.0", lifespan=lifespan)
 
 # Middleware CORS
 api_escu.add_middleware(
@@ -24,15 +74,37 @@ api_escu.add_middleware(
     allow_headers=["*"],
 )
 
+# 📖 Réplica de lectura: tras escribir, la sesión lee del primario hasta que la réplica la alcance
+if read_engine is not None and settings.leer_escrituras_propias:
+    api_escu.add_middleware(LecturaReplicaMiddleware)
+
+# 🧮 Presupuesto de consultas y detector de N+1 (sólo desarrollo/tests: CONSULTAS_PRESUPUESTO=log|raise)
+if settings.consultas_presupuesto != "off":
+    api_escu.add_middleware(PresupuestoConsultasMiddleware)
+
+# 📈 Métricas: se agrega al final para quedar por fuera de todo y medir el request completo
+if settings.metricas_habilitadas:
+    api_escu.add_middleware(MetricasMiddleware)
+
 
-init_db()
+# ⚡ Con DB_ASYNC=1 las rutas calientes async se registran primero y tienen prioridad
+if DB_ASYNC:
+    from routes.user_async import user_async
+    from routes.pagos_async import pagos_async
 
+    api_escu.include_router(user_async)
+    api_escu.include_router(pagos_async)
 
 api_escu.include_router(user)
 api_escu.include_router(tarifas)
 api_escu.include_router(cuotas)
 api_escu.include_router(pagos)
 api_escu.include_router(notificaciones)
+api_escu.include_router(admin)
+api_escu.include_router(exportar)
+api_escu.include_router(reportes)
+if settings.metricas_habilitadas:
+    api_escu.include_router(metricas)
 
 
 @api_escu.get("/")
@@ -0,0 +1,115 @@
+# auth/contrasenas.py
+# Hash de contraseñas con Argon2id en un pool acotado de hilos.
+# argon2-cffi libera el GIL mientras calcula, así que varios hilos sí escalan
+# con los núcleos; el pool limita cuántos hashes corren a la vez para que una
+# ráfaga de logins no deje sin CPU al resto de los requests.
+import asyncio
+import hmac
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
+from fastapi import HTTPException
+
+from config.settings import settings
+
+_PREFIJO_ARGON2 = "$argon2"
+
+hasher = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_kib,
+    parallelism=settings.argon2_parallelism,
+)
+
+_pool = ThreadPoolExecutor(max_workers=settings.hash_workers, thread_name_prefix="hash")
+# Tope de trabajos en cola + en curso; por encima se rechaza en vez de encolar sin fin
+_cupos = threading.BoundedSemaphore(settings.hash_workers * settings.hash_cola_por_worker)
+
+
+# Hash de relleno para usuarios inexistentes: el login verifica contra él y tarda lo
+# mismo que con un usuario real, así el tiempo de respuesta no revela qué nombres existen.
+# Se calcula una vez, al primer uso, para no sumar un hash al arranque de cada worker.
+_hash_relleno: Optional[str] = None
+_lock_relleno = threading.Lock()
+
+
+def hash_relleno() -> str:
+    global _hash_relleno
+    if _hash_relleno is None:
+        with _lock_relleno:
+            if _hash_relleno is None:
+                _hash_relleno = hasher.hash(secrets.token_urlsafe(32))
+    return _hash_relleno
+
+
+def hashear(password: str) -> str:
+    return hasher.hash(password)
+
+
+def verificar(almacenado: str, password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Devuelve (coincide, hash_nuevo). hash_nuevo no es None cuando hay que
+    actualizar la fila: contraseña heredada en texto plano o parámetros de
+    Argon2 distintos a los configurados.
+    """
+    if not almacenado.startswith(_PREFIJO_ARGON2):
+        # Filas heredadas en texto plano: se comparan en tiempo constante y se migran.
+        # Si no coincide igual se paga un Argon2, para que el tiempo de respuesta no
+        # delate qué cuentas siguen en texto plano.
+        if hmac.compare_digest(almacenado.encode(), password.encode()):
+            return True, hasher.hash(password)
+        try:
+            hasher.verify(hash_relleno(), password)
+        except (VerifyMismatchError, VerificationError, InvalidHashError):
+            pass
+        return False, None
+
+    try:
+        hasher.verify(almacenado, password)
+    except (VerifyMismatchError, VerificationError, InvalidHashError):
+        return False, None
+    return True, (hasher.hash(password) if hasher.check_needs_rehash(almacenado) else None)
+
+
+def _enviar(funcion, *args):
+    if not _cupos.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Demasiados inicios de sesión simultáneos, reintentá en unos segundos",
+            headers={"Retry-After": "2"},
+        )
+    try:
+        futuro = _pool.submit(funcion, *args)
+    except BaseException:
+        # Sin futuro no hay callback que devuelva el cupo (p. ej. pool ya cerrado)
+        _cupos.release()
+        raise
+    futuro.add_done_callback(lambda _f: _cupos.release())
+    return futuro
+
+
+def _verificar_usuario(almacenado: Optional[str], password: str) -> Tuple[bool, Optional[str]]:
+    if almacenado is None:
+        # Usuario inexistente: mismo trabajo de Argon2 y siempre rechazado
+        verificar(hash_relleno(), password)
+        return False, None
+    return verificar(almacenado, password)
+
+
+def verificar_en_pool(almacenado: Optional[str], password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Versión bloqueante para handlers sync (ya corren en el threadpool de Starlette).
+    Con almacenado=None (el usuario no existe) verifica contra el hash de relleno.
+    """
+    return _enviar(_verificar_usuario, almacenado, password).result()
+
+
+async def verificar_async(almacenado: Optional[str], password: str) -> Tuple[bool, Optional[str]]:
+    return await asyncio.wrap_future(_enviar(_verificar_usuario, almacenado, password))
+
+
+def hashear_en_pool(password: str) -> str:
+    return _enviar(hashear, password).result()
@@ -1,15 +1,87 @@
 import jwt
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status, Header, Depends
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from config.settings import settings
 from models.user import User
 from zoneinfo import ZoneInfo
 
 # Para verificar tipo en dependencias
 from fastapi import Request
 
+class CacheTokens:
+    """
+    LRU acotado de payloads ya verificados, indexado por el SHA-256 del token.
+    Cada entrada vence con el `exp` del token. revocar() la descarta y anota el
+    digest en una lista de revocados hasta ese mismo `exp` (la lista no depende
+    del tamaño de la caché y vive en la memoria de cada worker).
+    """
+
+    def __init__(self, maximo: int):
+        self.maximo = maximo
+        self._entradas: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._revocados: Dict[bytes, float] = {}   # digest -> exp
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clave(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def obtener(self, token: str) -> Optional[Dict[str, Any]]:
+        if not self.maximo:
+            return None
+        clave = self._clave(token)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            payload, expira = entrada
+            if expira is not None and expira <= time.time():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+        return dict(payload)
+
+    def guardar(self, token: str, payload: Dict[str, Any]):
+        if not self.maximo:
+            return
+        expira = payload.get("exp")
+        with self._lock:
+            self._entradas[self._clave(token)] = (dict(payload), float(expira) if expira is not None else None)
+            self._entradas.move_to_end(self._clave(token))
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+    def revocar(self, token: str, expira: float):
+        clave = self._clave(token)
+        ahora = time.time()
+        with self._lock:
+            self._entradas.pop(clave, None)
+            # Los tokens ya vencidos los rechaza jwt.decode: no hace falta recordarlos
+            for vencido in [c for c, exp in self._revocados.items() if exp <= ahora]:
+                del self._revocados[vencido]
+            self._revocados[clave] = expira
+
+    def revocado(self, token: str) -> bool:
+        if not self._revocados:
+            return False
+        with self._lock:
+            expira = self._revocados.get(self._clave(token))
+        return expira is not None and expira > time.time()
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+
 class Seguridad:
-    secret = "tu_clave_secreta"  # ⚠️ En producción, pasalo a variable de entorno
+    secret = settings.jwt_secret  # se lee una sola vez (JWT_SECRET)
+    cache = CacheTokens(settings.jwt_cache_max)
 
     @classmethod
     def generar_token(cls, user: User) -> str:
@@ -23,6 +95,7 @@ class Seguridad:
                 "type": getattr(user.userdetail, "type", None) or "Desconocido",
                 "exp": ahora + timedelta(days=1),
                 "iat": ahora,
+                "jti": secrets.token_hex(8),  # dos logins en el mismo segundo no comparten token
             }
             token = jwt.encode(payload, cls.secret, algorithm="HS256")
             if isinstance(token, bytes):
@@ -48,9 +121,17 @@ class Seguridad:
                     detail="Formato de token incorrecto. Se espera 'Bearer <token>'."
                 )
 
-            payload = jwt.decode(token, cls.secret, algorithms=["HS256"])
+            if cls.cache.revocado(token):
+                raise HTTPException(status_code=401, detail="Token revocado.")
+
+            payload = cls.cache.obtener(token)
+            if payload is None:
+                payload = jwt.decode(token, cls.secret, algorithms=["HS256"])
+                cls.cache.guardar(token, payload)
             return payload
 
+        except HTTPException:
+            raise
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token expirado.")
         except jwt.DecodeError:
@@ -69,6 +150,15 @@ class Seguridad:
                 detail="Error interno del servidor al verificar el token."
             )
 
+    @classmethod
+    def revocar_token(cls, token: str):
+        """Rechaza el token hasta su `exp` (logout); se descarta también de la caché."""
+        try:
+            expira = jwt.decode(token, cls.secret, algorithms=["HS256"], options={"verify_exp": False})["exp"]
+        except (jwt.InvalidTokenError, KeyError):
+            expira = time.time() + timedelta(days=1).total_seconds()  # vida máxima de un token
+        cls.cache.revocar(token, float(expira))
+
 # Dependencia general
 async def obtener_usuario_desde_token(authorization: str = Header(...)) -> Dict[str, Any]:
     headers = {"authorization": authorization}
@@ -0,0 +1,78 @@
+"""
+Presupuesto de arranque: tiempo de `import app` y del lifespan (init_db).
+
+Mide en subprocesos limpios (sin caché de módulos) y falla (exit 1) si se
+supera el presupuesto. Con --detalle lista los módulos más caros según
+`python -X importtime`.
+
+Uso (desde ApiEscBack1/):
+    python -m benchmarks.bench_arranque --import-ms 1500 --arranque-ms 2500
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+_MEDIR_IMPORT = "import time; t = time.perf_counter(); import app; print((time.perf_counter() - t) * 1000)"
+
+_MEDIR_ARRANQUE = """
+import time
+t = time.perf_counter()
+import app
+from fastapi.testclient import TestClient
+with TestClient(app.api_escu):
+    pass
+print((time.perf_counter() - t) * 1000)
+"""
+
+
+def _medir(codigo: str, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", codigo], capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()
+        tiempos.append(float(salida[-1]))
+    return statistics.median(tiempos)
+
+
+def _modulos_mas_caros(cantidad: int):
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"], capture_output=True, text=True
+    )
+    filas = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        # "import time:  propio |  acumulado | módulo" (microsegundos)
+        _propio, acumulado, modulo = linea[len("import time:"):].split("|", 2)
+        filas.append((int(acumulado), modulo.rstrip()))
+    for acumulado, modulo in sorted(filas, reverse=True)[:cantidad]:
+        print(f"  {acumulado / 1000:8.1f} ms  {modulo}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import-ms", type=float, default=1500.0, help="presupuesto para `import app`")
+    parser.add_argument("--arranque-ms", type=float, default=2500.0, help="presupuesto para import + lifespan")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--detalle", type=int, default=0, help="mostrar los N módulos más caros")
+    args = parser.parse_args()
+
+    importacion = _medir(_MEDIR_IMPORT, args.repeticiones)
+    arranque = _medir(_MEDIR_ARRANQUE, args.repeticiones)
+
+    print(f"import app:        {importacion:7.1f} ms (presupuesto {args.import_ms:.0f} ms)")
+    print(f"import + lifespan: {arranque:7.1f} ms (presupuesto {args.arranque_ms:.0f} ms)")
+    if args.detalle:
+        print("Módulos más caros (acumulado):")
+        _modulos_mas_caros(args.detalle)
+
+    excedido = importacion > args.import_ms or arranque > args.arranque_ms
+    if excedido:
+        print("❌ Presupuesto de arranque excedido")
+    sys.exit(1 if excedido else 0)
+
+
+if __name__ == "__main__":
+    main()
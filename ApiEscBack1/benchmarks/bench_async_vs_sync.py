@@ -0,0 +1,105 @@
+"""
+Benchmark: rutas calientes sync (SessionLocal + threadpool) vs async (AsyncSession).
+
+Levanta dos apps en proceso (sin uvicorn) con los mismos routers y dispara
+N clientes concurrentes contra /user/profile y /pagos/mis usando httpx + ASGI.
+
+Uso (desde ApiEscBack1/, con una base ya cargada):
+    python -m benchmarks.bench_async_vs_sync --usuario alumno1 --password 1234 --clientes 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+import config.init_db  # noqa: F401  (registra todos los modelos en el mapper)
+from routes.user import user
+from routes.user_async import user_async
+from routes.pagos import pagos
+from routes.pagos_async import pagos_async
+
+
+def crear_app(modo: str) -> FastAPI:
+    app = FastAPI(title=f"bench-{modo}")
+    if modo == "async":
+        app.include_router(user_async)
+        app.include_router(pagos_async)
+    app.include_router(user)
+    app.include_router(pagos)
+    return app
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    idx = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[idx]
+
+
+async def correr(modo: str, args) -> dict:
+    app = crear_app(modo)
+    transporte = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        login = await cliente.post(
+            "/user/loginUser", json={"username": args.usuario, "password": args.password}
+        )
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['token']}"}
+
+        latencias = []
+        errores = 0
+        cola = asyncio.Queue()
+        for i in range(args.peticiones):
+            cola.put_nowait(args.rutas[i % len(args.rutas)])
+
+        async def cliente_worker():
+            nonlocal errores
+            while True:
+                try:
+                    ruta = cola.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                inicio = time.perf_counter()
+                resp = await cliente.get(ruta, headers=headers)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                if resp.status_code >= 400:
+                    errores += 1
+
+        inicio_total = time.perf_counter()
+        await asyncio.gather(*(cliente_worker() for _ in range(args.clientes)))
+        total = time.perf_counter() - inicio_total
+
+    return {
+        "modo": modo,
+        "peticiones": len(latencias),
+        "errores": errores,
+        "rps": len(latencias) / total if total else 0.0,
+        "p50_ms": percentil(latencias, 50),
+        "p99_ms": percentil(latencias, 99),
+        "media_ms": statistics.fmean(latencias) if latencias else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuario", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--clientes", type=int, default=200)
+    parser.add_argument("--peticiones", type=int, default=4000)
+    parser.add_argument("--rutas", nargs="+", default=["/user/profile", "/pagos/mis"])
+    args = parser.parse_args()
+
+    for modo in ("sync", "async"):
+        r = asyncio.run(correr(modo, args))
+        print(
+            f"{r['modo']:>5}: {r['peticiones']} req, {r['errores']} errores, "
+            f"{r['rps']:.0f} req/s, p50 {r['p50_ms']:.1f} ms, p99 {r['p99_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
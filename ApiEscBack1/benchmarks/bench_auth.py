@@ -0,0 +1,49 @@
+"""
+Micro-benchmark del costo de autenticación por request (auth.seguridad).
+
+Compara jwt.decode en cada llamada (caché desactivada) contra la caché de
+tokens verificados, presentando el mismo token una y otra vez como hace el
+dashboard.
+
+Uso (desde ApiEscBack1/):
+    python -m benchmarks.bench_auth --iteraciones 50000
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+from auth.seguridad import Seguridad, CacheTokens
+
+
+def _medir(iteraciones: int, token: str) -> float:
+    header = {"authorization": f"Bearer {token}"}
+    Seguridad.verificar_token(header)  # calentamiento
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        Seguridad.verificar_token(header)
+    return (time.perf_counter() - inicio) / iteraciones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iteraciones", type=int, default=50000)
+    args = parser.parse_args()
+
+    usuario = SimpleNamespace(id=1, username="bench", userdetail=SimpleNamespace(type="Admin"))
+    token = Seguridad.generar_token(usuario)
+
+    cache_original = Seguridad.cache
+    try:
+        Seguridad.cache = CacheTokens(0)
+        sin_cache = _medir(args.iteraciones, token)
+        Seguridad.cache = CacheTokens(4096)
+        con_cache = _medir(args.iteraciones, token)
+    finally:
+        Seguridad.cache = cache_original
+
+    print(f"sin caché: {sin_cache:7.2f} µs/request")
+    print(f"con caché: {con_cache:7.2f} µs/request  ({sin_cache / con_cache:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark de la búsqueda de usuarios del panel admin.
+
+Compara el filtro anterior (ILIKE '%termino%' con OR sobre el outer join) contra
+services.busqueda_usuarios (índices trigram + f_unaccent en Postgres).
+
+Uso (desde ApiEscBack1/):
+    python -m benchmarks.bench_busqueda --sembrar 50000 --repeticiones 50
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import insert, select, func
+from sqlalchemy.orm import joinedload
+
+from config.db import SessionLocal, engine
+from config.init_db import init_db
+from models.user import User
+from models.userDetail import UserDetail
+from services.busqueda_usuarios import buscar_usuarios
+
+NOMBRES = ["José", "María", "Lucía", "Martín", "Sofía", "Tomás", "Valentina", "Joaquín", "Agustín", "Camila"]
+APELLIDOS = ["Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "Gómez", "Díaz", "Sánchez", "Ramírez"]
+TERMINOS = ["jose", "PEREZ", "gonz", "maria.lopez", "usuario4217", "tomas diaz", "zzz-sin-resultados"]
+
+
+def sembrar(cantidad: int):
+    rnd = random.Random(42)
+    with engine.begin() as conn:
+        base = conn.scalar(select(func.coalesce(func.max(User.id), 0)))
+        usuarios = [
+            {"id": base + i + 1, "username": f"usuario{base + i + 1}", "password": "x"}
+            for i in range(cantidad)
+        ]
+        conn.execute(insert(User), usuarios)
+        detalles = []
+        for u in usuarios:
+            nombre, apellido = rnd.choice(NOMBRES), rnd.choice(APELLIDOS)
+            detalles.append({
+                "dni": 10_000_000 + u["id"],
+                "firstName": nombre,
+                "lastName": apellido,
+                "type": "Alumno",
+                "email": f"{nombre.lower()}.{apellido.lower()}{u['id']}@escuela.test",
+                "user_id": u["id"],
+            })
+        conn.execute(insert(UserDetail), detalles)
+    print(f"Sembrados {cantidad} usuarios")
+
+
+def busqueda_ilike(db, termino: str, limite: int = 20):
+    like = f"%{termino}%"
+    return (
+        db.query(User)
+        .outerjoin(User.userdetail)
+        .options(joinedload(User.userdetail))
+        .filter(
+            (User.username.ilike(like)) |
+            (UserDetail.email.ilike(like)) |
+            (UserDetail.firstName.ilike(like)) |
+            (UserDetail.lastName.ilike(like))
+        )
+        .order_by(User.id.asc())
+        .limit(limite)
+        .all()
+    )
+
+
+def medir(nombre: str, funcion, repeticiones: int):
+    with SessionLocal() as db:
+        tiempos = []
+        for _ in range(repeticiones):
+            for termino in TERMINOS:
+                inicio = time.perf_counter()
+                funcion(db, termino)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    print(
+        f"{nombre:>10}: p50 {statistics.median(tiempos):.2f} ms, "
+        f"p95 {tiempos[int(len(tiempos) * 0.95) - 1]:.2f} ms, max {tiempos[-1]:.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sembrar", type=int, default=0, help="usuarios a insertar antes de medir")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    if args.sembrar:
+        sembrar(args.sembrar)
+
+    with SessionLocal() as db:
+        print(f"Usuarios en la base: {db.scalar(select(func.count(User.id)))}")
+
+    medir("ilike", busqueda_ilike, args.repeticiones)
+    medir("trigram", lambda db, t: buscar_usuarios(db, t), args.repeticiones)
+
+
+if __name__ == "__main__":
+    main()
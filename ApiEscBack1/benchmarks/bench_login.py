@@ -0,0 +1,104 @@
+"""
+Ráfaga de logins contra /user/loginUser (inicio de cuatrimestre).
+
+Crea (opcionalmente) N alumnos con contraseña hasheada y dispara logins
+concurrentes en proceso vía httpx + ASGI, reportando p50/p99 y throughput.
+Los parámetros de Argon2 y el tamaño del pool se toman de la configuración
+(ARGON2_TIME_COST, ARGON2_MEMORY_KIB, HASH_WORKERS, ...).
+
+Uso (desde ApiEscBack1/):
+    python -m benchmarks.bench_login --sembrar 500 --logins 2000 --clientes 200
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert, select, func
+
+import config.init_db  # noqa: F401  (registra todos los modelos en el mapper)
+from auth.contrasenas import hashear
+from config.db import engine
+from config.settings import settings
+from models.user import User
+from models.userDetail import UserDetail
+from routes.user import user
+
+PASSWORD = "clave-bench"
+
+
+def sembrar(cantidad: int) -> list:
+    hash_comun = hashear(PASSWORD)
+    with engine.begin() as conn:
+        base = conn.scalar(select(func.coalesce(func.max(User.id), 0)))
+        usuarios = [
+            {"id": base + i + 1, "username": f"login_bench_{base + i + 1}", "password": hash_comun}
+            for i in range(cantidad)
+        ]
+        conn.execute(insert(User), usuarios)
+        conn.execute(insert(UserDetail), [
+            {
+                "dni": 20_000_000 + u["id"],
+                "firstName": "Bench",
+                "lastName": str(u["id"]),
+                "type": "Alumno",
+                "email": f"{u['username']}@escuela.test",
+                "user_id": u["id"],
+            }
+            for u in usuarios
+        ])
+    return [u["username"] for u in usuarios]
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+async def rafaga(usernames: list, logins: int, clientes: int):
+    app = FastAPI()
+    app.include_router(user)
+    transporte = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    latencias, codigos = [], {}
+    pendientes = iter(range(logins))
+
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        async def worker():
+            for i in pendientes:
+                inicio = time.perf_counter()
+                resp = await cliente.post(
+                    "/user/loginUser",
+                    json={"username": usernames[i % len(usernames)], "password": PASSWORD},
+                )
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                codigos[resp.status_code] = codigos.get(resp.status_code, 0) + 1
+
+        inicio_total = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clientes)))
+        total = time.perf_counter() - inicio_total
+
+    print(
+        f"{logins} logins, {clientes} clientes, {settings.hash_workers} hilos de hash "
+        f"(argon2 t={settings.argon2_time_cost} m={settings.argon2_memory_kib} KiB)"
+    )
+    print(f"  códigos: {codigos}")
+    print(
+        f"  {logins / total:.0f} logins/s, p50 {percentil(latencias, 50):.1f} ms, "
+        f"p99 {percentil(latencias, 99):.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sembrar", type=int, default=200, help="alumnos de prueba a crear")
+    parser.add_argument("--logins", type=int, default=2000)
+    parser.add_argument("--clientes", type=int, default=200)
+    args = parser.parse_args()
+
+    usernames = sembrar(args.sembrar)
+    asyncio.run(rafaga(usernames, args.logins, args.clientes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Generación de recordatorios (services/recordatorios.py) sobre muchas cuotas.
+
+Crea alumnos de prueba con N cuotas que vencen entre hoy y la ventana más
+grande, y mide cuánto tarda generar_recordatorios (INSERT … SELECT + UPDATE).
+La generación corre en una transacción que se descarta, así que se puede repetir
+sobre los mismos datos; la carga inicial sí queda guardada.
+
+Uso (desde ApiEscBack1/):
+    python -m benchmarks.bench_recordatorios --cuotas 50000
+    python -m benchmarks.bench_recordatorios --sin-sembrar      # reusar la carga anterior
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select, func
+
+import config.init_db  # noqa: F401  (registra todos los modelos en el mapper)
+from config.db import SessionLocal, engine
+from models.cuota import Cuota
+from models.user import User
+from models.userDetail import UserDetail
+from services.recordatorios import generar_recordatorios, ventanas_configuradas
+
+CUOTAS_POR_ALUMNO = 12
+
+
+def sembrar(cantidad: int, dias: int):
+    hoy = date.today()
+    alumnos = -(-cantidad // CUOTAS_POR_ALUMNO)
+    with engine.begin() as conn:
+        base = conn.scalar(select(func.coalesce(func.max(User.id), 0)))
+        ids = range(base + 1, base + alumnos + 1)
+        conn.execute(insert(User), [
+            {"id": i, "username": f"reco_bench_{i}", "password": "-"} for i in ids
+        ])
+        conn.execute(insert(UserDetail), [
+            {
+                "dni": 40_000_000 + i,
+                "firstName": "Reco",
+                "lastName": str(i),
+                "type": "Alumno",
+                "email": f"reco_bench_{i}@escuela.test",
+                "user_id": i,
+            }
+            for i in ids
+        ])
+        conn.execute(insert(Cuota), [
+            {
+                "alumno_id": alumno_id,
+                "periodo": f"2090-{mes:02d}",
+                "fecha_vencimiento": hoy + timedelta(days=(alumno_id + mes) % (dias + 1)),
+                "monto_base": 1000,
+                "ajuste_anterior": 0,
+                "monto_a_pagar": 1000,
+                "monto_pagado": 0,
+                "saldo_pendiente": 1000,
+                "estado": "pendiente",
+                "notificada": False,
+            }
+            for alumno_id in ids
+            for mes in range(1, CUOTAS_POR_ALUMNO + 1)
+        ][:cantidad])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cuotas", type=int, default=50000)
+    parser.add_argument("--sin-sembrar", action="store_true", help="no crear cuotas nuevas")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    ventanas = ventanas_configuradas()
+    if not args.sin_sembrar:
+        inicio = time.perf_counter()
+        sembrar(args.cuotas, ventanas[-1])
+        print(f"Carga de {args.cuotas} cuotas: {time.perf_counter() - inicio:.1f} s")
+
+    for _ in range(args.repeticiones):
+        with SessionLocal() as db:
+            inicio = time.perf_counter()
+            resumen = generar_recordatorios(db)
+            transcurrido = time.perf_counter() - inicio
+            db.rollback()
+        print(
+            f"ventanas {resumen['ventanas']}: {resumen['cuotas']} cuotas, "
+            f"{resumen['notificaciones']} notificaciones en {transcurrido * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Serialización de listados grandes: tiempo por respuesta y bytes.
+
+Carga N pagos (por defecto 10 000) de un alumno en una SQLite en memoria con
+los modelos de la app y los devuelve por tres caminos, todos con
+response_model=List[PagoOut]:
+
+  antes    objetos Pago + joinedload(Pago.cuota) y un dict armado a mano por
+           fila, que después FastAPI vuelve a validar (lo que hacía /pagos/mis)
+  orjson   lo mismo con response_class=ORJSONResponse
+  ahora    filas de columnas (services.pagos.consulta_pagos_out) devueltas tal
+           cual: se validan una vez y pydantic-core las escribe directo a bytes
+
+Cada pedido incluye la consulta, como en la ruta real. Después se mide sólo
+la codificación (validar + JSON) de las mismas filas, sin consulta ni ASGI.
+
+No usa la base configurada, pero config.db arma su engine al importarse: alcanza
+con DATABASE_URL=sqlite://.
+
+Uso (desde ApiEscBack1/):
+    DATABASE_URL=sqlite:// python -m benchmarks.bench_serializacion --filas 10000 --repeticiones 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import warnings
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import FastAPIDeprecationWarning
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.pool import StaticPool
+
+import config.init_db  # noqa: F401  (registra todos los modelos en el mapper)
+from config.db import metadata
+from models.cuota import Cuota
+from models.pago import Pago
+from models.user import User
+from schemas.pago import PagoOut
+from services.pagos import consulta_pagos_out
+
+warnings.filterwarnings("ignore", category=FastAPIDeprecationWarning)  # ORJSONResponse
+
+ALUMNO_ID = 1
+
+
+def sembrar(cantidad: int) -> Session:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    metadata.create_all(engine)
+    inicio = datetime(2025, 1, 1, 9, 30)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": ALUMNO_ID, "username": "bench", "password": "-"}])
+        conn.execute(insert(Cuota), [
+            {
+                "id": m,
+                "alumno_id": ALUMNO_ID,
+                "periodo": f"{2000 + m // 12}-{m % 12 + 1:02d}",
+                "fecha_vencimiento": date(2000 + m // 12, m % 12 + 1, 10),
+                "monto_base": 1000,
+                "ajuste_anterior": 0,
+                "monto_a_pagar": 1000,
+                "monto_pagado": 0,
+                "saldo_pendiente": 1000,
+                "estado": "pendiente",
+                "notificada": False,
+            }
+            for m in range(1, 301)
+        ])
+        conn.execute(insert(Pago), [
+            {
+                "id": i,
+                "alumno_id": ALUMNO_ID,
+                "cuota_id": i % 300 + 1,
+                "monto_pagado": Decimal("12345.67") + i,
+                "metodo": ("efectivo", "transferencia", "tarjeta")[i % 3],
+                "comprobante": f"TRX-{i:08d}" if i % 4 else None,
+                "fecha_pago": inicio + timedelta(minutes=7 * i),
+                "registrado_por": ALUMNO_ID,
+            }
+            for i in range(1, cantidad + 1)
+        ])
+    return Session(engine)
+
+
+def como_dicts(pagos) -> List[dict]:
+    return [
+        {
+            "id": p.id,
+            "alumno_id": p.alumno_id,
+            "cuota_id": p.cuota_id,
+            "monto_pagado": float(p.monto_pagado),
+            "fecha_pago": p.fecha_pago.strftime("%Y-%m-%d"),
+            "metodo": p.metodo,
+            "comprobante": p.comprobante,
+            "periodo": p.cuota.periodo if p.cuota else "Sin período",
+        }
+        for p in pagos
+    ]
+
+
+def crear_app(db: Session, limite: int) -> FastAPI:
+    app = FastAPI()
+
+    def objetos():
+        db.expunge_all()  # sin identity map tibio: cada pedido hidrata sus objetos, como en la ruta real
+        return (
+            db.query(Pago)
+            .options(joinedload(Pago.cuota))
+            .filter(Pago.alumno_id == ALUMNO_ID)
+            .order_by(Pago.fecha_pago.desc(), Pago.id.desc())
+            .limit(limite)
+            .all()
+        )
+
+    @app.get("/antes", response_model=List[PagoOut])
+    def antes():
+        return como_dicts(objetos())
+
+    @app.get("/orjson", response_model=List[PagoOut], response_class=ORJSONResponse)
+    def con_orjson():
+        return como_dicts(objetos())
+
+    @app.get("/ahora", response_model=List[PagoOut])
+    def ahora():
+        return db.execute(
+            consulta_pagos_out(ALUMNO_ID).order_by(Pago.fecha_pago.desc(), Pago.id.desc()).limit(limite)
+        ).all()
+
+    return app
+
+
+async def medir(app: FastAPI, ruta: str, repeticiones: int):
+    transporte = httpx.ASGITransport(app=app)
+    tiempos = []
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        await cliente.get(ruta)  # calentamiento
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            respuesta = await cliente.get(ruta)
+            tiempos.append(time.perf_counter() - inicio)
+            respuesta.raise_for_status()
+    return tiempos, len(respuesta.content)
+
+
+def cronometrar(funcion, repeticiones: int):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000, len(resultado)
+
+
+def percentil(tiempos, p: float) -> float:
+    orden = sorted(tiempos)
+    return orden[min(len(orden) - 1, int(len(orden) * p))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    db = sembrar(args.filas)
+    app = crear_app(db, args.filas)
+
+    print(f"{args.filas} pagos, {args.repeticiones} pedidos por camino (consulta + serialización)\n")
+    print(f"{'camino':<8} {'p50 ms':>9} {'p95 ms':>9} {'bytes':>11}")
+    base = None
+    for ruta in ("/antes", "/orjson", "/ahora"):
+        tiempos, tamanio = asyncio.run(medir(app, ruta, args.repeticiones))
+        p50 = statistics.median(tiempos) * 1000
+        base = base or p50
+        print(f"{ruta[1:]:<8} {p50:>9.1f} {percentil(tiempos, 0.95):>9.1f} {tamanio:>11,}   x{base / p50:.2f}")
+
+    # Sólo codificación, desde lo que cada ruta ya tiene en memoria
+    adaptador = TypeAdapter(List[PagoOut])
+    db.expunge_all()
+    objetos = (
+        db.query(Pago).options(joinedload(Pago.cuota)).filter(Pago.alumno_id == ALUMNO_ID).limit(args.filas).all()
+    )
+    filas = db.execute(consulta_pagos_out(ALUMNO_ID).limit(args.filas)).all()
+    caminos = {
+        "objetos -> dicts -> json.dumps": lambda: json.dumps(
+            jsonable_encoder(adaptador.validate_python(como_dicts(objetos)))
+        ).encode(),
+        "objetos -> dicts -> dump_json": lambda: adaptador.dump_json(adaptador.validate_python(como_dicts(objetos))),
+        "filas -> dump_json": lambda: adaptador.dump_json(adaptador.validate_python(filas, from_attributes=True)),
+    }
+    print(f"\nSólo codificación de {args.filas} filas (json.dumps = FastAPI sin response_model rápido)")
+    for nombre, funcion in caminos.items():
+        ms, tamanio = cronometrar(funcion, args.repeticiones)
+        print(f"  {nombre:<32} {ms:>8.1f} ms {tamanio:>11,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Catálogo de escenarios de benchmarks/suite.py: un pedido representativo por
+endpoint de la app, con el rol que lo hace y cómo arma parámetros y cuerpo.
+
+Los escenarios de escritura modifican la base sembrada (pagos nuevos, cuotas
+de períodos futuros, ...); para comparar baselines conviene volver a sembrar.
+Los que consumen filas (eliminar un pago o un usuario) las crean antes de
+medir con `preparar`, fuera del tiempo medido.
+"""
+import itertools
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, joinedload
+
+from auth.seguridad import Seguridad
+from benchmarks.generador import CLAVE
+from models.cuota import Cuota
+from models.pago import Pago
+from models.user import User
+from models.userDetail import UserDetail
+from services.pagos import recalcular_saldos
+from services.recaudacion import Movimiento, acumular_recaudacion
+from services.saldos import refrescar_saldos
+
+TERMINOS = ["gonzalez", "MARIA", "perez lucia", "alumno0001", "zzz-sin-resultados"]
+
+
+@dataclass
+class Contexto:
+    """Datos de la base sembrada que necesitan los escenarios."""
+    tokens: Dict[str, str]
+    alumno_id: int              # alumno que consulta (y paga) en los escenarios de alumno
+    alumno_escritura: int       # alumno al que se le crean cuotas sueltas
+    cuota_id: int               # cuota abierta de alumno_id
+    pago_id: int                # pago de alumno_id que se edita
+    usernames: List[str]
+    hoy: date
+    ultimo_periodo: str
+    periodos_historicos: int
+    lote_csv: bytes
+    descartables: Dict[str, list] = field(default_factory=dict)
+    contador: itertools.count = field(default_factory=itertools.count)
+
+
+@dataclass
+class Escenario:
+    metodo: str
+    ruta: str                                   # como en el OpenAPI: /pagos/eliminar/{pago_id}
+    rol: Optional[str] = None                   # "admin", "alumno" o None (sin token)
+    pedido: Callable[[Contexto], dict] = lambda ctx: {}
+    esperado: Tuple[int, ...] = (200,)
+    repeticiones: Optional[int] = None          # tope por escenario (pedidos caros o que crecen la base)
+    calentamiento: Optional[int] = None
+    peso: int = 0                               # participación en el modo carga (0 = no participa)
+    preparar: Optional[Callable[[Session, Contexto, int], list]] = None
+
+    @property
+    def nombre(self) -> str:
+        return f"{self.metodo} {self.ruta}"
+
+
+def _siguiente_periodo(periodo: str) -> str:
+    anio, mes = (int(p) for p in periodo.split("-"))
+    return f"{anio + mes // 12}-{mes % 12 + 1:02d}"
+
+
+def _ultimo_mes(ctx: Contexto) -> dict:
+    return {"desde": (ctx.hoy - timedelta(days=30)).isoformat(), "hasta": ctx.hoy.isoformat()}
+
+
+# 🧪 Fixtures que se consumen
+def _pagos_descartables(db: Session, ctx: Contexto, cantidad: int) -> List[int]:
+    """Pagos de $1 sobre la cuota abierta, aplicados a saldos y recaudación como un alta real."""
+    ahora = datetime.now()
+    ids = db.scalars(
+        insert(Pago).returning(Pago.id),
+        [
+            {
+                "alumno_id": ctx.alumno_id,
+                "cuota_id": ctx.cuota_id,
+                "monto_pagado": Decimal("1.00"),
+                "metodo": "efectivo",
+                "comprobante": f"BENCH-ELIMINAR-{i}",
+                "fecha_pago": ahora,
+                "registrado_por": ctx.alumno_id,
+            }
+            for i in range(cantidad)
+        ],
+    ).all()
+    recalcular_saldos(db, [ctx.cuota_id])
+    refrescar_saldos(db, [ctx.alumno_id])
+    periodo = db.scalar(select(Cuota.periodo).where(Cuota.id == ctx.cuota_id))
+    acumular_recaudacion(db, [Movimiento(ahora, periodo, "efectivo", Decimal("1.00"), cantidad)])
+    return list(ids)
+
+
+def _usuarios_descartables(db: Session, ctx: Contexto, cantidad: int) -> List[int]:
+    base = db.scalar(select(func.coalesce(func.max(User.id), 0)))
+    ids = [base + i + 1 for i in range(cantidad)]
+    db.execute(insert(User), [{"id": i, "username": f"bench_tmp_{i}", "password": "-"} for i in ids])
+    db.execute(insert(UserDetail), [
+        {
+            "dni": 90_000_000 + i,
+            "firstName": "Temporal",
+            "lastName": str(i),
+            "type": "Alumno",
+            "email": f"bench_tmp_{i}@escuela.test",
+            "user_id": i,
+        }
+        for i in ids
+    ])
+    return ids
+
+
+def _tokens_descartables(db: Session, ctx: Contexto, cantidad: int) -> List[str]:
+    """Tokens propios del alumno de referencia: el logout revoca cada uno (necesita el mismo JWT_SECRET)."""
+    alumno = db.scalars(select(User).options(joinedload(User.userdetail)).where(User.id == ctx.alumno_id)).one()
+    return [Seguridad.generar_token(alumno) for _ in range(cantidad)]
+
+
+def _tomar(ctx: Contexto, nombre: str):
+    return ctx.descartables[nombre].pop()
+
+
+# 📋 Catálogo (el orden es el de ejecución: lecturas primero, lo destructivo al final)
+ESCENARIOS: List[Escenario] = [
+    Escenario("GET", "/", peso=1),
+
+    # 👤 Usuarios
+    Escenario("GET", "/user/profile", "alumno", peso=3),
+    Escenario(
+        "POST", "/user/paginated/filtered-sync", "admin", peso=1,
+        pedido=lambda ctx: {"json": {"limit": 50, "last_seen_id": 0, "search": "gonz"}},
+    ),
+    Escenario(
+        "GET", "/user/buscar", "admin", peso=2,
+        pedido=lambda ctx: {"params": {"q": TERMINOS[next(ctx.contador) % len(TERMINOS)], "limit": 20}},
+    ),
+    Escenario("GET", "/user/alumnos", "admin", peso=1, pedido=lambda ctx: {"params": {"limit": 50}}),
+    Escenario("GET", "/user/ultimo", "admin", peso=1),
+
+    # 💲 Tarifas
+    Escenario("GET", "/tarifas/", peso=1),
+    Escenario("GET", "/tarifas/vigente", peso=2),
+
+    # 🧾 Cuotas
+    Escenario("GET", "/cuotas/", peso=2, pedido=lambda ctx: {"params": {"estado": "vencida", "limit": 50}}),
+    Escenario("GET", "/cuotas/resumen", "admin", peso=1, pedido=lambda ctx: {"params": {"top": 20}}),
+    Escenario(
+        "GET", "/cuotas/resumen/{alumno_id}", "alumno", peso=3,
+        pedido=lambda ctx: {"url": f"/cuotas/resumen/{ctx.alumno_id}"},
+    ),
+
+    # 💳 Pagos
+    Escenario("GET", "/pagos/mis", "alumno", peso=4, pedido=lambda ctx: {"params": {"limit": 50}}),
+    Escenario("GET", "/pagos/eliminados", "admin", peso=1, pedido=lambda ctx: {"params": {"limit": 50}}),
+    Escenario("GET", "/pagos/ultimo", "admin", peso=1),
+
+    # 🔔 Notificaciones y administración
+    Escenario("GET", "/notificaciones/listar", "admin", repeticiones=5),
+    Escenario("GET", "/admin/db/pool", "admin", peso=1),
+    Escenario("GET", "/admin/outbox", "admin", peso=1),
+    Escenario("GET", "/admin/jobs", "admin", peso=1),
+
+    # 📊 Reportes y exportaciones
+    Escenario(
+        "GET", "/reportes/recaudacion", "admin", peso=1,
+        pedido=lambda ctx: {"params": {"desde": (ctx.hoy - timedelta(days=90)).isoformat(), "hasta": ctx.hoy.isoformat()}},
+    ),
+    Escenario("GET", "/export/pagos", "admin", repeticiones=5, pedido=lambda ctx: {"params": _ultimo_mes(ctx)}),
+    Escenario("GET", "/export/cuotas", "admin", repeticiones=5, pedido=lambda ctx: {"params": _ultimo_mes(ctx)}),
+    Escenario(
+        "GET", "/export/notificaciones", "admin", repeticiones=5,
+        pedido=lambda ctx: {"params": {**_ultimo_mes(ctx), "formato": "ndjson"}},
+    ),
+
+    # ✍️ Escrituras
+    Escenario(
+        "POST", "/user/loginUser", peso=1, repeticiones=20,
+        pedido=lambda ctx: {"json": {
+            "username": ctx.usernames[next(ctx.contador) % len(ctx.usernames)], "password": CLAVE,
+        }},
+    ),
+    Escenario(
+        "POST", "/pagos/nuevo", "alumno", peso=2,
+        pedido=lambda ctx: {"json": {
+            "alumno_id": ctx.alumno_id, "cuota_id": ctx.cuota_id, "monto_pagado": "1.00", "metodo": "efectivo",
+        }},
+    ),
+    Escenario(
+        "PATCH", "/pagos/editar/{pago_id}", "admin",
+        pedido=lambda ctx: {
+            "url": f"/pagos/editar/{ctx.pago_id}",
+            "json": {"metodo": ("efectivo", "transferencia")[next(ctx.contador) % 2]},
+        },
+    ),
+    Escenario(
+        "POST", "/pagos/lote", "admin", repeticiones=10,
+        pedido=lambda ctx: {
+            "params": {"dry_run": "true"},
+            "files": {"archivo": ("lote.csv", ctx.lote_csv, "text/csv")},
+        },
+    ),
+    Escenario(
+        "POST", "/tarifas/",
+        esperado=(201,),
+        # Tarifas de un pasado lejano: no cambian la vigente, pero invalidan su caché
+        pedido=lambda ctx: {"json": {
+            "monto_mensual": 1000, "vigente_desde": "1990-01-01", "vigente_hasta": "1990-01-31", "creado_por": 1,
+        }},
+    ),
+    Escenario(
+        "POST", "/cuotas/",
+        # Períodos históricos sobre un alumno aparte, para no tocar al de las consultas
+        pedido=lambda ctx: {"json": _cuota_suelta(ctx)},
+    ),
+    Escenario(
+        "POST", "/cuotas/generar-periodo", "admin", repeticiones=2, calentamiento=0,
+        # Cada pedido genera el mes siguiente para todos los alumnos, como en producción
+        pedido=lambda ctx: {"json": _proximo_periodo(ctx)},
+    ),
+    Escenario(
+        "POST", "/notificaciones/recordatorios", "admin", esperado=(200, 404), repeticiones=5,
+    ),
+    Escenario("POST", "/admin/db/pool/reiniciar", "admin"),
+    Escenario(
+        "POST", "/admin/jobs/{nombre}/ejecutar", "admin", esperado=(200, 409), repeticiones=5, calentamiento=0,
+        pedido=lambda ctx: {"url": "/admin/jobs/vencidas/ejecutar"},
+    ),
+    Escenario(
+        "POST", "/user/logout",
+        preparar=_tokens_descartables,
+        pedido=lambda ctx: {"headers": {"Authorization": f"Bearer {_tomar(ctx, 'POST /user/logout')}"}},
+    ),
+    Escenario(
+        "POST", "/user/register/full", "admin",
+        pedido=lambda ctx: {"json": {"username": f"bench_alta_{datetime.now():%H%M%S%f}", "password": CLAVE}},
+    ),
+
+    # 🗑️ Bajas (consumen filas creadas por `preparar`)
+    Escenario(
+        "DELETE", "/pagos/eliminar/{pago_id}", "admin",
+        preparar=_pagos_descartables,
+        pedido=lambda ctx: {
+            "url": f"/pagos/eliminar/{_tomar(ctx, 'DELETE /pagos/eliminar/{pago_id}')}",
+            "json": {"motivo": "benchmark"},
+        },
+    ),
+    Escenario(
+        "DELETE", "/user/{user_id}", "admin",
+        preparar=_usuarios_descartables,
+        pedido=lambda ctx: {"url": f"/user/{_tomar(ctx, 'DELETE /user/{user_id}')}"},
+    ),
+]
+
+
+def _cuota_suelta(ctx: Contexto) -> dict:
+    n = ctx.periodos_historicos + next(ctx.contador)
+    return {
+        "alumno_id": ctx.alumno_escritura,
+        "periodo": f"{1000 + n // 12:04d}-{n % 12 + 1:02d}",
+        "fecha_vencimiento": "2000-01-10",
+        "monto_base": 0,
+        "monto_a_pagar": 0,
+    }
+
+
+def _proximo_periodo(ctx: Contexto) -> dict:
+    ctx.ultimo_periodo = _siguiente_periodo(ctx.ultimo_periodo)
+    anio, mes = (int(p) for p in ctx.ultimo_periodo.split("-"))
+    return {"periodo": ctx.ultimo_periodo, "fecha_vencimiento": date(anio, mes, 10).isoformat()}
+
+
+def alumno_de_referencia(db: Session) -> Tuple[int, str]:
+    """El primer alumno con pagos: es el que inicia sesión en los escenarios de alumno."""
+    fila = db.execute(
+        select(User.id, User.username)
+        .where(User.id == select(func.min(Pago.alumno_id)).scalar_subquery())
+    ).first()
+    if fila is None:
+        raise RuntimeError("La base no tiene pagos: sembrala primero (python -m benchmarks.suite sembrar)")
+    return fila.id, fila.username
+
+
+def armar_contexto(db: Session, tokens: Dict[str, str]) -> Contexto:
+    alumno_id, _ = alumno_de_referencia(db)
+    alumno_escritura = db.scalar(
+        select(UserDetail.user_id).where(UserDetail.type == "Alumno").order_by(UserDetail.user_id.desc()).limit(1)
+    )
+
+    cuota_id = db.scalar(
+        select(Cuota.id)
+        .where(Cuota.alumno_id == alumno_id)
+        .order_by((Cuota.estado == "pagada"), Cuota.periodo.desc())
+        .limit(1)
+    )
+    pago_id = db.scalar(select(func.min(Pago.id)).where(Pago.alumno_id == alumno_id))
+
+    # Lote de pagos para el dry run: 200 filas sobre cuotas existentes
+    filas = db.execute(select(Cuota.id, Cuota.monto_a_pagar).order_by(Cuota.id).limit(200)).all()
+    lote_csv = "cuota_id,monto_pagado,metodo,comprobante\n" + "".join(
+        f"{c},{m},transferencia,LOTE-{c}\n" for c, m in filas
+    )
+
+    return Contexto(
+        tokens=tokens,
+        alumno_id=alumno_id,
+        alumno_escritura=alumno_escritura,
+        cuota_id=cuota_id,
+        pago_id=pago_id,
+        usernames=list(db.scalars(
+            select(User.username).join(UserDetail, UserDetail.user_id == User.id)
+            .where(UserDetail.type == "Alumno").order_by(User.id).limit(100)
+        )),
+        hoy=date.today(),
+        ultimo_periodo=db.scalar(select(func.max(Cuota.periodo))),
+        periodos_historicos=db.scalar(select(func.count()).select_from(Cuota).where(Cuota.periodo < "2000-01")),
+        lote_csv=lote_csv.encode(),
+    )
@@ -0,0 +1,469 @@
+"""
+Generador de datos sintéticos del dominio para planificación de capacidad y benchmarks.
+
+Arma una base que se parece a la de producción:
+  - alumnos con su UserDetail; la mayoría desde el primer mes, algunos ingresan después
+  - historial de tarifas (una por semestre, con aumento) y cuotas mensuales que
+    toman la tarifa vigente y arrastran el saldo anterior, como /cuotas/generar-periodo
+  - pagos según el perfil del alumno: puntuales, en partes, atrasados, que dejan de
+    pagar; sólo los anteriores a --hasta
+  - pagos cargados por duplicado y eliminados (pagos_eliminados)
+  - las notificaciones que habrían generado los recordatorios (ventanas 7, 3 y 1 días)
+    y el outbox (pago registrado / eliminado), con los mismos textos
+Al final rearma saldo_alumno y recaudacion_diaria desde lo cargado.
+
+Es determinístico: cada alumno sale de un generador con semilla (semilla, id de
+alumno), así que los datos no dependen de cuántos procesos se usen. Carga con
+COPY en Postgres (psycopg2 o psycopg 3) y con executemany en el resto, en lotes,
+sin pasar por el ORM. Con --procesos N los alumnos se reparten en N tramos que se
+cargan en paralelo, cada uno con su conexión (en SQLite se usa un solo proceso).
+
+Uso (desde ApiEscBack1/):
+    python -m benchmarks.generador --escala grande
+    python -m benchmarks.generador --alumnos 200000 --meses 24 --procesos 8 --semilla 7
+    python -m benchmarks.generador --alumnos 5000 --hasta 2026-06-30 --vaciar
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+import config.init_db  # noqa: F401  (registra todos los modelos en el mapper)
+from auth.contrasenas import hashear
+from config.db import engine, metadata
+from config.migraciones import migrar
+from models.cuota import Cuota
+from models.notificacionPago import NotificacionPago
+from models.pago import Pago
+from models.pagoEliminado import PagoEliminado
+from models.tarifa import Tarifa
+from models.user import User
+from models.userDetail import UserDetail
+from services.recaudacion import reconstruir_recaudacion
+from services.saldos import reconstruir_saldos
+
+ADMIN = "bench_admin"
+ADMIN_ID = 1
+CLAVE = "clave-bench"
+
+NOMBRES = ["José", "María", "Lucía", "Martín", "Sofía", "Tomás", "Valentina", "Joaquín", "Agustín", "Camila",
+           "Mateo", "Julieta", "Benjamín", "Emilia", "Santiago", "Catalina", "Bautista", "Renata", "Thiago", "Mía"]
+APELLIDOS = ["Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "Gómez", "Díaz", "Sánchez",
+             "Ramírez", "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Benítez", "Acosta", "Medina", "Herrera"]
+METODOS = ["efectivo", "transferencia", "tarjeta", "mercadopago"]
+PESOS_METODOS = [2, 5, 2, 3]
+VENTANAS = (7, 3, 1)
+_CENTAVOS = Decimal("0.01")
+
+# Orden de carga: cada tabla después de las que referencia
+MODELOS = [User, UserDetail, Cuota, Pago, PagoEliminado, NotificacionPago]
+
+
+@dataclass(frozen=True)
+class Perfil:
+    nombre: str
+    peso: int
+    atraso: float               # probabilidad de pagar después del vencimiento
+    partes: tuple               # en cuántos pagos cubre una cuota
+    cobertura: tuple            # qué fracción de la cuota llega a pagar
+    omite: float                # probabilidad de no pagar nada en el mes
+    abandona: bool = False      # en algún mes deja de pagar para siempre
+
+
+PERFILES = [
+    Perfil("puntual", 60, atraso=0.05, partes=(1,), cobertura=(1,), omite=0.0),
+    Perfil("en_partes", 20, atraso=0.3, partes=(2, 3), cobertura=(1, 1, Decimal("0.6")), omite=0.05),
+    Perfil("moroso", 15, atraso=0.7, partes=(1, 2), cobertura=(1, Decimal("0.5")), omite=0.3),
+    Perfil("abandona", 5, atraso=0.4, partes=(1,), cobertura=(1,), omite=0.1, abandona=True),
+]
+
+
+@dataclass(frozen=True)
+class Parametros:
+    alumnos: int
+    meses: int = 12
+    semilla: int = 42
+    hasta: date = date.today()
+    lote: int = 50_000
+
+
+# Escalas de referencia (la cantidad de pagos y notificaciones depende de los perfiles):
+# grande ≈ 10k alumnos, 115k cuotas, 150k pagos, 500k notificaciones
+ESCALAS = {
+    "chica": Parametros(alumnos=200),
+    "media": Parametros(alumnos=2_000),
+    "grande": Parametros(alumnos=10_000),
+    "xl": Parametros(alumnos=100_000, meses=24),
+}
+
+
+# 📅 Calendario y tarifas
+def periodos(p: Parametros) -> List[date]:
+    """Primer día de cada uno de los `meses` meses que terminan en el de `hasta`."""
+    anio, mes = p.hasta.year, p.hasta.month
+    meses = []
+    for _ in range(p.meses):
+        meses.append(date(anio, mes, 1))
+        anio, mes = (anio - 1, 12) if mes == 1 else (anio, mes - 1)
+    return meses[::-1]
+
+
+def tarifas_historicas(p: Parametros) -> List[dict]:
+    """Una tarifa por semestre desde el primer período, con aumentos; la última sigue vigente."""
+    rnd = random.Random(f"{p.semilla}:tarifas")
+    inicio, monto, tarifas = periodos(p)[0], Decimal("20000"), []
+    while inicio <= p.hasta:
+        fin = date(inicio.year + (inicio.month + 5) // 12, (inicio.month + 5) % 12 + 1, 1)
+        tarifas.append({
+            "id": len(tarifas) + 1,
+            "monto_mensual": monto,
+            "vigente_desde": inicio,
+            "vigente_hasta": fin - timedelta(days=1),
+            "creado_por": ADMIN_ID,
+        })
+        inicio = fin
+        monto = (monto * Decimal(str(1 + rnd.uniform(0.08, 0.25))) / 100).quantize(Decimal(1)) * 100
+    tarifas[-1]["vigente_hasta"] = None
+    return tarifas
+
+
+def _monto(valor: Decimal) -> str:
+    return f"${valor:,.2f}"
+
+
+# 👤 Un alumno completo
+def generar_alumno(p: Parametros, alumno_id: int, tarifas: List[dict], hash_clave: str) -> Dict[type, List[dict]]:
+    """Filas de todas las tablas para un alumno; sólo depende de (semilla, alumno_id)."""
+    rnd = random.Random(f"{p.semilla}:{alumno_id}")
+    meses = periodos(p)
+    perfil = rnd.choices(PERFILES, weights=[x.peso for x in PERFILES])[0]
+    ingreso = 0 if rnd.random() < 0.8 else rnd.randrange(p.meses)
+    abandono = rnd.randrange(ingreso, p.meses) if perfil.abandona else None
+    nombre, apellido = rnd.choice(NOMBRES), rnd.choice(APELLIDOS)
+
+    filas: Dict[type, List[dict]] = {m: [] for m in MODELOS}
+    filas[User].append({"id": alumno_id, "username": f"alumno{alumno_id:06d}", "password": hash_clave})
+    filas[UserDetail].append({
+        "id": alumno_id,
+        "dni": 20_000_000 + alumno_id,
+        "firstName": nombre,
+        "lastName": apellido,
+        "type": "Alumno",
+        "email": f"{nombre.lower()}.{apellido.lower()}.{alumno_id}@escuela.test",
+        "anio_lectivo": p.hasta.year,
+        "estado_academico": "baja" if abandono is not None and abandono < p.meses - 2 else "regular",
+        "user_id": alumno_id,
+    })
+
+    def notificacion(cuota: dict, tipo: str, destinatario: str, mensaje: str, cuando: datetime, ventana=None):
+        filas[NotificacionPago].append({
+            "alumno_id": alumno_id,
+            "cuota_id": cuota["id"],
+            "tipo": tipo,
+            "fecha_envio": cuando,
+            "destinatario": destinatario,
+            "mensaje": mensaje[:255],
+            "ventana": ventana,
+        })
+
+    anterior = None
+    for indice in range(ingreso, p.meses):
+        mes = meses[indice]
+        base = next(t["monto_mensual"] for t in reversed(tarifas) if t["vigente_desde"] <= mes)
+        # Saldo de la cuota anterior al generar ésta (el día 1), como /cuotas/generar-periodo
+        ajuste = Decimal(0)
+        if anterior is not None:
+            pagado_antes = sum(x["monto_pagado"] for x in anterior["_pagos"] if x["fecha_pago"].date() < mes)
+            ajuste = max(anterior["monto_a_pagar"] - pagado_antes, Decimal(0))
+        cuota = {
+            "id": (alumno_id - 2) * p.meses + indice + 1,
+            "alumno_id": alumno_id,
+            "periodo": f"{mes:%Y-%m}",
+            "fecha_vencimiento": mes.replace(day=10),
+            "monto_base": base,
+            "ajuste_anterior": ajuste,
+            "arrastre_de": anterior["id"] if ajuste else None,
+            "monto_a_pagar": base + ajuste,
+            "_pagos": [],
+        }
+        vencimiento = datetime.combine(cuota["fecha_vencimiento"], datetime.min.time())
+
+        if not (abandono is not None and indice >= abandono) and rnd.random() >= perfil.omite:
+            partes = rnd.choice(perfil.partes)
+            total = (cuota["monto_a_pagar"] * Decimal(str(rnd.choice(perfil.cobertura)))).quantize(_CENTAVOS)
+            montos = [(total / partes).quantize(_CENTAVOS)] * (partes - 1)
+            montos.append(total - sum(montos))
+            cuando = vencimiento - timedelta(days=rnd.randint(0, 9))
+            if rnd.random() < perfil.atraso:
+                cuando += timedelta(days=rnd.randint(1, 45))
+            for monto in montos:
+                cuando += timedelta(minutes=rnd.randint(8 * 60, 20 * 60) - cuando.hour * 60 - cuando.minute)
+                if cuando.date() > p.hasta:
+                    break
+                metodo = rnd.choices(METODOS, weights=PESOS_METODOS)[0]
+                pago = {
+                    "alumno_id": alumno_id,
+                    "cuota_id": cuota["id"],
+                    "monto_pagado": monto,
+                    "metodo": metodo,
+                    "comprobante": None if metodo == "efectivo" else f"TRX-{cuota['id']:09d}-{len(cuota['_pagos'])}",
+                    "fecha_pago": cuando,
+                    "registrado_por": ADMIN_ID if metodo == "efectivo" or rnd.random() < 0.2 else alumno_id,
+                }
+                cuota["_pagos"].append(pago)
+                filas[Pago].append(pago)
+                aviso = cuando + timedelta(minutes=rnd.randint(1, 5))
+                notificacion(cuota, "pago_registrado", "alumno",
+                             f"Se registró un pago de {_monto(monto)} para tu cuota del período {cuota['periodo']}.", aviso)
+                notificacion(cuota, "pago_registrado", "admin",
+                             f"El alumno ID {alumno_id} realizó un pago de {_monto(monto)} "
+                             f"para la cuota {cuota['periodo']}.", aviso)
+
+                # Uno de cada cien pagos se cargó dos veces y el duplicado se eliminó
+                if rnd.random() < 0.01:
+                    original = 1_000_000_000 + cuota["id"] * 10 + len(cuota["_pagos"])
+                    baja = cuando + timedelta(hours=rnd.randint(1, 72))
+                    filas[PagoEliminado].append({
+                        "pago_id_original": original,
+                        "alumno_id": alumno_id,
+                        "cuota_id": cuota["id"],
+                        "monto_pagado": monto,
+                        "metodo": metodo,
+                        "comprobante": pago["comprobante"],
+                        "fecha_pago": cuando,
+                        "fecha_eliminacion": baja,
+                        "eliminado_por": ADMIN_ID,
+                        "motivo": "Pago duplicado",
+                    })
+                    notificacion(cuota, "pago_eliminado", "admin",
+                                 f"Se eliminó el pago ID {original} del alumno ID {alumno_id}. "
+                                 f"Monto: {_monto(monto)}. Motivo: Pago duplicado.", baja)
+                cuando += timedelta(days=rnd.randint(3, 15))
+
+        # Recordatorios: cada ventana se envía una vez si la cuota sigue abierta ese día
+        texto_vencimiento = cuota["fecha_vencimiento"].strftime("%d/%m/%Y")
+        for ventana in VENTANAS:
+            envio = vencimiento - timedelta(days=ventana) + timedelta(hours=8)
+            if envio.date() > p.hasta:
+                break
+            pagado = sum(x["monto_pagado"] for x in cuota["_pagos"] if x["fecha_pago"] < envio)
+            if pagado >= cuota["monto_a_pagar"]:
+                break
+            cuota["notificada"] = True
+            notificacion(cuota, "recordatorio_vencimiento", "alumno",
+                         f"Recordatorio: Tu cuota del período {cuota['periodo']} vence el {texto_vencimiento}. "
+                         f"Monto a pagar: {_monto(cuota['monto_a_pagar'])}", envio, ventana)
+            notificacion(cuota, "recordatorio_vencimiento", "admin",
+                         f"El alumno {nombre} {apellido} tiene una cuota próxima a vencer el {texto_vencimiento}.",
+                         envio, ventana)
+
+        pagado = sum((x["monto_pagado"] for x in cuota["_pagos"]), Decimal(0))
+        saldo = cuota["monto_a_pagar"] - pagado
+        if saldo <= 0:
+            estado = "pagada"
+        elif cuota["fecha_vencimiento"] < p.hasta:
+            estado = "vencida"
+        else:
+            estado = "parcial" if pagado > 0 else "pendiente"
+        cuota.update(
+            monto_pagado=pagado,
+            saldo_pendiente=max(saldo, Decimal(0)),
+            estado=estado,
+            notificada=cuota.get("notificada", False),
+        )
+        filas[Cuota].append(cuota)
+        anterior = cuota
+
+    for cuota in filas[Cuota]:
+        del cuota["_pagos"]
+    return filas
+
+
+# 🚚 Carga masiva
+def _valor_copy(valor):
+    if isinstance(valor, bool):
+        return "t" if valor else "f"
+    return valor  # None queda como campo vacío sin comillas: NULL para COPY … CSV
+
+
+class Cargador:
+    """Inserta lotes de filas: COPY en Postgres (psycopg2 o psycopg 3), executemany en el resto."""
+
+    def __init__(self, engine_):
+        self.dialecto = engine_.dialect
+        self.copy = engine_.dialect.name == "postgresql" and engine_.dialect.driver in ("psycopg2", "psycopg")
+
+    def cargar(self, conn, modelo, filas: List[dict]):
+        if not filas:
+            return
+        if not self.copy:
+            conn.execute(insert(modelo), filas)
+            return
+
+        columnas = list(filas[0])
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for fila in filas:
+            escritor.writerow([_valor_copy(fila[c]) for c in columnas])
+        preparador = self.dialecto.identifier_preparer
+        sentencia = (
+            f"COPY {preparador.format_table(modelo.__table__)} "
+            f"({', '.join(preparador.quote(c) for c in columnas)}) FROM STDIN WITH (FORMAT csv)"
+        )
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            if self.dialecto.driver == "psycopg2":
+                buffer.seek(0)
+                cursor.copy_expert(sentencia, buffer)
+            else:
+                with cursor.copy(sentencia) as copia:
+                    copia.write(buffer.getvalue())
+        finally:
+            cursor.close()
+
+
+def cargar_tramo(engine_, p: Parametros, desde: int, hasta: int, tarifas: List[dict], hash_clave: str) -> Dict[str, int]:
+    """Genera y carga los alumnos [desde, hasta) en una transacción. Devuelve filas por tabla."""
+    cargador = Cargador(engine_)
+    pendientes: Dict[type, List[dict]] = {m: [] for m in MODELOS}
+    totales = {m.__tablename__: 0 for m in MODELOS}
+
+    def volcar(conn):
+        for modelo in MODELOS:
+            cargador.cargar(conn, modelo, pendientes[modelo])
+            totales[modelo.__tablename__] += len(pendientes[modelo])
+            pendientes[modelo] = []
+
+    with engine_.begin() as conn:
+        for alumno_id in range(desde, hasta):
+            for modelo, filas in generar_alumno(p, alumno_id, tarifas, hash_clave).items():
+                pendientes[modelo].extend(filas)
+            if sum(len(f) for f in pendientes.values()) >= p.lote:
+                volcar(conn)
+        volcar(conn)
+    return totales
+
+
+def _tramo_en_proceso(url: str, p: Parametros, desde: int, hasta: int, tarifas, hash_clave) -> Dict[str, int]:
+    motor = create_engine(url)
+    try:
+        inicio = time.perf_counter()
+        totales = cargar_tramo(motor, p, desde, hasta, tarifas, hash_clave)
+        print(f"  tramo {desde}-{hasta - 1}: {sum(totales.values()):,} filas en {time.perf_counter() - inicio:.1f} s")
+        return totales
+    finally:
+        motor.dispose()
+
+
+def vaciar(engine_):
+    """Borra todas las filas de las tablas de la app (no toca schema_version)."""
+    with engine_.begin() as conn:
+        for tabla in reversed(metadata.sorted_tables):
+            conn.execute(delete(tabla))
+
+
+def generar(engine_, p: Parametros, procesos: int = 1) -> Dict[str, int]:
+    """Migra el esquema y carga la base completa. Se niega si ya hay usuarios."""
+    migrar(engine_)
+    with engine_.connect() as conn:
+        if conn.scalar(select(func.count()).select_from(User)):
+            raise RuntimeError("La base ya tiene usuarios: usá una base dedicada (o --vaciar)")
+    if engine_.dialect.name == "sqlite" and procesos > 1:
+        print("⚠️ SQLite admite un solo escritor: se carga con un proceso")
+        procesos = 1
+
+    hash_clave = hashear(CLAVE)  # un solo hash Argon2 para todos los usuarios
+    tarifas = tarifas_historicas(p)
+    with engine_.begin() as conn:
+        conn.execute(insert(User), [{"id": ADMIN_ID, "username": ADMIN, "password": hash_clave}])
+        conn.execute(insert(UserDetail), [{
+            "id": ADMIN_ID, "dni": 10_000_000, "firstName": "Admin", "lastName": "Bench",
+            "type": "Admin", "email": "admin@escuela.test", "user_id": ADMIN_ID,
+        }])
+        conn.execute(insert(Tarifa), tarifas)
+
+    # Tramos contiguos de alumnos (los ids de cuota se calculan, no hace falta coordinar)
+    primero, ultimo = ADMIN_ID + 1, ADMIN_ID + 1 + p.alumnos
+    tamanio = -(-p.alumnos // procesos)
+    tramos = [(d, min(d + tamanio, ultimo)) for d in range(primero, ultimo, tamanio)]
+
+    totales = {"tarifas": len(tarifas)}
+    if procesos == 1:
+        parciales = [cargar_tramo(engine_, p, d, h, tarifas, hash_clave) for d, h in tramos]
+    else:
+        url = engine_.url.render_as_string(hide_password=False)
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=get_context("spawn")) as pool:
+            futuros = [pool.submit(_tramo_en_proceso, url, p, d, h, tarifas, hash_clave) for d, h in tramos]
+            parciales = [f.result() for f in futuros]
+    for parcial in parciales:
+        for tabla, cantidad in parcial.items():
+            totales[tabla] = totales.get(tabla, 0) + cantidad
+    totales["usuarios"] += 1
+    totales["userDetail"] += 1
+
+    with Session(engine_) as db:
+        totales["saldo_alumno"] = reconstruir_saldos(db)
+        totales["recaudacion_diaria"] = reconstruir_recaudacion(db)
+        db.commit()
+
+    if engine_.dialect.name == "postgresql":
+        with engine_.begin() as conn:
+            # Las tablas con ids explícitos dejan la secuencia atrás
+            for modelo in (User, UserDetail, Tarifa, Cuota):
+                nombre = modelo.__tablename__
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('\"{nombre}\"', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM \"{nombre}\"))"
+                ))
+        with engine_.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+    return totales
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.generador", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--escala", choices=list(ESCALAS), default="chica", help="valores por defecto")
+    parser.add_argument("--alumnos", type=int)
+    parser.add_argument("--meses", type=int, help="cantidad de períodos hasta el mes de --hasta")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--hasta", type=date.fromisoformat, help="fecha de corte de los datos (por defecto hoy)")
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--lote", type=int, help="filas por lote de COPY / executemany")
+    parser.add_argument("--vaciar", action="store_true", help="borrar antes todas las filas de la base")
+    args = parser.parse_args(argv)
+
+    base = ESCALAS[args.escala]
+    p = Parametros(
+        alumnos=args.alumnos or base.alumnos,
+        meses=args.meses or base.meses,
+        semilla=args.semilla,
+        hasta=args.hasta or date.today(),
+        lote=args.lote or base.lote,
+    )
+    if args.vaciar:
+        vaciar(engine)
+    print(f"🌱 {p.alumnos:,} alumnos, {p.meses} meses hasta {p.hasta}, semilla {p.semilla}, {args.procesos} proceso(s)")
+    inicio = time.perf_counter()
+    totales = generar(engine, p, args.procesos)
+    duracion = time.perf_counter() - inicio
+    print(f"✅ {sum(totales.values()):,} filas en {duracion:.1f} s ({sum(totales.values()) / duracion:,.0f} filas/s)")
+    for tabla, cantidad in totales.items():
+        print(f"  {tabla:<22} {cantidad:>12,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Prueba de concurrencia: N pagos simultáneos sobre una misma cuota.
+
+Crea un alumno con una cuota de N × monto, dispara N POST /pagos/nuevo en
+paralelo en proceso (httpx + ASGI) y verifica que monto_pagado, saldo_pendiente
+y estado de la cuota coincidan con los pagos aceptados. Si alguna actualización
+se perdió, termina con código 1.
+
+Conviene correrlo contra Postgres: SQLite serializa las escrituras de por sí.
+
+Uso (desde ApiEscBack1/):
+    python -m benchmarks.stress_pagos_concurrentes --pagos 100 --monto 10.00
+    DB_ASYNC=1 python -m benchmarks.stress_pagos_concurrentes --async
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert, select, func
+from sqlalchemy.orm import joinedload
+
+import config.init_db  # noqa: F401  (registra todos los modelos en el mapper)
+from auth.seguridad import Seguridad
+from config.db import SessionLocal, engine
+from models.cuota import Cuota
+from models.pago import Pago
+from models.user import User
+from models.userDetail import UserDetail
+from routes.pagos import pagos
+
+
+def preparar(pagos_totales: int, monto: Decimal):
+    """Alumno nuevo con una cuota que se salda exactamente con todos los pagos."""
+    with engine.begin() as conn:
+        alumno_id = conn.scalar(select(func.coalesce(func.max(User.id), 0))) + 1
+        conn.execute(insert(User), [{
+            "id": alumno_id, "username": f"stress_pagos_{alumno_id}", "password": "-",
+        }])
+        conn.execute(insert(UserDetail), [{
+            "dni": 30_000_000 + alumno_id,
+            "firstName": "Stress",
+            "lastName": str(alumno_id),
+            "type": "Alumno",
+            "email": f"stress_pagos_{alumno_id}@escuela.test",
+            "user_id": alumno_id,
+        }])
+        total = monto * pagos_totales
+        cuota_id = conn.execute(
+            insert(Cuota).returning(Cuota.id),
+            [{
+                "alumno_id": alumno_id,
+                "periodo": "2099-01",
+                "fecha_vencimiento": date(2099, 1, 10),
+                "monto_base": total,
+                "ajuste_anterior": 0,
+                "monto_a_pagar": total,
+                "monto_pagado": 0,
+                "saldo_pendiente": total,
+                "estado": "pendiente",
+                "notificada": False,
+            }],
+        ).scalar_one()
+
+    with SessionLocal() as db:
+        alumno = db.query(User).options(joinedload(User.userdetail)).filter_by(id=alumno_id).one()
+        token = Seguridad.generar_token(alumno)
+    return alumno_id, cuota_id, token
+
+
+def crear_app(modo_async: bool) -> FastAPI:
+    app = FastAPI()
+    if modo_async:
+        from routes.pagos_async import pagos_async
+        app.include_router(pagos_async)
+    app.include_router(pagos)
+    return app
+
+
+async def disparar(app: FastAPI, token: str, alumno_id: int, cuota_id: int, pagos_totales: int, monto: Decimal):
+    transporte = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    cuerpo = {"alumno_id": alumno_id, "cuota_id": cuota_id, "monto_pagado": str(monto), "metodo": "stress"}
+    async with httpx.AsyncClient(transport=transporte, base_url="http://stress") as cliente:
+        respuestas = await asyncio.gather(*(
+            cliente.post("/pagos/nuevo", json=cuerpo, headers={"Authorization": f"Bearer {token}"})
+            for _ in range(pagos_totales)
+        ))
+    codigos = {}
+    for r in respuestas:
+        codigos[r.status_code] = codigos.get(r.status_code, 0) + 1
+    return codigos
+
+
+def verificar(cuota_id: int, aceptados: int, monto: Decimal) -> list:
+    with SessionLocal() as db:
+        cuota = db.get(Cuota, cuota_id)
+        pagos_guardados = db.scalar(select(func.count()).select_from(Pago).where(Pago.cuota_id == cuota_id))
+
+    esperado = monto * aceptados
+    saldo_esperado = max(Decimal(0), cuota.monto_a_pagar - esperado)
+    estado_esperado = "pagada" if saldo_esperado == 0 else ("parcial" if esperado > 0 else "pendiente")
+
+    errores = []
+    if pagos_guardados != aceptados:
+        errores.append(f"pagos guardados {pagos_guardados} != aceptados {aceptados}")
+    if Decimal(cuota.monto_pagado) != esperado:
+        errores.append(f"monto_pagado {cuota.monto_pagado} != {esperado}")
+    if Decimal(cuota.saldo_pendiente) != saldo_esperado:
+        errores.append(f"saldo_pendiente {cuota.saldo_pendiente} != {saldo_esperado}")
+    if cuota.estado != estado_esperado:
+        errores.append(f"estado {cuota.estado!r} != {estado_esperado!r}")
+    print(
+        f"  cuota {cuota_id}: monto_pagado={cuota.monto_pagado} saldo={cuota.saldo_pendiente} "
+        f"estado={cuota.estado} pagos={pagos_guardados}"
+    )
+    return errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pagos", type=int, default=100)
+    parser.add_argument("--monto", type=Decimal, default=Decimal("10.00"))
+    parser.add_argument("--async", dest="modo_async", action="store_true", help="usar la ruta async")
+    args = parser.parse_args()
+
+    alumno_id, cuota_id, token = preparar(args.pagos, args.monto)
+    inicio = time.perf_counter()
+    codigos = asyncio.run(
+        disparar(crear_app(args.modo_async), token, alumno_id, cuota_id, args.pagos, args.monto)
+    )
+    total = time.perf_counter() - inicio
+
+    print(f"{args.pagos} pagos simultáneos de ${args.monto} ({'async' if args.modo_async else 'sync'}) en {total:.2f} s")
+    print(f"  códigos: {codigos}")
+    errores = verificar(cuota_id, codigos.get(200, 0), args.monto)
+    if errores:
+        print("❌ Saldo inconsistente:")
+        for e in errores:
+            print(f"  - {e}")
+        return 1
+    print("✅ Saldo consistente con los pagos aceptados.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
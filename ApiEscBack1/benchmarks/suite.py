@@ -0,0 +1,413 @@
+"""
+Suite de benchmarks de toda la API, con baseline en JSON y detección de regresiones.
+
+  sembrar    migra y carga una base dedicada con benchmarks/generador.py
+             (mismas opciones; --escala grande = 10k alumnos)
+  correr     recorre los escenarios de benchmarks/escenarios.py (uno por endpoint)
+             --modo proceso   pedidos secuenciales, en proceso vía httpx + ASGI
+             --modo carga     N clientes concurrentes durante S segundos con una
+                              mezcla ponderada de los escenarios de lectura y pago
+             Registra p50/p95/p99, throughput, códigos de respuesta y consultas SQL
+             por pedido (contadas con un evento de SQLAlchemy; sólo en proceso).
+             --guardar escribe el resultado como baseline; --comparar lo contrasta
+             con uno anterior y sale con código 1 si hay regresiones.
+  comparar   compara dos resultados ya guardados
+
+Con --url los pedidos van a un servidor ya levantado (p. ej. uvicorn con varios
+workers sobre la misma base); en ese caso no se cuentan consultas.
+
+Uso (desde ApiEscBack1/):
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.suite sembrar --escala chica
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.suite correr --guardar base.json
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.suite correr --comparar base.json
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.suite correr --modo carga --clientes 50 --duracion 30
+    python -m benchmarks.suite comparar base.json actual.json --tolerancia 0.15
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from benchmarks.escenarios import ESCENARIOS, Contexto, Escenario, alumno_de_referencia, armar_contexto
+from benchmarks import generador
+from benchmarks.generador import ADMIN, CLAVE
+from config.db import DB_ASYNC, SessionLocal, engine, metadata
+
+FORMATO = 1
+
+
+# 🔢 Consultas por pedido: el contador viaja en un ContextVar (el threadpool de
+# Starlette copia el contexto, así que también cuenta lo que corre en hilos)
+_consultas: ContextVar[Optional[List[int]]] = ContextVar("consultas_bench", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _contar_consulta(conn, cursor, sentencia, parametros, contexto, executemany):
+    contador = _consultas.get()
+    if contador is not None:
+        contador[0] += 1
+
+
+def percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+class Medicion:
+    def __init__(self):
+        self.latencias: List[float] = []
+        self.codigos: Dict[int, int] = {}
+        self.errores = 0
+        self.bytes = 0
+        self.consultas: List[int] = []
+
+    def resumen(self, duracion: float) -> dict:
+        if not self.latencias:
+            return {"n": 0}
+        return {
+            "n": len(self.latencias),
+            "p50_ms": round(percentil(self.latencias, 50), 3),
+            "p95_ms": round(percentil(self.latencias, 95), 3),
+            "p99_ms": round(percentil(self.latencias, 99), 3),
+            "media_ms": round(sum(self.latencias) / len(self.latencias), 3),
+            "rps": round(len(self.latencias) / duracion, 2) if duracion > 0 else None,
+            "errores": self.errores,
+            "codigos": {str(c): n for c, n in sorted(self.codigos.items())},
+            "bytes_medio": self.bytes // len(self.latencias),
+            "consultas_media": round(sum(self.consultas) / len(self.consultas), 2) if self.consultas else None,
+            "consultas_max": max(self.consultas) if self.consultas else None,
+        }
+
+
+async def pedir(cliente: httpx.AsyncClient, escenario: Escenario, ctx: Contexto, medicion: Medicion):
+    opciones = escenario.pedido(ctx)
+    url = opciones.pop("url", escenario.ruta)
+    token = ctx.tokens.get(escenario.rol) if escenario.rol else None
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    headers.update(opciones.pop("headers", {}))
+
+    contador = [0]
+    marca = _consultas.set(contador)
+    inicio = time.perf_counter()
+    try:
+        respuesta = await cliente.request(escenario.metodo, url, headers=headers, **opciones)
+        cuerpo = await respuesta.aread()
+    finally:
+        _consultas.reset(marca)
+    medicion.latencias.append((time.perf_counter() - inicio) * 1000)
+    medicion.codigos[respuesta.status_code] = medicion.codigos.get(respuesta.status_code, 0) + 1
+    medicion.errores += respuesta.status_code not in escenario.esperado
+    medicion.bytes += len(cuerpo)
+    medicion.consultas.append(contador[0])
+
+
+# 🌐 Cliente: en proceso (ASGI) o contra un servidor
+def crear_cliente(url: Optional[str], clientes: int = 1) -> httpx.AsyncClient:
+    limites = httpx.Limits(max_connections=clientes, max_keepalive_connections=clientes)
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=120, limits=limites)
+    from app import api_escu
+
+    transporte = httpx.ASGITransport(app=api_escu, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transporte, base_url="http://bench", timeout=120)
+
+
+async def iniciar_sesion(cliente: httpx.AsyncClient, username: str) -> str:
+    respuesta = await cliente.post("/user/loginUser", json={"username": username, "password": CLAVE})
+    if respuesta.status_code != 200:
+        raise RuntimeError(f"No se pudo iniciar sesión como {username}: {respuesta.status_code} {respuesta.text}")
+    return respuesta.json()["token"]
+
+
+async def preparar_contexto(cliente: httpx.AsyncClient) -> Contexto:
+    with SessionLocal() as db:
+        _, username = alumno_de_referencia(db)
+    tokens = {
+        "admin": await iniciar_sesion(cliente, ADMIN),
+        "alumno": await iniciar_sesion(cliente, username),
+    }
+    with SessionLocal() as db:
+        return armar_contexto(db, tokens)
+
+
+def seleccionar(patron: Optional[str]) -> List[Escenario]:
+    if not patron:
+        return list(ESCENARIOS)
+    regex = re.compile(patron)
+    return [e for e in ESCENARIOS if regex.search(e.nombre)]
+
+
+def sin_escenario() -> List[str]:
+    """Endpoints de la app que no tienen escenario en el catálogo."""
+    from app import api_escu
+
+    cubiertos = {e.nombre for e in ESCENARIOS}
+    return sorted(
+        f"{metodo.upper()} {ruta}"
+        for ruta, operaciones in api_escu.openapi()["paths"].items()
+        for metodo in operaciones
+        if f"{metodo.upper()} {ruta}" not in cubiertos
+    )
+
+
+# ▶️ Modo proceso: un escenario por vez, pedidos secuenciales
+async def correr_proceso(args, escenarios: List[Escenario]) -> dict:
+    resultados = {}
+    async with crear_cliente(args.url) as cliente:
+        ctx = await preparar_contexto(cliente)
+        for escenario in escenarios:
+            repeticiones = min(args.repeticiones, escenario.repeticiones or args.repeticiones)
+            calentamiento = args.calentamiento if escenario.calentamiento is None else escenario.calentamiento
+            if escenario.preparar:
+                with SessionLocal() as db:
+                    ctx.descartables[escenario.nombre] = escenario.preparar(db, ctx, repeticiones + calentamiento)
+                    db.commit()
+
+            for _ in range(calentamiento):
+                await pedir(cliente, escenario, ctx, Medicion())
+            medicion = Medicion()
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                await pedir(cliente, escenario, ctx, medicion)
+            resultados[escenario.nombre] = medicion.resumen(time.perf_counter() - inicio)
+            imprimir_fila(escenario.nombre, resultados[escenario.nombre])
+    return {"escenarios": resultados}
+
+
+# 🚦 Modo carga: N clientes con una mezcla ponderada durante `duracion` segundos
+async def correr_carga(args, escenarios: List[Escenario]) -> dict:
+    mezcla = [e for e in escenarios if e.peso > 0]
+    if not mezcla:
+        raise SystemExit("Ningún escenario seleccionado participa del modo carga (peso 0)")
+    pesos = [e.peso for e in mezcla]
+    mediciones = {e.nombre: Medicion() for e in mezcla}
+    total = Medicion()
+
+    async with crear_cliente(args.url, args.clientes) as cliente:
+        ctx = await preparar_contexto(cliente)
+        fin = time.perf_counter() + args.duracion
+
+        async def usuario(semilla: int):
+            rnd = random.Random(semilla)
+            while time.perf_counter() < fin:
+                escenario = rnd.choices(mezcla, weights=pesos)[0]
+                medicion = mediciones[escenario.nombre]
+                antes = len(medicion.latencias)
+                await pedir(cliente, escenario, ctx, medicion)
+                total.latencias.append(medicion.latencias[antes])
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(usuario(i) for i in range(args.clientes)))
+        duracion = time.perf_counter() - inicio
+
+    for medicion in mediciones.values():
+        total.codigos.update({c: total.codigos.get(c, 0) + n for c, n in medicion.codigos.items()})
+        total.consultas.extend(medicion.consultas)
+        total.bytes += medicion.bytes
+    total.errores = sum(m.errores for m in mediciones.values())
+
+    resultados = {}
+    for nombre, medicion in mediciones.items():
+        resultados[nombre] = medicion.resumen(duracion)
+        imprimir_fila(nombre, resultados[nombre])
+    global_ = total.resumen(duracion)
+    imprimir_fila("TOTAL", global_)
+    return {"global": global_, "escenarios": resultados}
+
+
+def imprimir_fila(nombre: str, r: dict):
+    if not r.get("n"):
+        print(f"{nombre:<42} sin pedidos")
+        return
+    consultas = "-" if r["consultas_media"] is None else f"{r['consultas_media']:g}"
+    errores = f"  ⚠️ {r['errores']} errores {r['codigos']}" if r["errores"] else ""
+    print(
+        f"{nombre:<42} n={r['n']:<5} p50={r['p50_ms']:>9.2f} p95={r['p95_ms']:>9.2f} "
+        f"p99={r['p99_ms']:>9.2f} ms  {r['rps']:>8.1f} req/s  sql={consultas}{errores}"
+    )
+
+
+def metadatos(args) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    with Session(engine) as db:
+        filas = {
+            nombre: db.scalar(select(func.count()).select_from(tabla))
+            for nombre, tabla in metadata.tables.items()
+        }
+    return {
+        "formato": FORMATO,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "dialecto": engine.dialect.name,
+        "db_async": DB_ASYNC,
+        "url": args.url,
+        "modo": args.modo,
+        "repeticiones": args.repeticiones if args.modo == "proceso" else None,
+        "clientes": args.clientes if args.modo == "carga" else None,
+        "duracion": args.duracion if args.modo == "carga" else None,
+        "filas": filas,
+    }
+
+
+# ⚖️ Comparación contra un baseline
+def comparar(base: dict, actual: dict, tolerancia: float, umbral_ms: float) -> List[dict]:
+    """
+    Diferencias relevantes escenario por escenario. Es regresión si p50 o p95
+    empeoran más que `tolerancia` (y más de `umbral_ms`, para no marcar ruido en
+    pedidos de fracciones de milisegundo), si sube la cantidad de consultas SQL,
+    si aparecen errores o si cae el throughput global del modo carga.
+    """
+    hallazgos = []
+
+    def anotar(escenario, metrica, antes, ahora, regresion):
+        hallazgos.append({
+            "escenario": escenario, "metrica": metrica, "base": antes, "actual": ahora,
+            "veredicto": "regresión" if regresion else "mejora",
+        })
+
+    for aviso in ("modo", "dialecto"):
+        if base["meta"].get(aviso) != actual["meta"].get(aviso):
+            print(f"⚠️ El baseline difiere en '{aviso}': la comparación puede no ser representativa")
+    # Las escrituras de cada corrida agregan algunas filas; sólo se avisa si cambia la escala
+    filas_base, filas_actual = base["meta"].get("filas", {}), actual["meta"].get("filas", {})
+    distintas = [
+        t for t in filas_base
+        if abs(filas_actual.get(t, 0) - filas_base[t]) > max(100, filas_base[t] * 0.05)
+    ]
+    if distintas:
+        print(f"⚠️ La base tiene otra escala que la del baseline ({', '.join(distintas)})")
+
+    for nombre, b in base["escenarios"].items():
+        a = actual["escenarios"].get(nombre)
+        if not a or not a.get("n") or not b.get("n"):
+            continue
+        for metrica in ("p50_ms", "p95_ms"):
+            antes, ahora = b[metrica], a[metrica]
+            if abs(ahora - antes) < umbral_ms:
+                continue
+            if ahora > antes * (1 + tolerancia):
+                anotar(nombre, metrica, antes, ahora, True)
+            elif ahora < antes * (1 - tolerancia):
+                anotar(nombre, metrica, antes, ahora, False)
+        if b.get("consultas_media") is not None and a.get("consultas_media") is not None:
+            if a["consultas_media"] > b["consultas_media"] + 0.5:
+                anotar(nombre, "consultas_media", b["consultas_media"], a["consultas_media"], True)
+            elif a["consultas_media"] < b["consultas_media"] - 0.5:
+                anotar(nombre, "consultas_media", b["consultas_media"], a["consultas_media"], False)
+        if a["errores"] / a["n"] > b["errores"] / b["n"]:
+            anotar(nombre, "errores", b["errores"], a["errores"], True)
+
+    if base.get("global") and actual.get("global"):
+        antes, ahora = base["global"]["rps"], actual["global"]["rps"]
+        if ahora < antes * (1 - tolerancia):
+            anotar("TOTAL", "rps", antes, ahora, True)
+        elif ahora > antes * (1 + tolerancia):
+            anotar("TOTAL", "rps", antes, ahora, False)
+    return hallazgos
+
+
+def informar(hallazgos: List[dict]) -> int:
+    regresiones = [h for h in hallazgos if h["veredicto"] == "regresión"]
+    if not hallazgos:
+        print("✅ Sin cambios relevantes respecto del baseline.")
+        return 0
+    for h in sorted(hallazgos, key=lambda h: (h["veredicto"] != "regresión", h["escenario"])):
+        marca = "❌" if h["veredicto"] == "regresión" else "✅"
+        print(f"{marca} {h['escenario']:<42} {h['metrica']:<16} {h['base']} -> {h['actual']}")
+    if regresiones:
+        print(f"❌ {len(regresiones)} regresiones respecto del baseline.")
+        return 1
+    print("✅ Sin regresiones respecto del baseline.")
+    return 0
+
+
+def _leer(ruta: str) -> dict:
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+# 🧰 CLI
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    sub.add_parser(
+        "sembrar", add_help=False, help="migrar y cargar la base (opciones de python -m benchmarks.generador)"
+    )
+
+    p_correr = sub.add_parser("correr", help="medir los escenarios")
+    p_correr.add_argument("--modo", choices=["proceso", "carga"], default="proceso")
+    p_correr.add_argument("--url", help="servidor a medir en lugar de la app en proceso")
+    p_correr.add_argument("--solo", help="regex sobre 'MÉTODO /ruta' para elegir escenarios")
+    p_correr.add_argument("--repeticiones", type=int, default=30)
+    p_correr.add_argument("--calentamiento", type=int, default=2)
+    p_correr.add_argument("--clientes", type=int, default=20)
+    p_correr.add_argument("--duracion", type=float, default=20.0, help="segundos (modo carga)")
+    p_correr.add_argument("--guardar", help="escribir el resultado (baseline) en este JSON")
+    p_correr.add_argument("--comparar", help="baseline JSON contra el cual comparar")
+    p_correr.add_argument("--tolerancia", type=float, default=0.25, help="empeoramiento relativo admitido (0.25 = 25%%)")
+    p_correr.add_argument("--umbral-ms", type=float, default=2.0, help="diferencias menores se ignoran")
+    p_correr.add_argument("--listar", action="store_true", help="mostrar los escenarios y salir")
+
+    p_comparar = sub.add_parser("comparar", help="comparar dos resultados guardados")
+    p_comparar.add_argument("base")
+    p_comparar.add_argument("actual")
+    p_comparar.add_argument("--tolerancia", type=float, default=0.25)
+    p_comparar.add_argument("--umbral-ms", type=float, default=2.0)
+
+    args, resto = parser.parse_known_args(argv)
+    if args.comando == "sembrar":
+        return generador.main(resto)
+    if resto:
+        parser.error(f"argumentos no reconocidos: {' '.join(resto)}")
+
+    if args.comando == "comparar":
+        return informar(comparar(_leer(args.base), _leer(args.actual), args.tolerancia, args.umbral_ms))
+
+    escenarios = seleccionar(args.solo)
+    faltantes = sin_escenario()
+    if args.listar:
+        for e in escenarios:
+            print(f"{e.nombre:<42} rol={e.rol or '-':<7} peso={e.peso}")
+        for nombre in faltantes:
+            print(f"{nombre:<42} (sin escenario)")
+        return 0
+    if faltantes:
+        print(f"⚠️ Endpoints sin escenario: {', '.join(faltantes)}")
+
+    corrida = correr_proceso if args.modo == "proceso" else correr_carga
+    resultado = {"meta": metadatos(args), **asyncio.run(corrida(args, escenarios))}
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+        print(f"💾 Resultado guardado en {args.guardar}")
+    if args.comparar:
+        return informar(comparar(_leer(args.comparar), resultado, args.tolerancia, args.umbral_ms))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,9 @@
-from config.db import engine, Base
+import sys
+
+from config.db import engine
+from config.migraciones import migrar, version_actual, version_objetivo
+from config.settings import settings
+# Importar todos los modelos deja completo el registro del mapper (relaciones por nombre)
 from models.user import User
 from models.userDetail import UserDetail
 from models.tarifa import Tarifa
@@ -6,23 +11,69 @@ from models.cuota import Cuota
 from models.pago import Pago
 from models.pagoEliminado import PagoEliminado
 from models.notificacionPago import NotificacionPago
+from models.eventoOutbox import EventoOutbox
+from models.ejecucionJob import EjecucionJob
+from models.marcaAgua import MarcaAgua
+from models.saldoAlumno import SaldoAlumno
+from models.recaudacionDiaria import RecaudacionDiaria
+
+
+class EsquemaDesactualizado(RuntimeError):
+    pass
+
+
+def verificar_esquema() -> int:
+    """
+    Comprueba que la base esté en la última versión de migraciones con una sola
+    consulta a schema_version (sin reflejar las tablas). Se llama una vez al iniciar
+    cada worker. Lanza EsquemaDesactualizado si falta migrar.
+    """
+    with engine.connect() as conn:
+        actual = version_actual(conn)
+    objetivo = version_objetivo()
+    if actual < objetivo:
+        raise EsquemaDesactualizado(
+            f"El esquema está en la versión {actual} y el código espera la {objetivo}. "
+            "Ejecutá: python -m config.migraciones upgrade (o iniciá con DB_AUTO_MIGRATE=1)"
+        )
+    return actual
 
 
 def init_db():
     """
-    Crea todas las tablas de la base de datos si no existen.
-    Se ejecuta automáticamente al iniciar FastAPI (desde main.py).
+    Prepara la base al iniciar la app (lifespan de FastAPI): verifica la versión del
+    esquema y, con DB_AUTO_MIGRATE=1, aplica las migraciones pendientes.
+    Cualquier error se propaga para que el worker no quede a medio iniciar.
     """
     try:
-        Base.metadata.create_all(bind=engine, tables=[
-            User.__table__,
-            UserDetail.__table__,
-            Tarifa.__table__,
-            Cuota.__table__,
-            Pago.__table__,
-            PagoEliminado.__table__,
-            NotificacionPago.__table__,
-        ])
-        print("✅ Base de datos inicializada correctamente.")
+        verificar_esquema()
+    except EsquemaDesactualizado:
+        if not settings.db_auto_migrate:
+            raise
+        migrar(engine)
+        verificar_esquema()
+    print("✅ Base de datos inicializada correctamente.")
+
+
+def main(argv) -> int:
+    """
+    python -m config.init_db                     verifica y (con DB_AUTO_MIGRATE=1) migra
+    python -m config.init_db --check-schema-only sólo verifica; sale con 1 si falta migrar
+    """
+    try:
+        if "--check-schema-only" in argv:
+            version = verificar_esquema()
+            print(f"✅ Esquema al día (versión {version}).")
+        else:
+            init_db()
+        return 0
+    except EsquemaDesactualizado as e:
+        print(f"❌ {e}")
+        return 1
     except Exception as e:
-        print(f"⚠️ Error al inicializar la base de datos: {e}")
+        print(f"❌ No se pudo verificar la base de datos: {e}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
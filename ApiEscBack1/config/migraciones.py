@@ -0,0 +1,169 @@
+# config/migraciones.py
+# Migraciones versionadas del esquema.
+#
+# Cada migración es un módulo migrations/vNNNN_descripcion.py con:
+#   VERSION = N                      entero creciente
+#   DESCRIPCION = "..."
+#   TRANSACCIONAL = True | False     False para DDL que no admite transacción
+#                                    (CREATE INDEX CONCURRENTLY en Postgres)
+#   def upgrade(conn): ...
+#
+# La versión aplicada se guarda en la tabla schema_version. En Postgres un
+# advisory lock evita que dos workers migren a la vez.
+#
+# Uso: python -m config.migraciones [upgrade|status]
+import importlib
+import pkgutil
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+
+_metadata_version = MetaData()
+schema_version = Table(
+    "schema_version",
+    _metadata_version,
+    Column("version", Integer, primary_key=True),
+    Column("descripcion", String(200), nullable=False),
+    Column("aplicada_en", DateTime, nullable=False),
+)
+
+# Clave del advisory lock (arbitraria, fija para toda la app)
+_LOCK_MIGRACIONES = 0x45534355  # "ESCU"
+
+
+@dataclass(frozen=True)
+class Migracion:
+    version: int
+    descripcion: str
+    transaccional: bool
+    modulo: ModuleType
+
+    def upgrade(self, conn):
+        self.modulo.upgrade(conn)
+
+
+def descubrir() -> List[Migracion]:
+    """Migraciones disponibles en el paquete migrations/, ordenadas por versión."""
+    import migrations
+
+    encontradas = []
+    for info in pkgutil.iter_modules(migrations.__path__):
+        if not info.name.startswith("v"):
+            continue
+        modulo = importlib.import_module(f"migrations.{info.name}")
+        encontradas.append(Migracion(
+            version=modulo.VERSION,
+            descripcion=modulo.DESCRIPCION,
+            transaccional=getattr(modulo, "TRANSACCIONAL", True),
+            modulo=modulo,
+        ))
+    encontradas.sort(key=lambda m: m.version)
+
+    versiones = [m.version for m in encontradas]
+    if len(set(versiones)) != len(versiones):
+        raise RuntimeError(f"Versiones de migración duplicadas: {versiones}")
+    return encontradas
+
+
+def version_objetivo() -> int:
+    """Versión más alta disponible, leída de los nombres de archivo (sin importar los módulos)."""
+    import migrations
+
+    versiones = [
+        int(info.name[1:5])
+        for info in pkgutil.iter_modules(migrations.__path__)
+        if info.name.startswith("v") and info.name[1:5].isdigit()
+    ]
+    return max(versiones, default=0)
+
+
+def version_actual(conn) -> int:
+    """Última versión aplicada (0 si la base nunca se migró)."""
+    if not inspect(conn).has_table("schema_version"):
+        return 0
+    return conn.scalar(select(schema_version.c.version).order_by(schema_version.c.version.desc()).limit(1)) or 0
+
+
+def crear_indice(conn, nombre: str, sentencia: str):
+    """
+    Ejecuta un CREATE [UNIQUE] INDEX. En Postgres se construye CONCURRENTLY (sin
+    bloquear escrituras) y, si un intento anterior dejó el índice INVALID, se
+    descarta y se vuelve a crear. `sentencia` usa el marcador {concurrently}.
+    """
+    if conn.dialect.name == "postgresql":
+        invalido = conn.scalar(text(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :nombre"
+        ), {"nombre": nombre})
+        if invalido:
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{nombre}"'))
+        conn.execute(text(sentencia.format(concurrently="CONCURRENTLY")))
+    else:
+        conn.execute(text(sentencia.format(concurrently="")))
+
+
+def _registrar(conn, migracion: Migracion):
+    conn.execute(schema_version.insert().values(
+        version=migracion.version,
+        descripcion=migracion.descripcion,
+        aplicada_en=datetime.now(),
+    ))
+
+
+def migrar(engine, hasta: Optional[int] = None) -> List[int]:
+    """Aplica las migraciones pendientes (hasta `hasta` inclusive). Devuelve las versiones aplicadas."""
+    aplicadas = []
+    with engine.connect() as lock_conn:
+        es_postgres = engine.dialect.name == "postgresql"
+        if es_postgres:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": _LOCK_MIGRACIONES})
+            lock_conn.commit()
+        try:
+            with engine.begin() as conn:
+                _metadata_version.create_all(conn, checkfirst=True)
+                actual = version_actual(conn)
+
+            for migracion in descubrir():
+                if migracion.version <= actual or (hasta is not None and migracion.version > hasta):
+                    continue
+                print(f"⏫ Aplicando migración {migracion.version:04d}: {migracion.descripcion}")
+                if migracion.transaccional:
+                    with engine.begin() as conn:
+                        migracion.upgrade(conn)
+                        _registrar(conn, migracion)
+                else:
+                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                        migracion.upgrade(conn)
+                        _registrar(conn, migracion)
+                aplicadas.append(migracion.version)
+        finally:
+            if es_postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _LOCK_MIGRACIONES})
+                lock_conn.commit()
+    return aplicadas
+
+
+def main(argv: List[str]) -> int:
+    from config.db import engine
+
+    comando = argv[0] if argv else "status"
+    if comando == "upgrade":
+        aplicadas = migrar(engine)
+        print(f"✅ Esquema actualizado ({len(aplicadas)} migraciones aplicadas).")
+        return 0
+    if comando == "status":
+        with engine.connect() as conn:
+            actual = version_actual(conn)
+        objetivo = version_objetivo()
+        print(f"Versión aplicada: {actual} / disponible: {objetivo}")
+        return 0 if actual == objetivo else 1
+    print("Uso: python -m config.migraciones [upgrade|status]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
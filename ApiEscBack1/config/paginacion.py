@@ -0,0 +1,96 @@
+# config/paginacion.py
+# Paginación keyset reutilizable: cursor opaco sobre (clave de orden, id).
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+
+from config.settings import settings
+
+
+@dataclass(frozen=True)
+class ParametrosPagina:
+    limit: int
+    cursor: Optional[str]
+
+
+def parametros_pagina(
+    limit: int = Query(settings.pagina_limite_default, ge=1, le=settings.pagina_limite_max),
+    cursor: Optional[str] = Query(None, description="Valor next_cursor de la página anterior"),
+) -> ParametrosPagina:
+    return ParametrosPagina(limit=limit, cursor=cursor)
+
+
+def _a_json(valor: Any):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    crudo = json.dumps([_a_json(v) for v in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, columnas: Sequence[Any]) -> list:
+    """Convierte el cursor al tipo Python de cada columna del orden."""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(valores, list) or len(valores) != len(columnas):
+            raise ValueError("cantidad de valores incorrecta")
+
+        convertidos = []
+        for valor, columna in zip(valores, columnas):
+            tipo = columna.type.python_type
+            if valor is None:
+                convertidos.append(None)
+            elif tipo is datetime:
+                convertidos.append(datetime.fromisoformat(valor))
+            elif tipo is date:
+                convertidos.append(date.fromisoformat(valor))
+            else:
+                convertidos.append(tipo(valor))
+        return convertidos
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor de paginación inválido")
+
+
+def aplicar_keyset(consulta, params: ParametrosPagina, orden: Sequence[Any], descendente: bool = True):
+    """
+    Aplica a una Query o Select el orden por `orden` (clave, ..., id), el filtro
+    del cursor y un límite de `limit + 1` filas para saber si hay otra página.
+    """
+    if params.cursor:
+        valores = decodificar_cursor(params.cursor, orden)
+        actual = tuple_(*orden)
+        cursor = tuple_(*valores)
+        consulta = consulta.filter(actual < cursor if descendente else actual > cursor)
+
+    return (
+        consulta
+        .order_by(*(c.desc() if descendente else c.asc() for c in orden))
+        .limit(params.limit + 1)
+    )
+
+
+def armar_pagina(filas: Sequence[Any], params: ParametrosPagina, clave: Callable[[Any], Sequence[Any]]) -> dict:
+    """
+    Recorta la fila extra pedida por aplicar_keyset y arma el sobre de respuesta.
+    `clave` devuelve los valores de orden de una fila, en el mismo orden que en aplicar_keyset.
+    """
+    filas = list(filas)
+    hay_mas = len(filas) > params.limit
+    filas = filas[:params.limit]
+    return {
+        "items": filas,
+        "next_cursor": codificar_cursor(clave(filas[-1])) if hay_mas and filas else None,
+        "limit": params.limit,
+    }
@@ -0,0 +1,98 @@
+# Esquema base: las tablas tal como las creaba init_db() con create_all.
+# Las definiciones están congeladas acá (no se importan los modelos) para que
+# la migración produzca siempre el mismo resultado aunque los modelos cambien.
+# checkfirst=True adopta las bases ya creadas por la versión anterior.
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, ForeignKey, Integer, MetaData, Numeric, String, Table,
+)
+
+VERSION = 1
+DESCRIPCION = "Esquema inicial (usuarios, userDetail, tarifas, cuotas, pagos, pagos_eliminados, notificaciones_pago)"
+
+metadata = MetaData()
+
+Table(
+    "usuarios", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String(50), unique=True, nullable=False),
+    Column("password", String(100), nullable=False),
+)
+
+Table(
+    "userDetail", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("dni", Integer, nullable=False, unique=True),
+    Column("firstName", String, nullable=False),
+    Column("lastName", String, nullable=False),
+    Column("type", String(50), nullable=False),
+    Column("email", String(80), nullable=False, unique=True),
+    Column("anio_lectivo", Integer, nullable=True),
+    Column("estado_academico", String(30), nullable=True),
+    Column("user_id", Integer, ForeignKey("usuarios.id"), nullable=False),
+)
+
+Table(
+    "tarifas", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("monto_mensual", Numeric(10, 2), nullable=False),
+    Column("vigente_desde", Date, nullable=False),
+    Column("vigente_hasta", Date, nullable=True),
+    Column("creado_por", Integer, ForeignKey("usuarios.id")),
+)
+
+Table(
+    "cuotas", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("alumno_id", Integer, ForeignKey("usuarios.id"), nullable=False),
+    Column("periodo", String(7), nullable=False),
+    Column("fecha_vencimiento", Date, nullable=False),
+    Column("monto_base", Numeric(10, 2), nullable=False),
+    Column("ajuste_anterior", Numeric(10, 2)),
+    Column("monto_a_pagar", Numeric(10, 2), nullable=False),
+    Column("monto_pagado", Numeric(10, 2)),
+    Column("saldo_pendiente", Numeric(10, 2)),
+    Column("estado", String(20)),
+    Column("notificada", Boolean),
+)
+
+Table(
+    "pagos", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("alumno_id", Integer, ForeignKey("usuarios.id"), nullable=False),
+    Column("cuota_id", Integer, ForeignKey("cuotas.id"), nullable=False),
+    Column("monto_pagado", Numeric(10, 2), nullable=False),
+    Column("metodo", String(30), nullable=False),
+    Column("comprobante", String(100), nullable=True),
+    Column("fecha_pago", DateTime),
+    Column("registrado_por", Integer, ForeignKey("usuarios.id"), nullable=False),
+)
+
+Table(
+    "pagos_eliminados", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("pago_id_original", Integer, nullable=False),
+    Column("alumno_id", Integer, ForeignKey("usuarios.id"), nullable=False),
+    Column("cuota_id", Integer, ForeignKey("cuotas.id"), nullable=True),
+    Column("monto_pagado", Numeric(10, 2), nullable=False),
+    Column("metodo", String(30), nullable=False),
+    Column("comprobante", String(100), nullable=True),
+    Column("fecha_pago", DateTime, nullable=False),
+    Column("fecha_eliminacion", DateTime),
+    Column("eliminado_por", Integer, ForeignKey("usuarios.id"), nullable=False),
+    Column("motivo", String(255), nullable=True),
+)
+
+Table(
+    "notificaciones_pago", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("alumno_id", Integer, ForeignKey("usuarios.id"), nullable=False),
+    Column("cuota_id", Integer, ForeignKey("cuotas.id"), nullable=False),
+    Column("tipo", String(50), nullable=False),
+    Column("fecha_envio", DateTime),
+    Column("destinatario", String(20), nullable=False),
+    Column("mensaje", String(255), nullable=False),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
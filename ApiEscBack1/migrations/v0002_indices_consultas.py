@@ -0,0 +1,44 @@
+# Índices de las consultas calientes. En Postgres se construyen CONCURRENTLY
+# para no bloquear escrituras, por eso la migración corre fuera de transacción.
+#
+# uq_cuotas_alumno_periodo falla si ya hay cuotas duplicadas para un mismo
+# (alumno_id, periodo): hay que depurarlas antes de migrar.
+from config.migraciones import crear_indice
+
+VERSION = 2
+DESCRIPCION = "Índices para recordatorios, /pagos/mis, notificaciones, alumnos y cuota única por período"
+TRANSACCIONAL = False
+
+INDICES = [
+    # Recordatorios: cuotas por vencimiento aún no notificadas
+    ("ix_cuotas_vencimiento_notificada",
+     "CREATE INDEX {concurrently} IF NOT EXISTS ix_cuotas_vencimiento_notificada "
+     "ON cuotas (fecha_vencimiento, notificada)"),
+    # Una cuota por alumno y período (también sirve para buscar por alumno_id)
+    ("uq_cuotas_alumno_periodo",
+     "CREATE UNIQUE INDEX {concurrently} IF NOT EXISTS uq_cuotas_alumno_periodo "
+     "ON cuotas (alumno_id, periodo)"),
+    # /pagos/mis: pagos del alumno ordenados por fecha
+    ("ix_pagos_alumno_fecha",
+     "CREATE INDEX {concurrently} IF NOT EXISTS ix_pagos_alumno_fecha "
+     "ON pagos (alumno_id, fecha_pago, id)"),
+    # Pagos de una cuota (recalcular saldos, FK)
+    ("ix_pagos_cuota",
+     "CREATE INDEX {concurrently} IF NOT EXISTS ix_pagos_cuota ON pagos (cuota_id)"),
+    # /notificaciones/listar: más recientes primero
+    ("ix_notificaciones_pago_fecha_envio",
+     "CREATE INDEX {concurrently} IF NOT EXISTS ix_notificaciones_pago_fecha_envio "
+     "ON notificaciones_pago (fecha_envio)"),
+    # /pagos/eliminados: historial más reciente primero
+    ("ix_pagos_eliminados_fecha",
+     "CREATE INDEX {concurrently} IF NOT EXISTS ix_pagos_eliminados_fecha "
+     "ON pagos_eliminados (fecha_eliminacion, id)"),
+    # /user/alumnos y generación de cuotas: filtro por tipo
+    ("ix_userDetail_type",
+     'CREATE INDEX {concurrently} IF NOT EXISTS "ix_userDetail_type" ON "userDetail" (type, user_id)'),
+]
+
+
+def upgrade(conn):
+    for nombre, sentencia in INDICES:
+        crear_indice(conn, nombre, sentencia)
@@ -0,0 +1,37 @@
+# Búsqueda de usuarios (services/busqueda_usuarios.py): extensiones pg_trgm y
+# unaccent, el envoltorio IMMUTABLE f_unaccent y los índices GIN trigram.
+# En SQLite f_unaccent se registra por conexión y no hay índices que crear.
+from sqlalchemy import text
+
+from config.migraciones import crear_indice
+
+VERSION = 3
+DESCRIPCION = "Índices trigram y f_unaccent para la búsqueda de usuarios"
+TRANSACCIONAL = False
+
+INDICES = [
+    ("ix_usuarios_username_trgm",
+     "CREATE INDEX {concurrently} IF NOT EXISTS ix_usuarios_username_trgm "
+     "ON usuarios USING gin (f_unaccent(lower(username)) gin_trgm_ops)"),
+    ("ix_userDetail_nombre_trgm",
+     'CREATE INDEX {concurrently} IF NOT EXISTS "ix_userDetail_nombre_trgm" '
+     """ON "userDetail" USING gin (f_unaccent(lower("firstName" || ' ' || "lastName")) gin_trgm_ops)"""),
+    ("ix_userDetail_email_trgm",
+     'CREATE INDEX {concurrently} IF NOT EXISTS "ix_userDetail_email_trgm" '
+     'ON "userDetail" USING gin (f_unaccent(lower(email)) gin_trgm_ops)'),
+]
+
+
+def upgrade(conn):
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+    # unaccent() no es IMMUTABLE; el envoltorio permite usarla en índices de expresión
+    conn.execute(text(
+        "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS "
+        "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    ))
+    for nombre, sentencia in INDICES:
+        crear_indice(conn, nombre, sentencia)
@@ -0,0 +1,11 @@
+# usuarios.password pasa a guardar hashes Argon2id, que con parámetros más
+# altos pueden superar los 100 caracteres. SQLite no impone el largo.
+from sqlalchemy import text
+
+VERSION = 4
+DESCRIPCION = "Ampliar usuarios.password a 255 caracteres para hashes Argon2id"
+
+
+def upgrade(conn):
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("ALTER TABLE usuarios ALTER COLUMN password TYPE VARCHAR(255)"))
@@ -0,0 +1,28 @@
+# Tabla outbox: los pagos guardan un evento en su misma transacción y el
+# despachador en segundo plano (services/outbox.py) lo convierte en notificaciones.
+# Definición congelada, igual que en v0001.
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, MetaData, String, Table
+
+VERSION = 5
+DESCRIPCION = "Tabla outbox_eventos para el despacho de notificaciones en segundo plano"
+
+metadata = MetaData()
+
+Table(
+    "outbox_eventos", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("tipo", String(50), nullable=False),
+    Column("payload", JSON, nullable=False),
+    Column("estado", String(20), nullable=False),
+    Column("intentos", Integer, nullable=False),
+    Column("disponible_desde", DateTime, nullable=False),
+    Column("creado", DateTime, nullable=False),
+    Column("procesado", DateTime, nullable=True),
+    Column("ultimo_error", String(255), nullable=True),
+    # El despachador busca pendientes ya disponibles, en orden de llegada
+    Index("ix_outbox_eventos_pendientes", "estado", "disponible_desde", "id"),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
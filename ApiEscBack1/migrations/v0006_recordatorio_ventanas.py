@@ -0,0 +1,25 @@
+# Recordatorios con varias ventanas (services/recordatorios.py): cada recordatorio
+# guarda a qué ventana corresponde, y el índice resuelve el NOT EXISTS por cuota.
+# Los recordatorios anteriores eran todos de la ventana de 7 días.
+from sqlalchemy import inspect, text
+
+from config.migraciones import crear_indice
+
+VERSION = 6
+DESCRIPCION = "Columna notificaciones_pago.ventana e índice por cuota y tipo"
+TRANSACCIONAL = False
+
+
+def upgrade(conn):
+    columnas = {c["name"] for c in inspect(conn).get_columns("notificaciones_pago")}
+    if "ventana" not in columnas:
+        conn.execute(text("ALTER TABLE notificaciones_pago ADD COLUMN ventana INTEGER"))
+    conn.execute(text(
+        "UPDATE notificaciones_pago SET ventana = 7 "
+        "WHERE tipo = 'recordatorio_vencimiento' AND ventana IS NULL"
+    ))
+    crear_indice(
+        conn, "ix_notificaciones_pago_cuota_tipo",
+        "CREATE INDEX {concurrently} IF NOT EXISTS ix_notificaciones_pago_cuota_tipo "
+        "ON notificaciones_pago (cuota_id, tipo, ventana)",
+    )
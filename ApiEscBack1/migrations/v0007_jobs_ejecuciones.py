@@ -0,0 +1,28 @@
+# Historial del planificador de tareas (services/planificador.py). El índice único
+# por (tarea, programada) garantiza una sola corrida por turno entre todos los workers.
+# Definición congelada, igual que en v0001.
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, MetaData, String, Table
+
+VERSION = 7
+DESCRIPCION = "Tabla jobs_ejecuciones para el planificador de tareas"
+
+metadata = MetaData()
+
+Table(
+    "jobs_ejecuciones", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("tarea", String(50), nullable=False),
+    Column("programada", DateTime, nullable=False),
+    Column("inicio", DateTime, nullable=False),
+    Column("fin", DateTime, nullable=True),
+    Column("duracion_ms", Integer, nullable=True),
+    Column("estado", String(20), nullable=False),
+    Column("filas", JSON, nullable=True),
+    Column("error", String(255), nullable=True),
+    Column("worker", String(100), nullable=True),
+    Index("uq_jobs_ejecuciones_tarea_programada", "tarea", "programada", unique=True),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
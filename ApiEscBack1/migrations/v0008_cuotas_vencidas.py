@@ -0,0 +1,28 @@
+# Barrido de cuotas vencidas (services/vencimientos.py): tabla de marcas de agua
+# e índice parcial sobre las cuotas abiertas, que es lo único que el barrido
+# (y cualquier consulta de deuda) necesita recorrer.
+from sqlalchemy import Column, Date, DateTime, MetaData, String, Table
+
+from config.migraciones import crear_indice
+
+VERSION = 8
+DESCRIPCION = "Tabla marcas_agua e índice parcial de cuotas abiertas por vencimiento"
+TRANSACCIONAL = False
+
+metadata = MetaData()
+
+Table(
+    "marcas_agua", metadata,
+    Column("nombre", String(50), primary_key=True),
+    Column("valor", Date, nullable=True),
+    Column("actualizado", DateTime),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
+    crear_indice(
+        conn, "ix_cuotas_abiertas_vencimiento",
+        "CREATE INDEX {concurrently} IF NOT EXISTS ix_cuotas_abiertas_vencimiento "
+        "ON cuotas (fecha_vencimiento, id) WHERE estado IN ('pendiente', 'parcial')",
+    )
@@ -0,0 +1,37 @@
+# Resumen de deuda por alumno (services/saldos.py). Se carga acá con el estado
+# actual de las cuotas; desde entonces lo mantienen las rutas que tocan cuotas y pagos.
+# Definición congelada, igual que en v0001.
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, Numeric, String, Table, text
+
+VERSION = 9
+DESCRIPCION = "Tabla saldo_alumno con el resumen de deuda de cada alumno"
+
+metadata = MetaData()
+
+Table("usuarios", metadata, Column("id", Integer, primary_key=True))
+
+Table(
+    "saldo_alumno", metadata,
+    Column("alumno_id", Integer, ForeignKey("usuarios.id"), primary_key=True),
+    Column("total_a_pagar", Numeric(12, 2), nullable=False),
+    Column("total_pagado", Numeric(12, 2), nullable=False),
+    Column("saldo", Numeric(12, 2), nullable=False),
+    Column("periodo_abierto_mas_antiguo", String(7), nullable=True),
+    Column("cuotas_vencidas", Integer, nullable=False),
+    Column("actualizado", DateTime),
+    Index("ix_saldo_alumno_saldo", "saldo", "alumno_id"),
+)
+
+
+def upgrade(conn):
+    metadata.tables["saldo_alumno"].create(conn, checkfirst=True)
+    conn.execute(text(
+        "INSERT INTO saldo_alumno (alumno_id, total_a_pagar, total_pagado, saldo, "
+        "periodo_abierto_mas_antiguo, cuotas_vencidas, actualizado) "
+        "SELECT alumno_id, SUM(COALESCE(monto_a_pagar, 0)), SUM(COALESCE(monto_pagado, 0)), "
+        "SUM(COALESCE(saldo_pendiente, 0)), "
+        "MIN(CASE WHEN estado <> 'pagada' THEN periodo END), "
+        "SUM(CASE WHEN estado = 'vencida' THEN 1 ELSE 0 END), CURRENT_TIMESTAMP "
+        "FROM cuotas WHERE alumno_id NOT IN (SELECT alumno_id FROM saldo_alumno) "
+        "GROUP BY alumno_id"
+    ))
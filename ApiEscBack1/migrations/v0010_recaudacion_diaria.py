@@ -0,0 +1,32 @@
+# Totales de recaudación pre-agregados (services/recaudacion.py). Se cargan acá
+# desde los pagos existentes; desde entonces los mantienen las rutas de pagos.
+# Definición congelada, igual que en v0001.
+from sqlalchemy import Column, Date, Index, Integer, MetaData, Numeric, String, Table, text
+
+VERSION = 10
+DESCRIPCION = "Tabla recaudacion_diaria con totales por día, período y método"
+
+metadata = MetaData()
+
+Table(
+    "recaudacion_diaria", metadata,
+    Column("dia", Date, primary_key=True),
+    Column("periodo", String(7), primary_key=True),
+    Column("metodo", String(30), primary_key=True),
+    Column("cantidad", Integer, nullable=False),
+    Column("total", Numeric(14, 2), nullable=False),
+    Index("ix_recaudacion_diaria_periodo", "periodo"),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
+    if conn.execute(text("SELECT COUNT(*) FROM recaudacion_diaria")).scalar():
+        return
+    conn.execute(text(
+        "INSERT INTO recaudacion_diaria (dia, periodo, metodo, cantidad, total) "
+        "SELECT DATE(p.fecha_pago), c.periodo, p.metodo, COUNT(*), SUM(p.monto_pagado) "
+        "FROM pagos p JOIN cuotas c ON c.id = p.cuota_id "
+        "WHERE p.fecha_pago IS NOT NULL "
+        "GROUP BY DATE(p.fecha_pago), c.periodo, p.metodo"
+    ))
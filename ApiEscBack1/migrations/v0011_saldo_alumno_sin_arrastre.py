@@ -0,0 +1,51 @@
+# Deuda arrastrada en saldo_alumno. v0009 sumaba monto_a_pagar/saldo_pendiente de
+# todas las cuotas y contaba dos veces el saldo que /cuotas/generar-periodo pasa a
+# ajuste_anterior de la cuota siguiente. Desde acá la cuota nueva guarda en
+# arrastre_de de qué cuota vino ese ajuste, y services/saldos.py descuenta sólo
+# los ajustes arrastrados (no los cargados a mano por POST /cuotas/).
+#
+# Las cuotas existentes no saben de dónde salió su ajuste: se toma como arrastrado
+# todo ajuste distinto de cero de una cuota que tiene otra anterior del mismo
+# alumno, que es lo que hace la generación por período.
+from sqlalchemy import inspect, text
+
+from config.migraciones import crear_indice
+
+VERSION = 11
+DESCRIPCION = "cuotas.arrastre_de y saldo_alumno sin contar dos veces la deuda arrastrada"
+TRANSACCIONAL = False
+
+_DE_ALUMNO = "FROM cuotas c WHERE c.alumno_id = saldo_alumno.alumno_id"
+_VIGENTE = "NOT EXISTS (SELECT 1 FROM cuotas s WHERE s.arrastre_de = c.id)"
+_TOTAL = (
+    "SUM(COALESCE(c.monto_a_pagar, 0)) "
+    "- SUM(CASE WHEN c.arrastre_de IS NOT NULL THEN COALESCE(c.ajuste_anterior, 0) ELSE 0 END)"
+)
+_PAGADO = "SUM(COALESCE(c.monto_pagado, 0))"
+
+
+def upgrade(conn):
+    if "arrastre_de" not in {c["name"] for c in inspect(conn).get_columns("cuotas")}:
+        conn.execute(text("ALTER TABLE cuotas ADD COLUMN arrastre_de INTEGER REFERENCES cuotas (id)"))
+    crear_indice(
+        conn, "ix_cuotas_arrastre_de",
+        "CREATE INDEX {concurrently} IF NOT EXISTS ix_cuotas_arrastre_de ON cuotas (arrastre_de)",
+    )
+    conn.execute(text(
+        "UPDATE cuotas SET arrastre_de = ("
+        "SELECT a.id FROM cuotas a WHERE a.alumno_id = cuotas.alumno_id AND a.periodo < cuotas.periodo "
+        "ORDER BY a.periodo DESC LIMIT 1) "
+        "WHERE COALESCE(ajuste_anterior, 0) <> 0 AND arrastre_de IS NULL"
+    ))
+    # Una sola sentencia: si se corta, saldo_alumno queda como estaba
+    conn.execute(text(
+        "UPDATE saldo_alumno SET "
+        f"total_a_pagar = (SELECT COALESCE({_TOTAL}, 0) {_DE_ALUMNO}), "
+        f"total_pagado = (SELECT COALESCE({_PAGADO}, 0) {_DE_ALUMNO}), "
+        f"saldo = (SELECT COALESCE({_TOTAL} - {_PAGADO}, 0) {_DE_ALUMNO}), "
+        "periodo_abierto_mas_antiguo = (SELECT MIN(c.periodo) "
+        f"{_DE_ALUMNO} AND c.estado <> 'pagada' AND {_VIGENTE}), "
+        "cuotas_vencidas = (SELECT COUNT(*) "
+        f"{_DE_ALUMNO} AND c.estado = 'vencida' AND {_VIGENTE}), "
+        "actualizado = CURRENT_TIMESTAMP"
+    ))
@@ -1,10 +1,22 @@
 # models/cuota.py
 from config.db import Base
-from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 
 class Cuota(Base):
     __tablename__ = "cuotas"
+    # Índices creados por migrations/v0002_indices_consultas.py, v0008_cuotas_vencidas.py
+    # y v0011_saldo_alumno_sin_arrastre.py
+    __table_args__ = (
+        Index("ix_cuotas_vencimiento_notificada", "fecha_vencimiento", "notificada"),
+        Index("uq_cuotas_alumno_periodo", "alumno_id", "periodo", unique=True),
+        Index(
+            "ix_cuotas_abiertas_vencimiento", "fecha_vencimiento", "id",
+            postgresql_where=text("estado IN ('pendiente', 'parcial')"),
+            sqlite_where=text("estado IN ('pendiente', 'parcial')"),
+        ),
+        Index("ix_cuotas_arrastre_de", "arrastre_de"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     alumno_id = Column(ForeignKey("usuarios.id"), nullable=False)
@@ -12,6 +24,7 @@ class Cuota(Base):
     fecha_vencimiento = Column(Date, nullable=False)
     monto_base = Column(Numeric(10, 2), nullable=False)
     ajuste_anterior = Column(Numeric(10, 2), default=0)
+    arrastre_de = Column(ForeignKey("cuotas.id"), nullable=True)  # cuota cuyo saldo pasó a ajuste_anterior
     monto_a_pagar = Column(Numeric(10, 2), nullable=False)
     monto_pagado = Column(Numeric(10, 2), default=0)
     saldo_pendiente = Column(Numeric(10, 2), default=0)
@@ -0,0 +1,24 @@
+# models/ejecucionJob.py
+from config.db import Base
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+import datetime
+
+class EjecucionJob(Base):
+    """Una corrida de una tarea del planificador (services/planificador.py)."""
+    __tablename__ = "jobs_ejecuciones"
+    # Creado por migrations/v0007_jobs_ejecuciones.py
+    __table_args__ = (
+        # Un turno programado se ejecuta una sola vez aunque haya varios workers
+        Index("uq_jobs_ejecuciones_tarea_programada", "tarea", "programada", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    tarea = Column(String(50), nullable=False)
+    programada = Column(DateTime, nullable=False)   # turno del cron que se ejecuta
+    inicio = Column(DateTime, nullable=False, default=datetime.datetime.now)
+    fin = Column(DateTime, nullable=True)
+    duracion_ms = Column(Integer, nullable=True)
+    estado = Column(String(20), nullable=False, default="ejecutando")  # ejecutando, ok, error
+    filas = Column(JSON, nullable=True)              # resumen devuelto por la tarea
+    error = Column(String(255), nullable=True)
+    worker = Column(String(100), nullable=True)      # host:pid que la ejecutó
@@ -0,0 +1,29 @@
+# models/eventoOutbox.py
+from config.db import Base
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+import datetime
+
+class EventoOutbox(Base):
+    """
+    Evento pendiente de despachar (patrón outbox). Se guarda en la misma transacción
+    que la operación que lo origina; services/outbox.py lo expande en notificaciones.
+    """
+    __tablename__ = "outbox_eventos"
+    # Creado por migrations/v0005_outbox_eventos.py
+    __table_args__ = (
+        Index("ix_outbox_eventos_pendientes", "estado", "disponible_desde", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    tipo = Column(String(50), nullable=False)  # pago_registrado, pago_eliminado, recordatorio_vencimiento
+    payload = Column(JSON, nullable=False)
+    estado = Column(String(20), nullable=False, default="pendiente")  # pendiente, procesado, fallido
+    intentos = Column(Integer, nullable=False, default=0)
+    disponible_desde = Column(DateTime, nullable=False, default=datetime.datetime.now)
+    creado = Column(DateTime, nullable=False, default=datetime.datetime.now)
+    procesado = Column(DateTime, nullable=True)
+    ultimo_error = Column(String(255), nullable=True)
+
+    def __init__(self, tipo, payload):
+        self.tipo = tipo
+        self.payload = payload
@@ -0,0 +1,13 @@
+# models/marcaAgua.py
+from config.db import Base
+from sqlalchemy import Column, String, Date, DateTime
+import datetime
+
+class MarcaAgua(Base):
+    """Hasta dónde llegó un proceso incremental (p. ej. el barrido de cuotas vencidas)."""
+    __tablename__ = "marcas_agua"
+    # Creado por migrations/v0008_cuotas_vencidas.py
+
+    nombre = Column(String(50), primary_key=True)
+    valor = Column(Date, nullable=True)
+    actualizado = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
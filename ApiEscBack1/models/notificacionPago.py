@@ -1,10 +1,16 @@
 # models/notificacion_pago.py
 from config.db import Base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
 import datetime
 
 class NotificacionPago(Base):
     __tablename__ = "notificaciones_pago"
+    # Índices creados por migrations/v0002_indices_consultas.py y v0006_recordatorio_ventanas.py
+    __table_args__ = (
+        Index("ix_notificaciones_pago_fecha_envio", "fecha_envio"),
+        Index("ix_notificaciones_pago_cuota_tipo", "cuota_id", "tipo", "ventana"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     alumno_id = Column(ForeignKey("usuarios.id"), nullable=False)
@@ -13,6 +19,12 @@ class NotificacionPago(Base):
     fecha_envio = Column(DateTime, default=datetime.datetime.now)
     destinatario = Column(String(20), nullable=False)  # alumno, admin
     mensaje = Column(String(255), nullable=False)
+    ventana = Column(Integer, nullable=True)  # días antes del vencimiento (sólo recordatorios)
+
+    # Relaciones: para joins y joinedload/selectinload. lazy="raise" hace fallar el
+    # acceso perezoso (una consulta por notificación) en lugar de disimular un N+1.
+    alumno = relationship("User", foreign_keys=[alumno_id], lazy="raise")
+    cuota = relationship("Cuota", foreign_keys=[cuota_id], lazy="raise")
 
     def __init__(self, alumno_id, cuota_id, tipo, destinatario, mensaje):
         self.alumno_id = alumno_id
@@ -1,10 +1,15 @@
 from config.db import Base
-from sqlalchemy import Column, Integer, Numeric, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 import datetime
 
 class Pago(Base):
     __tablename__ = "pagos"
+    # Índices creados por migrations/v0002_indices_consultas.py
+    __table_args__ = (
+        Index("ix_pagos_alumno_fecha", "alumno_id", "fecha_pago", "id"),
+        Index("ix_pagos_cuota", "cuota_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     alumno_id = Column(ForeignKey("usuarios.id"), nullable=False)
@@ -1,5 +1,5 @@
 from config.db import Base
-from sqlalchemy import Column, Integer, Numeric, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, String, DateTime, ForeignKey, Index
 from datetime import datetime
 from sqlalchemy.orm import relationship
 
@@ -9,6 +9,10 @@ class PagoEliminado(Base):
     toda la información original y quién realizó la eliminación.
     """
     __tablename__ = "pagos_eliminados"
+    # Índices creados por migrations/v0002_indices_consultas.py
+    __table_args__ = (
+        Index("ix_pagos_eliminados_fecha", "fecha_eliminacion", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     pago_id_original = Column(Integer, nullable=False)
@@ -0,0 +1,17 @@
+# models/recaudacionDiaria.py
+from config.db import Base
+from sqlalchemy import Column, Integer, String, Date, Numeric, Index
+
+class RecaudacionDiaria(Base):
+    """Total cobrado por día, período de la cuota y método de pago (services/recaudacion.py)."""
+    __tablename__ = "recaudacion_diaria"
+    # Creado por migrations/v0010_recaudacion_diaria.py
+    __table_args__ = (
+        Index("ix_recaudacion_diaria_periodo", "periodo"),
+    )
+
+    dia = Column(Date, primary_key=True)            # fecha_pago sin la hora
+    periodo = Column(String(7), primary_key=True)   # período de la cuota pagada, 'YYYY-MM'
+    metodo = Column(String(30), primary_key=True)
+    cantidad = Column(Integer, nullable=False, default=0)
+    total = Column(Numeric(14, 2), nullable=False, default=0)
@@ -0,0 +1,21 @@
+# models/saldoAlumno.py
+from config.db import Base
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Index
+import datetime
+
+class SaldoAlumno(Base):
+    """Resumen de deuda por alumno, mantenido por services/saldos.py."""
+    __tablename__ = "saldo_alumno"
+    # Creado por migrations/v0009_saldo_alumno.py
+    __table_args__ = (
+        # Ranking de deudores: ORDER BY saldo DESC, alumno_id DESC LIMIT n
+        Index("ix_saldo_alumno_saldo", "saldo", "alumno_id"),
+    )
+
+    alumno_id = Column(ForeignKey("usuarios.id"), primary_key=True)
+    total_a_pagar = Column(Numeric(12, 2), nullable=False, default=0)
+    total_pagado = Column(Numeric(12, 2), nullable=False, default=0)
+    saldo = Column(Numeric(12, 2), nullable=False, default=0)
+    periodo_abierto_mas_antiguo = Column(String(7), nullable=True)  # 'YYYY-MM'; None si no debe nada
+    cuotas_vencidas = Column(Integer, nullable=False, default=0)
+    actualizado = Column(DateTime, default=datetime.datetime.now)
@@ -7,7 +7,7 @@ class User(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, nullable=False)
-    password = Column(String(100), nullable=False)
+    password = Column(String(255), nullable=False)  # hash Argon2id (ver auth/contrasenas.py)
 
     # Relaciones principales
     userdetail = relationship("UserDetail", back_populates="user", uselist=False)
@@ -1,9 +1,13 @@
 from config.db import Base
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 class UserDetail(Base):
     __tablename__ = "userDetail"
+    # Índices creados por migrations/v0002_indices_consultas.py
+    __table_args__ = (
+        Index("ix_userDetail_type", "type", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     dni = Column(Integer, nullable=False, unique=True)
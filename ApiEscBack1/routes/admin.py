@@ -0,0 +1,65 @@
+# routes/admin.py
+from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from config.db import (
+    get_db, estado_pools, estadisticas_pool, estadisticas_pool_async, estadisticas_pool_lectura, read_engine,
+)
+from config.settings import settings
+from auth.seguridad import solo_admin
+from services.outbox import resumen_outbox
+from services.planificador import TAREAS, ejecutar_tarea, estado_tareas
+
+admin = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+# 📊 ADMIN: Estado del pool de conexiones (espera por checkout y uso actual)
+@admin.get("/db/pool", response_model=dict)
+def estado_pool_db(payload: dict = Depends(solo_admin)):
+    return {
+        "configuracion": {
+            "pool": settings.db_pool,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+        },
+        "pools": estado_pools(),
+    }
+
+
+# 🔄 ADMIN: Reiniciar los contadores de espera (los gauges no se ven afectados)
+@admin.post("/db/pool/reiniciar", response_model=dict)
+def reiniciar_estadisticas_pool(payload: dict = Depends(solo_admin)):
+    estadisticas_pool.reiniciar()
+    estadisticas_pool_async.reiniciar()
+    if read_engine is not None:
+        estadisticas_pool_lectura.reiniciar()
+    return {"message": "Estadísticas del pool reiniciadas"}
+
+
+# 🔔 ADMIN: Estado del outbox de notificaciones (pendientes, fallidos, atraso)
+@admin.get("/outbox", response_model=dict)
+def estado_outbox(db: Session = Depends(get_db), payload: dict = Depends(solo_admin)):
+    return resumen_outbox(db)
+
+
+# ⏰ ADMIN: Tareas programadas (cron, próximo turno y última corrida con duración y filas)
+@admin.get("/jobs", response_model=list)
+def listar_jobs(db: Session = Depends(get_db), payload: dict = Depends(solo_admin)):
+    return estado_tareas(db)
+
+
+# ▶️ ADMIN: Ejecutar una tarea ahora, fuera de su horario
+@admin.post("/jobs/{nombre}/ejecutar", response_model=dict)
+def ejecutar_job(nombre: str, payload: dict = Depends(solo_admin)):
+    tarea = TAREAS.get(nombre)
+    if not tarea:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+
+    ejecucion = ejecutar_tarea(tarea, datetime.now().replace(microsecond=0))
+    if ejecucion is None:
+        raise HTTPException(status_code=409, detail="La tarea ya se está ejecutando en otro worker")
+    return ejecucion
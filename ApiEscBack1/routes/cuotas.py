@@ -1,30 +1,28 @@
 # routes/cuotas.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, insert, func, exists, literal, case, Numeric, Date, String, Boolean
+from sqlalchemy.orm import Session, aliased
 from datetime import date, timedelta
-from config.db import get_db
+from config.db import get_db, get_read_db
+from config.paginacion import ParametrosPagina, parametros_pagina, aplicar_keyset, armar_pagina
+from auth.seguridad import obtener_usuario_desde_token, solo_admin
+from config.settings import settings
 from models.cuota import Cuota
-from models.tarifa import Tarifa
-from schemas.cuota import CuotaBase, CuotaOut
-from typing import List
+from models.saldoAlumno import SaldoAlumno
+from services.presupuesto_consultas import presupuesto_consultas
+from services.saldos import refrescar_saldos
+from services.tarifa_vigente import resolver_tarifa_vigente
+from models.userDetail import UserDetail
+from schemas.cuota import CuotaBase, CuotaOut, CuotaPeriodoIn, GeneracionPeriodoOut, SaldoAlumnoOut
+from schemas.paginacion import Pagina
+from typing import List, Optional
 
 cuotas = APIRouter(prefix="/cuotas", tags=["Cuotas"])
 
-# Obtener la tarifa vigente
-def get_tarifa_vigente(db: Session):
-    hoy = date.today()
-    return (
-        db.query(Tarifa)
-        .filter(Tarifa.vigente_desde <= hoy)
-        .filter((Tarifa.vigente_hasta == None) | (Tarifa.vigente_hasta >= hoy))
-        .order_by(Tarifa.vigente_desde.desc())
-        .first()
-    )
-
 # Crear una nueva cuota
 @cuotas.post("/", response_model=CuotaOut)
 def generar_cuota(data: CuotaBase, db: Session = Depends(get_db)):
-    tarifa = get_tarifa_vigente(db)
+    tarifa = resolver_tarifa_vigente(db)
     if not tarifa:
         raise HTTPException(status_code=404, detail="No hay tarifa vigente")
 
@@ -38,11 +36,172 @@ def generar_cuota(data: CuotaBase, db: Session = Depends(get_db)):
     )
 
     db.add(nueva)
+    db.flush()
+    refrescar_saldos(db, [nueva.alumno_id])
     db.commit()
     db.refresh(nueva)
     return nueva
 
-# Listar todas las cuotas
-@cuotas.get("/", response_model=List[CuotaOut])
-def listar_cuotas(db: Session = Depends(get_db)):
-    return db.query(Cuota).order_by(Cuota.id.desc()).all()
+# 🗓️ ADMIN: Generar las cuotas de un período para todos los alumnos
+@cuotas.post("/generar-periodo", response_model=GeneracionPeriodoOut)
+def generar_cuotas_periodo(
+    data: CuotaPeriodoIn,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(solo_admin)
+):
+    """
+    Crea en un solo INSERT ... SELECT la cuota del período para cada alumno.
+    El saldo pendiente de su cuota anterior pasa a ajuste_anterior y arrastre_de
+    apunta a esa cuota (services/saldos.py no la vuelve a contar).
+    Es idempotente: los alumnos que ya tienen cuota en ese período se omiten.
+    """
+    tarifa = resolver_tarifa_vigente(db)
+    if not tarifa:
+        raise HTTPException(status_code=404, detail="No hay tarifa vigente")
+
+    monto_base = literal(tarifa.monto_mensual, Numeric(10, 2))
+
+    anterior = aliased(Cuota)
+
+    def de_la_anterior(columna):
+        return (
+            select(columna)
+            .where(anterior.alumno_id == UserDetail.user_id)
+            .where(anterior.periodo < data.periodo)
+            .order_by(anterior.periodo.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    saldo_anterior = func.coalesce(de_la_anterior(anterior.saldo_pendiente), 0)
+    arrastre_de = case((saldo_anterior != 0, de_la_anterior(anterior.id)))
+    ya_tiene_cuota = (
+        exists()
+        .where(Cuota.alumno_id == UserDetail.user_id)
+        .where(Cuota.periodo == data.periodo)
+    )
+
+    alumnos = select(UserDetail.user_id).where(UserDetail.type == "Alumno")
+    total_alumnos = db.scalar(select(func.count()).select_from(alumnos.subquery()))
+
+    filas = (
+        alumnos
+        .add_columns(
+            literal(data.periodo, String(7)),
+            literal(data.fecha_vencimiento, Date),
+            monto_base,
+            saldo_anterior,
+            arrastre_de,
+            monto_base + saldo_anterior,
+            literal(0, Numeric(10, 2)),
+            monto_base + saldo_anterior,
+            literal("pendiente", String(20)),
+            literal(False, Boolean),
+        )
+        .where(~ya_tiene_cuota)
+    )
+
+    try:
+        resultado = db.execute(
+            insert(Cuota).from_select(
+                [
+                    Cuota.alumno_id,
+                    Cuota.periodo,
+                    Cuota.fecha_vencimiento,
+                    Cuota.monto_base,
+                    Cuota.ajuste_anterior,
+                    Cuota.arrastre_de,
+                    Cuota.monto_a_pagar,
+                    Cuota.monto_pagado,
+                    Cuota.saldo_pendiente,
+                    Cuota.estado,
+                    Cuota.notificada,
+                ],
+                filas,
+            )
+        )
+        refrescar_saldos(db, select(Cuota.alumno_id).where(Cuota.periodo == data.periodo))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print("Error al generar cuotas del período:", e)
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+    creadas = resultado.rowcount
+    return {
+        "periodo": data.periodo,
+        "tarifa_id": tarifa.id,
+        "monto_base": float(tarifa.monto_mensual),
+        "creadas": creadas,
+        "omitidas": total_alumnos - creadas,
+    }
+
+# Listar cuotas (paginado por cursor, más recientes primero)
+@cuotas.get("/", response_model=Pagina[CuotaOut])
+@presupuesto_consultas(1)
+def listar_cuotas(
+    estado: Optional[str] = Query(None, pattern="^(pendiente|parcial|pagada|vencida)$"),
+    db: Session = Depends(get_read_db),
+    pagina: ParametrosPagina = Depends(parametros_pagina)
+):
+    consulta = db.query(Cuota)
+    if estado:
+        consulta = consulta.filter(Cuota.estado == estado)
+    filas = aplicar_keyset(consulta, pagina, (Cuota.id,)).all()
+    return armar_pagina(filas, pagina, lambda c: (c.id,))
+
+
+# 💰 Resumen de deuda por alumno (tabla saldo_alumno, services/saldos.py)
+def _consulta_resumen(db: Session):
+    nombre = (UserDetail.firstName + literal(" ") + UserDetail.lastName).label("nombre")
+    return (
+        db.query(SaldoAlumno, nombre)
+        .outerjoin(UserDetail, UserDetail.user_id == SaldoAlumno.alumno_id)
+    )
+
+
+def _saldo_out(fila) -> dict:
+    saldo, nombre = fila
+    return {
+        "alumno_id": saldo.alumno_id,
+        "nombre": nombre,
+        "total_a_pagar": saldo.total_a_pagar,
+        "total_pagado": saldo.total_pagado,
+        "saldo": saldo.saldo,
+        "periodo_abierto_mas_antiguo": saldo.periodo_abierto_mas_antiguo,
+        "cuotas_vencidas": saldo.cuotas_vencidas,
+        "actualizado": saldo.actualizado,
+    }
+
+
+# 👑 ADMIN: Alumnos con más deuda (recorre el índice por saldo, no las cuotas)
+@cuotas.get("/resumen", response_model=List[SaldoAlumnoOut])
+def mayores_deudores(
+    top: int = Query(20, ge=1, le=settings.pagina_limite_max),
+    db: Session = Depends(get_db),
+    payload: dict = Depends(solo_admin)
+):
+    filas = (
+        _consulta_resumen(db)
+        .filter(SaldoAlumno.saldo > 0)
+        .order_by(SaldoAlumno.saldo.desc(), SaldoAlumno.alumno_id.desc())
+        .limit(top)
+        .all()
+    )
+    return [_saldo_out(f) for f in filas]
+
+
+# 👤 ADMIN o ALUMNO: Resumen de un alumno (el alumno sólo ve el suyo)
+@cuotas.get("/resumen/{alumno_id}", response_model=SaldoAlumnoOut)
+def resumen_alumno(
+    alumno_id: int,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(obtener_usuario_desde_token)
+):
+    if payload["type"] != "Admin" and int(payload["sub"]) != alumno_id:
+        raise HTTPException(status_code=403, detail="No autorizado para ver este resumen")
+
+    fila = _consulta_resumen(db).filter(SaldoAlumno.alumno_id == alumno_id).first()
+    if not fila:
+        raise HTTPException(status_code=404, detail="El alumno no tiene cuotas registradas")
+    return _saldo_out(fila)
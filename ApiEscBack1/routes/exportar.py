@@ -0,0 +1,161 @@
+# routes/exportar.py
+# Exportaciones para contabilidad: las filas se leen con un cursor del lado del
+# servidor (yield_per) y se escriben en la respuesta a medida que llegan, así la
+# memoria se mantiene constante sin importar cuántas filas haya.
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Iterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from config.db import SessionLocal
+from auth.seguridad import solo_admin
+from models.pago import Pago
+from models.cuota import Cuota
+from models.notificacionPago import NotificacionPago
+
+exportar = APIRouter(prefix="/export", tags=["Exportación"])
+
+FILAS_POR_LOTE = 1000
+
+_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _valor_json(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+def _filtrar_fechas(consulta, columna, desde: Optional[date], hasta: Optional[date]):
+    if desde:
+        consulta = consulta.where(columna >= desde)
+    if hasta:
+        # `hasta` es inclusive también para columnas DateTime
+        consulta = consulta.where(columna < hasta + timedelta(days=1))
+    return consulta
+
+
+def _filas_en_streaming(consulta, formato: str) -> Iterator[str]:
+    """Ejecuta la consulta con su propia sesión (vive lo que dura el streaming) y la serializa por lotes."""
+    with SessionLocal() as db:
+        resultado = db.execute(consulta.execution_options(yield_per=FILAS_POR_LOTE))
+        columnas = list(resultado.keys())
+
+        if formato == "csv":
+            buffer = io.StringIO()
+            escritor = csv.writer(buffer)
+            escritor.writerow(columnas)
+            for lote in resultado.partitions():
+                escritor.writerows(lote)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+            if buffer.tell():
+                yield buffer.getvalue()  # sólo el encabezado: no hubo filas
+        else:
+            for lote in resultado.partitions():
+                yield "".join(
+                    json.dumps({c: _valor_json(v) for c, v in zip(columnas, fila)}, ensure_ascii=False) + "\n"
+                    for fila in lote
+                )
+
+
+def _respuesta(consulta, formato: str, nombre: str) -> StreamingResponse:
+    return StreamingResponse(
+        _filas_en_streaming(consulta, formato),
+        media_type=_MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}.{formato}"'},
+    )
+
+
+# 📤 ADMIN: Exportar pagos
+@exportar.get("/pagos")
+def exportar_pagos(
+    formato: Literal["csv", "ndjson"] = "csv",
+    desde: Optional[date] = Query(None, description="Fecha de pago desde (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha de pago hasta (inclusive)"),
+    alumno_id: Optional[int] = None,
+    payload: dict = Depends(solo_admin)
+):
+    consulta = (
+        select(
+            Pago.id,
+            Pago.alumno_id,
+            Pago.cuota_id,
+            Cuota.periodo,
+            Pago.monto_pagado,
+            Pago.metodo,
+            Pago.comprobante,
+            Pago.fecha_pago,
+            Pago.registrado_por,
+        )
+        .outerjoin(Cuota, Cuota.id == Pago.cuota_id)
+        .order_by(Pago.id)
+    )
+    consulta = _filtrar_fechas(consulta, Pago.fecha_pago, desde, hasta)
+    if alumno_id is not None:
+        consulta = consulta.where(Pago.alumno_id == alumno_id)
+    return _respuesta(consulta, formato, "pagos")
+
+
+# 📤 ADMIN: Exportar cuotas
+@exportar.get("/cuotas")
+def exportar_cuotas(
+    formato: Literal["csv", "ndjson"] = "csv",
+    desde: Optional[date] = Query(None, description="Fecha de vencimiento desde (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha de vencimiento hasta (inclusive)"),
+    alumno_id: Optional[int] = None,
+    payload: dict = Depends(solo_admin)
+):
+    consulta = select(
+        Cuota.id,
+        Cuota.alumno_id,
+        Cuota.periodo,
+        Cuota.fecha_vencimiento,
+        Cuota.monto_base,
+        Cuota.ajuste_anterior,
+        Cuota.monto_a_pagar,
+        Cuota.monto_pagado,
+        Cuota.saldo_pendiente,
+        Cuota.estado,
+        Cuota.notificada,
+    ).order_by(Cuota.id)
+    consulta = _filtrar_fechas(consulta, Cuota.fecha_vencimiento, desde, hasta)
+    if alumno_id is not None:
+        consulta = consulta.where(Cuota.alumno_id == alumno_id)
+    return _respuesta(consulta, formato, "cuotas")
+
+
+# 📤 ADMIN: Exportar notificaciones
+@exportar.get("/notificaciones")
+def exportar_notificaciones(
+    formato: Literal["csv", "ndjson"] = "csv",
+    desde: Optional[date] = Query(None, description="Fecha de envío desde (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha de envío hasta (inclusive)"),
+    alumno_id: Optional[int] = None,
+    payload: dict = Depends(solo_admin)
+):
+    consulta = select(
+        NotificacionPago.id,
+        NotificacionPago.alumno_id,
+        NotificacionPago.cuota_id,
+        NotificacionPago.tipo,
+        NotificacionPago.destinatario,
+        NotificacionPago.mensaje,
+        NotificacionPago.fecha_envio,
+    ).order_by(NotificacionPago.id)
+    consulta = _filtrar_fechas(consulta, NotificacionPago.fecha_envio, desde, hasta)
+    if alumno_id is not None:
+        consulta = consulta.where(NotificacionPago.alumno_id == alumno_id)
+    return _respuesta(consulta, formato, "notificaciones")
@@ -0,0 +1,23 @@
+# routes/metricas.py
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+
+from config.settings import settings
+from services.metricas import exponer
+
+metricas = APIRouter(tags=["Métricas"])
+
+CONTENT_TYPE_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# 📈 Métricas en formato de texto de Prometheus (latencia por ruta, consultas, pool)
+@metricas.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def exponer_metricas(authorization: Optional[str] = Header(None)):
+    if settings.metricas_token:
+        esperado = f"Bearer {settings.metricas_token}"
+        if not authorization or not hmac.compare_digest(authorization, esperado):
+            raise HTTPException(status_code=401, detail="Token de métricas inválido")
+    return PlainTextResponse(exponer(), media_type=CONTENT_TYPE_PROMETHEUS)
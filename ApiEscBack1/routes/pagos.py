@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from fastapi.responses import JSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
 from typing import List
 
-from config.db import get_db
+from config.db import get_db, get_read_db
+from config.paginacion import ParametrosPagina, parametros_pagina, aplicar_keyset, armar_pagina
 from auth.seguridad import obtener_usuario_desde_token, solo_admin
-from models.pago import Pago
 from models.cuota import Cuota
+from models.pago import Pago
 from models.user import User
 from models.pagoEliminado import PagoEliminado
-from models.notificacionPago import NotificacionPago
-from schemas.pago import PagoBase, PagoOut, PagoEliminadoIn, PagoEliminadoOut
-from psycopg2 import IntegrityError
+from schemas.pago import PagoBase, PagoOut, PagoEliminadoIn, PagoEliminadoOut, PagoLoteOut
+from schemas.paginacion import Pagina
+from services.outbox import registrar_evento
+from services.pagos import aplicar_pago, consulta_pagos_out, recalcular_saldos
+from services.pagos_lote import importar_pagos
+from services.presupuesto_consultas import presupuesto_consultas
+from services.recaudacion import Movimiento, acumular_recaudacion
+from services.saldos import refrescar_saldos
+from sqlalchemy.exc import IntegrityError
 
 
 pagos = APIRouter(prefix="/pagos", tags=["Pagos"])
@@ -30,66 +38,40 @@ def nuevo_pago(
             raise HTTPException(status_code=403, detail="No autorizado para registrar pagos")
 
         alumno_id = data.alumno_id or int(payload["sub"])
-        monto_pagado = float(data.monto_pagado)
+        monto_pagado = data.monto_pagado
 
-        cuota = db.query(Cuota).filter_by(id=data.cuota_id, alumno_id=alumno_id).first()
+        # Saldo y estado se recalculan en la base (UPDATE … RETURNING, fila bloqueada hasta el commit)
+        cuota = aplicar_pago(db, data.cuota_id, monto_pagado, alumno_id=alumno_id)
         if not cuota:
             raise HTTPException(status_code=404, detail="Cuota no encontrada")
 
-        # Calcular saldo evitando negativos
-        cuota.monto_pagado += monto_pagado
-        cuota.saldo_pendiente = max(0, float(cuota.monto_a_pagar) - float(cuota.monto_pagado))
-
-        # Actualizar estado según saldo
-        if cuota.saldo_pendiente == 0:
-            cuota.estado = "pagada"
-        elif 0 < cuota.saldo_pendiente < float(cuota.monto_a_pagar):
-            cuota.estado = "parcial"
-        else:
-            cuota.estado = "pendiente"
-
         # Crear registro del pago
+        ahora = datetime.now()
         nuevo = Pago(
             alumno_id=alumno_id,
             cuota_id=cuota.id,
             monto_pagado=monto_pagado,
             metodo=data.metodo,
             comprobante=data.comprobante,
-            registrado_por=payload["sub"]
+            fecha_pago=ahora,
+            registrado_por=int(payload["sub"])
         )
         db.add(nuevo)
-        db.commit()
+        refrescar_saldos(db, [cuota.alumno_id])
+        acumular_recaudacion(db, [Movimiento(ahora, cuota.periodo, data.metodo, monto_pagado)])
 
-        # 🔔 Crear notificaciones automáticas
-        mensaje_alumno = (
-            f"Se registró un pago de ${monto_pagado:,.2f} "
-            f"para tu cuota del período {cuota.periodo}."
-        )
-        mensaje_admin = (
-            f"El alumno ID {alumno_id} realizó un pago de ${monto_pagado:,.2f} "
-            f"para la cuota {cuota.periodo}."
-        )
-
-        notif_alumno = NotificacionPago(
-            alumno_id=alumno_id,
-            cuota_id=cuota.id,
-            tipo="pago_registrado",
-            destinatario="alumno",
-            mensaje=mensaje_alumno
+        # 🔔 Las notificaciones se generan en segundo plano (services/outbox.py)
+        registrar_evento(
+            db, "pago_registrado",
+            alumno_id=alumno_id, cuota_id=cuota.id, monto=monto_pagado, periodo=cuota.periodo
         )
-        notif_admin = NotificacionPago(
-            alumno_id=alumno_id,
-            cuota_id=cuota.id,
-            tipo="pago_registrado",
-            destinatario="admin",
-            mensaje=mensaje_admin
-        )
-
-        db.add_all([notif_alumno, notif_admin])
         db.commit()
 
-        return {"message": "Pago registrado y notificaciones enviadas correctamente"}
+        return {"message": "Pago registrado correctamente"}
 
+    except HTTPException:
+        db.rollback()
+        raise
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Error de integridad al registrar pago")
@@ -99,6 +81,28 @@ def nuevo_pago(
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
+# 📦 ADMIN: Importar pagos desde un CSV del banco / procesador de pagos
+@pagos.post("/lote", response_model=PagoLoteOut)
+def importar_lote_pagos(
+    archivo: UploadFile = File(...),
+    dry_run: bool = Query(False, description="Sólo validar: informa el resultado sin guardar nada"),
+    db: Session = Depends(get_db),
+    payload: dict = Depends(solo_admin)
+):
+    try:
+        return importar_pagos(db, archivo.file, registrado_por=int(payload["sub"]), dry_run=dry_run)
+    except HTTPException:
+        db.rollback()
+        raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Error de integridad al importar pagos")
+    except Exception as e:
+        db.rollback()
+        print("Error al importar lote de pagos:", e)
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
 # 📌 ADMIN: Eliminar pago y registrar en historial
 @pagos.delete("/eliminar/{pago_id}")
 def eliminar_pago(
@@ -107,7 +111,8 @@ def eliminar_pago(
     db: Session = Depends(get_db),
     payload: dict = Depends(solo_admin)
 ):
-    pago_obj = db.query(Pago).filter_by(id=pago_id).first()
+    # FOR UPDATE: dos eliminaciones simultáneas del mismo pago no descuentan dos veces
+    pago_obj = db.query(Pago).filter_by(id=pago_id).with_for_update().first()
     if not pago_obj:
         raise HTTPException(status_code=404, detail="Pago no encontrado")
 
@@ -118,31 +123,24 @@ def eliminar_pago(
         registro = PagoEliminado(pago=pago_obj, eliminado_por=payload["sub"], motivo=motivo)
         db.add(registro)
 
-        # Ajustar saldo en la cuota
-        cuota = db.query(Cuota).filter_by(id=pago_obj.cuota_id).first()
-        if cuota:
-            cuota.monto_pagado -= pago_obj.monto_pagado
-            cuota.saldo_pendiente = max(0, float(cuota.monto_a_pagar) - float(cuota.monto_pagado))
-            cuota.estado = "pendiente" if cuota.monto_pagado <= 0 else "parcial"
-
-        # 🔔 Registrar notificación por eliminación
-        mensaje_admin = (
-            f"Se eliminó el pago ID {pago_obj.id} del alumno ID {pago_obj.alumno_id}. "
-            f"Monto: ${float(pago_obj.monto_pagado):,.2f}. Motivo: {motivo or 'No especificado'}."
-        )
-        notif = NotificacionPago(
-            alumno_id=pago_obj.alumno_id,
-            cuota_id=pago_obj.cuota_id,
-            tipo="pago_eliminado",
-            destinatario="admin",
-            mensaje=mensaje_admin
+        # Ajustar saldo en la cuota (mismo UPDATE atómico que al registrar el pago)
+        cuota = aplicar_pago(db, pago_obj.cuota_id, -pago_obj.monto_pagado)
+        refrescar_saldos(db, [pago_obj.alumno_id])
+        acumular_recaudacion(db, [
+            Movimiento(pago_obj.fecha_pago, cuota.periodo, pago_obj.metodo, pago_obj.monto_pagado).inverso()
+        ])
+
+        # 🔔 Registrar notificación por eliminación (se envía desde el outbox)
+        registrar_evento(
+            db, "pago_eliminado",
+            pago_id=pago_obj.id, alumno_id=pago_obj.alumno_id, cuota_id=pago_obj.cuota_id,
+            monto=pago_obj.monto_pagado, motivo=motivo
         )
-        db.add(notif)
 
         # Eliminar el pago original
         db.delete(pago_obj)
         db.commit()
-        return {"message": "Pago eliminado, registrado y notificado"}
+        return {"message": "Pago eliminado y registrado en el historial"}
 
     except Exception as e:
         db.rollback()
@@ -151,17 +149,19 @@ def eliminar_pago(
 
 
 # 📜 ADMIN: Ver historial de pagos eliminados
-@pagos.get("/eliminados", response_model=List[PagoEliminadoOut])
+@pagos.get("/eliminados", response_model=Pagina[PagoEliminadoOut])
+@presupuesto_consultas(1)
 def listar_pagos_eliminados(
     db: Session = Depends(get_db),
-    payload: dict = Depends(solo_admin)
+    payload: dict = Depends(solo_admin),
+    pagina: ParametrosPagina = Depends(parametros_pagina)
 ):
-    registros = (
-        db.query(PagoEliminado)
-        .order_by(PagoEliminado.fecha_eliminacion.desc())
-        .all()
-    )
-    return registros
+    registros = aplicar_keyset(
+        db.query(PagoEliminado),
+        pagina,
+        (PagoEliminado.fecha_eliminacion, PagoEliminado.id),
+    ).all()
+    return armar_pagina(registros, pagina, lambda r: (r.fecha_eliminacion, r.id))
 
 
 # 📊 ADMIN: Ver último pago registrado
@@ -189,32 +189,21 @@ def obtener_ultimo_pago(
 
 
 # 👤 ALUMNO: Ver sus propios pagos
-@pagos.get("/mis", response_model=List[PagoOut])
+@pagos.get("/mis", response_model=Pagina[PagoOut])
+@presupuesto_consultas(1)
 def ver_mis_pagos(
-    db: Session = Depends(get_db),
-    payload: dict = Depends(obtener_usuario_desde_token)
+    db: Session = Depends(get_read_db),
+    payload: dict = Depends(obtener_usuario_desde_token),
+    pagina: ParametrosPagina = Depends(parametros_pagina)
 ):
     if payload["type"] != "Alumno":
         raise HTTPException(status_code=403, detail="Solo los alumnos pueden ver sus pagos")
 
-    pagos_alumno = (
-        db.query(Pago)
-        .options(joinedload(Pago.cuota))
-        .filter(Pago.alumno_id == int(payload["sub"]))
-        .order_by(Pago.fecha_pago.desc())
-        .all()
-    )
-
-    return [
-        {
-            "id": p.id,
-            "monto_pagado": float(p.monto_pagado),
-            "fecha_pago": p.fecha_pago.strftime("%Y-%m-%d"),
-            "metodo": p.metodo,
-            "periodo": p.cuota.periodo if p.cuota else "Sin período"
-        }
-        for p in pagos_alumno
-    ]
+    # Filas de columnas: el response_model las valida una sola vez y las serializa a bytes
+    pagos_alumno = db.execute(
+        aplicar_keyset(consulta_pagos_out(int(payload["sub"])), pagina, (Pago.fecha_pago, Pago.id))
+    ).all()
+    return armar_pagina(pagos_alumno, pagina, lambda p: (p.fecha_pago, p.id))
 
 
 # ⚙️ ADMIN: Editar pago parcialmente
@@ -225,13 +214,29 @@ def editar_pago_parcial(
     db: Session = Depends(get_db),
     payload: dict = Depends(solo_admin)
 ):
-    pago_existente = db.query(Pago).filter_by(id=pago_id).first()
+    pago_existente = db.query(Pago).filter_by(id=pago_id).with_for_update().first()
     if not pago_existente:
         raise HTTPException(status_code=404, detail="Pago no encontrado")
 
+    def movimiento(pago: Pago) -> Movimiento:
+        periodo = db.scalar(select(Cuota.periodo).where(Cuota.id == pago.cuota_id))
+        return Movimiento(pago.fecha_pago, periodo, pago.metodo, pago.monto_pagado)
+
+    antes = (pago_existente.cuota_id, pago_existente.alumno_id)
+    movimiento_anterior = movimiento(pago_existente)
     for campo, valor in datos.items():
         if hasattr(pago_existente, campo):
             setattr(pago_existente, campo, valor)
 
-    db.commit()
+    try:
+        db.flush()
+        # Si cambió el monto o la cuota, se recalculan las cuotas y el resumen de ambos lados
+        recalcular_saldos(db, {antes[0], pago_existente.cuota_id})
+        refrescar_saldos(db, {antes[1], pago_existente.alumno_id})
+        acumular_recaudacion(db, [movimiento_anterior.inverso(), movimiento(pago_existente)])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print("Error al editar pago:", e)
+        raise HTTPException(status_code=400, detail="No se pudo actualizar el pago")
     return {"message": "Pago actualizado correctamente"}
@@ -0,0 +1,96 @@
+# routes/pagos_async.py
+# Versiones async (AsyncSession) de las rutas calientes de /pagos.
+# Solo se importan con DB_ASYNC=1: requieren sqlalchemy[asyncio] y un driver async.
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List
+
+from config.db import get_async_db
+from config.paginacion import ParametrosPagina, parametros_pagina, aplicar_keyset, armar_pagina
+from auth.seguridad import obtener_usuario_desde_token
+from models.pago import Pago
+from schemas.pago import PagoBase, PagoOut
+from schemas.paginacion import Pagina
+from services.outbox import registrar_evento
+from services.pagos import consulta_pagos_out, sentencia_aplicar_pago
+from services.presupuesto_consultas import presupuesto_consultas
+from services.recaudacion import Movimiento, sentencia_acumular
+from services.saldos import sentencias_refrescar
+
+pagos_async = APIRouter(prefix="/pagos", tags=["Pagos"])
+
+
+@pagos_async.post("/nuevo", response_model=dict)
+async def nuevo_pago_async(
+    data: PagoBase,
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(obtener_usuario_desde_token)
+):
+    try:
+        if payload["type"] not in ["Admin", "Alumno"]:
+            raise HTTPException(status_code=403, detail="No autorizado para registrar pagos")
+
+        alumno_id = data.alumno_id or int(payload["sub"])
+        monto_pagado = data.monto_pagado
+
+        cuota = (
+            await db.execute(sentencia_aplicar_pago(data.cuota_id, monto_pagado, alumno_id=alumno_id))
+        ).first()
+        if not cuota:
+            raise HTTPException(status_code=404, detail="Cuota no encontrada")
+
+        ahora = datetime.now()
+        nuevo = Pago(
+            alumno_id=alumno_id,
+            cuota_id=cuota.id,
+            monto_pagado=monto_pagado,
+            metodo=data.metodo,
+            comprobante=data.comprobante,
+            fecha_pago=ahora,
+            registrado_por=int(payload["sub"])
+        )
+        db.add(nuevo)
+        dialecto = db.get_bind().dialect.name
+        for sentencia in sentencias_refrescar([cuota.alumno_id], dialecto):
+            await db.execute(sentencia)
+        await db.execute(
+            sentencia_acumular([Movimiento(ahora, cuota.periodo, data.metodo, monto_pagado)], dialecto)
+        )
+        registrar_evento(
+            db, "pago_registrado",
+            alumno_id=alumno_id, cuota_id=cuota.id, monto=monto_pagado, periodo=cuota.periodo
+        )
+        await db.commit()
+
+        return {"message": "Pago registrado correctamente"}
+
+    except HTTPException:
+        await db.rollback()
+        raise
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Error de integridad al registrar pago")
+    except Exception as e:
+        await db.rollback()
+        print("Error en nuevo pago (async):", e)
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+
+@pagos_async.get("/mis", response_model=Pagina[PagoOut])
+@presupuesto_consultas(1)
+async def ver_mis_pagos_async(
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(obtener_usuario_desde_token),
+    pagina: ParametrosPagina = Depends(parametros_pagina)
+):
+    if payload["type"] != "Alumno":
+        raise HTTPException(status_code=403, detail="Solo los alumnos pueden ver sus pagos")
+
+    pagos_alumno = (
+        await db.execute(
+            aplicar_keyset(consulta_pagos_out(int(payload["sub"])), pagina, (Pago.fecha_pago, Pago.id))
+        )
+    ).all()
+    return armar_pagina(pagos_alumno, pagina, lambda p: (p.fecha_pago, p.id))
@@ -0,0 +1,30 @@
+# routes/reportes.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
+
+from config.db import get_db
+from auth.seguridad import solo_admin
+from schemas.reporte import RecaudacionOut
+from services.recaudacion import reporte_recaudacion
+
+reportes = APIRouter(prefix="/reportes", tags=["Reportes"])
+
+# 📊 ADMIN: Recaudación por período, método y día (tabla recaudacion_diaria, sin recorrer pagos)
+@reportes.get("/recaudacion", response_model=RecaudacionOut)
+def recaudacion(
+    desde: Optional[date] = Query(None, description="Fecha de pago desde (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha de pago hasta (inclusive)"),
+    periodo: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Período de la cuota, YYYY-MM"),
+    db: Session = Depends(get_db),
+    payload: dict = Depends(solo_admin)
+):
+    """
+    Totales cobrados en el rango por período de cuota (con la tasa de cobro contra
+    monto_a_pagar), por método y por día. Sin fechas abarca todos los pagos, y la
+    tasa de cobro de cada período es la real a la fecha.
+    """
+    if desde and hasta and desde > hasta:
+        raise HTTPException(status_code=400, detail="'desde' no puede ser posterior a 'hasta'")
+    return reporte_recaudacion(db, desde, hasta, periodo)
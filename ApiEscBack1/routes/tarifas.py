@@ -1,9 +1,13 @@
 # routes/tarifas.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from config.db import get_db
+from config.db import get_db, get_read_db
+from config.paginacion import ParametrosPagina, parametros_pagina, aplicar_keyset, armar_pagina
 from models.tarifa import Tarifa
+from services.presupuesto_consultas import presupuesto_consultas
+from services.tarifa_vigente import resolver_tarifa_vigente, invalidar_tarifa_vigente
 from schemas.tarifa import TarifaBase, TarifaCreate, TarifaOut
+from schemas.paginacion import Pagina
 from typing import List
 from datetime import date
 
@@ -20,24 +24,23 @@ def crear_tarifa(data: TarifaCreate, db: Session = Depends(get_db)):
     db.add(tarifa)
     db.commit()
     db.refresh(tarifa)
+    invalidar_tarifa_vigente()
     return tarifa
 
 
 @tarifas.get("/vigente", response_model=TarifaOut)
 def obtener_tarifa_vigente(db: Session = Depends(get_db)):
-    hoy = date.today()
-    tarifa = (
-        db.query(Tarifa)
-        .filter(Tarifa.vigente_desde <= hoy)
-        .filter((Tarifa.vigente_hasta == None) | (Tarifa.vigente_hasta >= hoy))
-        .order_by(Tarifa.vigente_desde.desc())
-        .first()
-    )
+    tarifa = resolver_tarifa_vigente(db)
     if not tarifa:
         raise HTTPException(status_code=404, detail="No hay tarifa vigente registrada")
     return tarifa
 
 
-@tarifas.get("/", response_model=List[TarifaOut])
-def listar_tarifas(db: Session = Depends(get_db)):
-    return db.query(Tarifa).order_by(Tarifa.vigente_desde.desc()).all()
+@tarifas.get("/", response_model=Pagina[TarifaOut])
+@presupuesto_consultas(1)
+def listar_tarifas(
+    db: Session = Depends(get_read_db),
+    pagina: ParametrosPagina = Depends(parametros_pagina)
+):
+    filas = aplicar_keyset(db.query(Tarifa), pagina, (Tarifa.vigente_desde, Tarifa.id)).all()
+    return armar_pagina(filas, pagina, lambda t: (t.vigente_desde, t.id))
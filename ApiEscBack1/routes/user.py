@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import joinedload, Session
-from config.db import get_db
+from sqlalchemy import select
+from sqlalchemy.orm import Bundle, joinedload, Session
+from config.db import get_db, get_read_db
+from config.paginacion import ParametrosPagina, parametros_pagina, aplicar_keyset, armar_pagina
 from auth.seguridad import obtener_usuario_desde_token, Seguridad, solo_admin
+from auth.contrasenas import verificar_en_pool, hashear_en_pool
 from models.user import User
 from models.userDetail import UserDetail
 from models.pago import Pago
@@ -10,10 +13,15 @@ from schemas.user import (
     InputLogin,
     InputUser,
     UserOut,
+    AlumnoOut,
     PaginatedUsersOut,
-    PaginatedFilteredBody
+    PaginatedFilteredBody,
+    BusquedaUsuariosOut
 )
-from typing import List
+from schemas.paginacion import Pagina
+from services.busqueda_usuarios import buscar_usuarios, filtro_busqueda
+from services.presupuesto_consultas import presupuesto_consultas
+from typing import List, Literal, Optional
 
 user = APIRouter(prefix="/user", tags=["User"])
 
@@ -65,13 +73,7 @@ def get_users_paginated_filtered_sync(
         )
 
         if search:
-            like = f"%{search}%"
-            q = q.filter(
-                (User.username.ilike(like)) |
-                (UserDetail.email.ilike(like)) |
-                (UserDetail.firstName.ilike(like)) |
-                (UserDetail.lastName.ilike(like))
-            )
+            q = q.filter(filtro_busqueda(search))
 
         if last_seen_id > 0:
             q = q.filter(User.id > last_seen_id)
@@ -91,6 +93,26 @@ def get_users_paginated_filtered_sync(
         raise HTTPException(status_code=500, detail="Error al obtener usuarios")
 
 
+# 🔎 Búsqueda de usuarios por relevancia (solo Admin)
+@user.get("/buscar", response_model=BusquedaUsuariosOut)
+def buscar_usuarios_admin(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    tipo: Optional[Literal["Alumno", "Admin"]] = None,
+    payload: dict = Depends(solo_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Busca por subcadena en username, email, nombre y apellido,
+    sin distinguir mayúsculas ni acentos ("jose" encuentra "José").
+    """
+    try:
+        return {"users": buscar_usuarios(db, q.strip(), limite=limit, tipo=tipo)}
+    except Exception as e:
+        print("Error en búsqueda de usuarios:", e)
+        raise HTTPException(status_code=500, detail="Error al buscar usuarios")
+
+
 #  Crear usuario con detalles completos (solo Admin)
 @user.post("/register/full")
 def crear_usuario_completo(
@@ -115,7 +137,7 @@ def crear_usuario_completo(
             raise HTTPException(status_code=400, detail="El email ya existe")
 
         # Crear usuario base
-        new_user = User(username=user.username, password=user.password)
+        new_user = User(username=user.username, password=hashear_en_pool(user.password))
         db.add(new_user)
         db.flush()  # 🔹 genera el ID del usuario
 
@@ -149,9 +171,17 @@ def login_post(userIn: InputLogin, db: Session = Depends(get_db)):
     sincronizando la respuesta con el formato esperado por el Frontend.
     """
     try:
-        user = db.query(User).filter(User.username == userIn.username).first()
-        
-        if not user or user.password != userIn.password:
+        # Usuario + detalle en una sola consulta
+        user = (
+            db.query(User)
+            .options(joinedload(User.userdetail))
+            .filter(User.username == userIn.username)
+            .first()
+        )
+
+        # Sin usuario se verifica igual (contra un hash de relleno): mismo tiempo que una clave errónea
+        coincide, hash_nuevo = verificar_en_pool(user.password if user else None, userIn.password)
+        if not coincide:
             # CORRECCIÓN 1: Usar "status": "error"
             return JSONResponse(
                 status_code=401, 
@@ -161,7 +191,15 @@ def login_post(userIn: InputLogin, db: Session = Depends(get_db)):
                 }
             )
 
+        # Token y tipo se arman antes del commit, que expira `user` y obligaría a releerlo
         token = Seguridad.generar_token(user)
+        tipo = user.userdetail.type if user.userdetail else None
+
+        # Contraseña heredada en texto plano o hash con parámetros viejos: se actualiza
+        if hash_nuevo:
+            user.password = hash_nuevo
+            db.commit()
+
         if not token:
             # CORRECCIÓN 2: Usar "status": "error"
             return JSONResponse(
@@ -177,9 +215,16 @@ def login_post(userIn: InputLogin, db: Session = Depends(get_db)):
             "status": "success",
             "token": token,
             # Se usa 'user' como clave, y se envía el tipo de usuario.
-            "user": {"type": user.userdetail.type if user.userdetail else None} 
+            "user": {"type": tipo}
         })
 
+    except HTTPException as e:
+        # Pool de hash saturado (503)
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"status": "error", "message": e.detail},
+            headers=e.headers,
+        )
     except Exception as e:
         print("Error en login:", e)
         # CORRECCIÓN 4: Usar "status": "error"
@@ -191,35 +236,41 @@ def login_post(userIn: InputLogin, db: Session = Depends(get_db)):
             }
         )
 
+# 🚪 Logout: el token queda revocado hasta su vencimiento
+@user.post("/logout")
+def logout(authorization: str = Header(...), payload: dict = Depends(obtener_usuario_desde_token)):
+    Seguridad.revocar_token(authorization.split(" ")[1])
+    return {"message": "Sesión cerrada"}
+
 # 👨‍🎓 Obtener todos los alumnos (solo Admin)
-@user.get("/alumnos")
+@user.get("/alumnos", response_model=Pagina[AlumnoOut])
+@presupuesto_consultas(1)
 def obtener_alumnos(
     payload: dict = Depends(solo_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    pagina: ParametrosPagina = Depends(parametros_pagina)
 ):
     """
-    Devuelve una lista de todos los alumnos registrados.
+    Devuelve los alumnos registrados, paginados por cursor (orden por id).
     """
     try:
-        alumnos = (
-            db.query(User)
-            .join(UserDetail)
-            .filter(UserDetail.type == "Alumno")
-            .all()
+        # Sólo las columnas del listado; el Bundle arma el "userdetail" anidado de cada fila
+        detalle = Bundle(
+            "userdetail", UserDetail.firstName, UserDetail.lastName, UserDetail.email, UserDetail.dni
         )
-        return [
-            {
-                "id": a.id,
-                "username": a.username,
-                "userdetail": {
-                    "firstName": a.userdetail.firstName,
-                    "lastName": a.userdetail.lastName,
-                    "email": a.userdetail.email,
-                    "dni": a.userdetail.dni
-                }
-            }
-            for a in alumnos
-        ]
+        alumnos = db.execute(
+            aplicar_keyset(
+                select(User.id, User.username, detalle)
+                .join(UserDetail, UserDetail.user_id == User.id)
+                .where(UserDetail.type == "Alumno"),
+                pagina,
+                (User.id,),
+                descendente=False,
+            )
+        ).all()
+        return armar_pagina(alumnos, pagina, lambda a: (a.id,))
+    except HTTPException:
+        raise
     except Exception as e:
         print("Error al obtener alumnos:", e)
         raise HTTPException(status_code=500, detail="Error al obtener alumnos")
@@ -0,0 +1,106 @@
+# routes/user_async.py
+# Versiones async (AsyncSession) de las rutas calientes de /user.
+# Solo se importan con DB_ASYNC=1: requieren sqlalchemy[asyncio] y un driver async.
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.db import get_async_db
+from auth.seguridad import obtener_usuario_desde_token, Seguridad
+from auth.contrasenas import verificar_async
+from models.user import User
+from schemas.user import InputLogin, UserOut
+
+user_async = APIRouter(prefix="/user", tags=["User"])
+
+
+@user_async.get("/profile", response_model=UserOut)
+async def get_own_profile_async(
+    payload: dict = Depends(obtener_usuario_desde_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Igual que /user/profile, pero sin ocupar un hilo del threadpool mientras espera a Postgres.
+    """
+    try:
+        user_id = int(payload.get("sub"))
+        db_user = (
+            await db.execute(
+                select(User)
+                .options(joinedload(User.userdetail))
+                .filter(User.id == user_id)
+            )
+        ).scalar_one_or_none()
+        if not db_user:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
+        return db_user
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("Error:", e)
+        raise HTTPException(status_code=500, detail="Error al obtener perfil")
+
+
+@user_async.post("/loginUser")
+async def login_post_async(userIn: InputLogin, db: AsyncSession = Depends(get_async_db)):
+    """
+    Igual que /user/loginUser; el detalle se carga en la misma consulta
+    porque la carga perezosa no está disponible con AsyncSession.
+    """
+    try:
+        user = (
+            await db.execute(
+                select(User)
+                .options(joinedload(User.userdetail))
+                .filter(User.username == userIn.username)
+            )
+        ).scalar_one_or_none()
+
+        coincide, hash_nuevo = await verificar_async(user.password if user else None, userIn.password)
+        if not coincide:
+            return JSONResponse(
+                status_code=401,
+                content={
+                    "status": "error",
+                    "message": "Usuario o contraseña incorrectos"
+                }
+            )
+
+        token = Seguridad.generar_token(user)
+        tipo = user.userdetail.type if user.userdetail else None
+
+        if hash_nuevo:
+            user.password = hash_nuevo
+            await db.commit()
+
+        if not token:
+            return JSONResponse(
+                status_code=401,
+                content={
+                    "status": "error",
+                    "message": "Error al generar el token"
+                }
+            )
+
+        return JSONResponse(status_code=200, content={
+            "status": "success",
+            "token": token,
+            "user": {"type": tipo}
+        })
+
+    except HTTPException as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"status": "error", "message": e.detail},
+            headers=e.headers,
+        )
+    except Exception as e:
+        print("Error en login (async):", e)
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": "Error interno del servidor"
+            }
+        )
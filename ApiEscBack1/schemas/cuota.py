@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from datetime import date
+from pydantic import BaseModel, Field
+from datetime import date, datetime
 from typing import Optional
 
 class CuotaBase(BaseModel):
@@ -15,6 +15,32 @@ class CuotaBase(BaseModel):
 
 class CuotaOut(CuotaBase):
     id: int
+    arrastre_de: Optional[int] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CuotaPeriodoIn(BaseModel):
+    """Generación masiva: un período y su fecha de vencimiento para todos los alumnos"""
+    periodo: str = Field(pattern=r"^\d{4}-(0[1-9]|1[0-2])$")  # 'YYYY-MM'
+    fecha_vencimiento: date
+
+
+class GeneracionPeriodoOut(BaseModel):
+    periodo: str
+    tarifa_id: int
+    monto_base: float
+    creadas: int
+    omitidas: int
+
+
+class SaldoAlumnoOut(BaseModel):
+    """Fila de saldo_alumno (resumen de deuda por alumno)"""
+    alumno_id: int
+    nombre: Optional[str] = None
+    total_a_pagar: float
+    total_pagado: float
+    saldo: float
+    periodo_abierto_mas_antiguo: Optional[str] = None
+    cuotas_vencidas: int
+    actualizado: Optional[datetime] = None
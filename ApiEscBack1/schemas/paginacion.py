@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Pagina(BaseModel, Generic[T]):
+    """Sobre común de las respuestas paginadas por cursor (keyset)"""
+    items: List[T]
+    next_cursor: Optional[str] = None  # None = no hay más páginas
+    limit: int
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional, List
 
 # 📥 Entrada de pago normal
@@ -7,7 +8,7 @@ from typing import Optional, List
 class PagoBase(BaseModel):
     alumno_id: int
     cuota_id: Optional[int]
-    monto_pagado: float
+    monto_pagado: Decimal = Field(gt=0, max_digits=10, decimal_places=2)
     metodo: str
     comprobante: Optional[str] = None
 
@@ -30,6 +31,28 @@ class PagoOut(BaseModel):
 
 
 
+# 📦 Importación masiva (POST /pagos/lote)
+
+class PagoLoteFilaOut(BaseModel):
+    fila: int
+    estado: str  # ok, error, duplicado
+    cuota_id: Optional[int] = None
+    monto_pagado: Optional[Decimal] = None
+    comprobante: Optional[str] = None
+    pago_id: Optional[int] = None
+    errores: List[str] = []
+
+
+class PagoLoteOut(BaseModel):
+    dry_run: bool
+    total: int
+    aceptadas: int
+    rechazadas: int
+    duplicadas: int
+    cuotas_actualizadas: int
+    filas: List[PagoLoteFilaOut]
+
+
 # 📚 MODELO PAGOS ELIMINADOS (Historial)
 
 # 📥 Entrada (motivo opcional)
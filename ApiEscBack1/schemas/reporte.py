@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+
+# 📊 Recaudación (GET /reportes/recaudacion)
+
+class RecaudacionPeriodoOut(BaseModel):
+    periodo: str
+    cantidad: int
+    total: Decimal
+    a_pagar: Decimal                    # suma de monto_a_pagar de las cuotas del período
+    tasa_cobro: Optional[float] = None  # total / a_pagar
+
+
+class RecaudacionMetodoOut(BaseModel):
+    metodo: str
+    cantidad: int
+    total: Decimal
+
+
+class RecaudacionDiaOut(BaseModel):
+    dia: date
+    cantidad: int
+    total: Decimal
+
+
+class RecaudacionOut(BaseModel):
+    desde: Optional[date] = None
+    hasta: Optional[date] = None
+    periodo: Optional[str] = None
+    cantidad: int
+    total: Decimal
+    por_periodo: List[RecaudacionPeriodoOut]
+    por_metodo: List[RecaudacionMetodoOut]
+    por_dia: List[RecaudacionDiaOut]
+    generado: datetime                  # hora en que se calculó (puede venir de la caché)
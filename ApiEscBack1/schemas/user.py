@@ -19,6 +19,25 @@ class UserOut(BaseModel):
     class Config:
         from_attributes = True
         
+class AlumnoDetalleOut(BaseModel):
+    firstName: str
+    lastName: str
+    email: str
+    dni: int
+
+    class Config:
+        from_attributes = True
+
+
+class AlumnoOut(BaseModel):
+    """Alumno del listado /user/alumnos (se valida directo desde filas de columnas)"""
+    id: int
+    username: str
+    userdetail: AlumnoDetalleOut
+
+    class Config:
+        from_attributes = True
+
 class PaginatedFilteredBody(BaseModel):
     """Cuerpo que recibe el endpoint de usuarios paginados"""
     limit: Optional[int] = 20
@@ -26,6 +45,11 @@ class PaginatedFilteredBody(BaseModel):
     search: Optional[str] = None
 
 
+class BusquedaUsuariosOut(BaseModel):
+    """Resultados de la búsqueda de usuarios, ordenados por relevancia"""
+    users: List[UserOut]
+
+
 class PaginatedUsersOut(BaseModel):
     """Respuesta del endpoint paginado de usuarios"""
     users: List[UserOut]
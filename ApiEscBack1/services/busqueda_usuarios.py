@@ -0,0 +1,97 @@
+# services/busqueda_usuarios.py
+# Búsqueda por subcadena de usuarios (username, email, nombre y apellido),
+# insensible a mayúsculas y acentos.
+#
+# En Postgres se apoya en índices GIN pg_trgm sobre f_unaccent(lower(...)), que
+# sirven para LIKE '%termino%' (migrations/v0003_busqueda_usuarios.py), y ordena
+# por similitud. En SQLite f_unaccent se registra como función Python (ver
+# config/db.py) y el orden es por prefijo.
+import unicodedata
+from typing import List, Optional
+
+from sqlalchemy import select, func, union, literal_column, case, String
+from sqlalchemy.orm import Session, joinedload
+
+from models.user import User
+from models.userDetail import UserDetail
+
+LIMITE_MAXIMO = 50
+
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin acentos, igual que f_unaccent(lower(...)) en la base."""
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def _normalizado(expresion):
+    return func.f_unaccent(func.lower(expresion))
+
+
+def _escapar_like(termino: str) -> str:
+    return termino.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _patron_like(termino: str) -> str:
+    return f"%{_escapar_like(termino)}%"
+
+
+def _nombre_completo():
+    # El separador va como constante (no como parámetro) para coincidir con la expresión del índice
+    return UserDetail.firstName + literal_column("' '", String) + UserDetail.lastName
+
+
+def ids_coincidentes(termino: str):
+    """
+    Subconsulta con los ids de usuario que contienen `termino`.
+    Cada rama filtra una sola tabla para que Postgres use su índice trigram
+    (un OR sobre el outer join obligaba a recorrer todo).
+    """
+    patron = _patron_like(normalizar(termino))
+    por_username = select(User.id).where(_normalizado(User.username).like(patron, escape="\\"))
+    por_detalle = select(UserDetail.user_id).where(
+        _normalizado(_nombre_completo()).like(patron, escape="\\")
+        | _normalizado(UserDetail.email).like(patron, escape="\\")
+    )
+    return union(por_username, por_detalle).subquery()
+
+
+def filtro_busqueda(termino: str):
+    """Condición reutilizable: User.id IN (ids que coinciden con `termino`)."""
+    coincidencias = ids_coincidentes(termino)
+    return User.id.in_(select(coincidencias.c[0]))
+
+
+def _relevancia(db: Session, termino: str):
+    normalizado = normalizar(termino)
+    if db.get_bind().dialect.name == "postgresql":
+        return func.greatest(
+            func.similarity(_normalizado(User.username), normalizado),
+            func.coalesce(func.similarity(_normalizado(_nombre_completo()), normalizado), 0),
+            func.coalesce(func.similarity(_normalizado(UserDetail.email), normalizado), 0),
+        ).desc()
+    # Fallback portable: primero los que empiezan con el término
+    prefijo = f"{_escapar_like(normalizado)}%"
+    return case(
+        (
+            _normalizado(User.username).like(prefijo, escape="\\")
+            | _normalizado(UserDetail.firstName).like(prefijo, escape="\\")
+            | _normalizado(UserDetail.lastName).like(prefijo, escape="\\"),
+            0,
+        ),
+        else_=1,
+    ).asc()
+
+
+def buscar_usuarios(db: Session, termino: str, limite: int = 20, tipo: Optional[str] = None) -> List[User]:
+    """Usuarios que contienen `termino`, ordenados por relevancia."""
+    limite = max(1, min(limite, LIMITE_MAXIMO))
+    consulta = (
+        select(User)
+        .outerjoin(User.userdetail)
+        .options(joinedload(User.userdetail))
+        .where(filtro_busqueda(termino))
+    )
+    if tipo:
+        consulta = consulta.where(UserDetail.type == tipo)
+    consulta = consulta.order_by(_relevancia(db, termino), User.id.asc()).limit(limite)
+    return list(db.execute(consulta).unique().scalars())
@@ -0,0 +1,49 @@
+# services/lectura_replica.py
+# Leer lo propio con réplica de lectura: después de un commit en el primario la
+# respuesta deja la cookie "ultima_escritura" (epoch), y mientras dure get_read_db
+# manda las lecturas de esa sesión al primario (config/db.py, usar_replica).
+# La cookie vence sola al terminar la ventana, así que en régimen no viaja nada.
+from http.cookies import SimpleCookie
+
+from config.db import sesion_escrituras, ventana_escrituras_propias
+
+COOKIE = "ultima_escritura"
+
+
+def _escritura_previa(scope):
+    for nombre, valor in scope.get("headers", ()):
+        if nombre == b"cookie":
+            morsel = SimpleCookie(valor.decode("latin-1")).get(COOKIE)
+            if morsel is not None:
+                try:
+                    return float(morsel.value)
+                except ValueError:
+                    return None
+    return None
+
+
+class LecturaReplicaMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sesion = {"previa": _escritura_previa(scope), "actual": None}
+        marca = sesion_escrituras.set(sesion)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start" and sesion["actual"] is not None:
+                cookie = (
+                    f"{COOKIE}={sesion['actual']:.3f}; Max-Age={int(ventana_escrituras_propias()) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                mensaje = {**mensaje, "headers": [*mensaje.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            sesion_escrituras.reset(marca)
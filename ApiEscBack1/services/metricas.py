@@ -0,0 +1,322 @@
+# services/metricas.py
+# Métricas estilo Prometheus por worker, sin dependencias externas.
+# Cada hilo escribe en su propio fragmento (dicts que sólo él modifica), así que
+# registrar una observación no toma locks: el middleware lo hace desde el hilo del
+# event loop y los hooks de SQLAlchemy de fondo desde el hilo que ejecuta la consulta.
+# Al exponer /metrics se suman los fragmentos del proceso y, con METRICAS_DIR, los
+# volcados JSON que cada worker de gunicorn deja en ese directorio.
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import glob
+import json
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.db import estado_pools
+from config.settings import settings
+
+Etiquetas = Tuple[Tuple[str, str], ...]
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# nombre -> (tipo, ayuda, buckets)
+METRICAS = {
+    "http_requests_total": ("counter", "Requests atendidos por método, ruta y código de estado", None),
+    "http_request_duration_seconds": ("histogram", "Duración de cada request hasta enviar el último byte", BUCKETS_SEGUNDOS),
+    "http_requests_in_flight": ("gauge", "Requests en curso", None),
+    "http_request_db_queries": ("histogram", "Consultas SQL ejecutadas por request", BUCKETS_CONSULTAS),
+    "http_request_db_seconds": ("histogram", "Tiempo en la base de datos por request", BUCKETS_SEGUNDOS),
+    "db_queries_total": ("counter", "Consultas SQL ejecutadas (contexto: request o fondo)", None),
+    "db_query_seconds_total": ("counter", "Tiempo acumulado en la base de datos", None),
+    "db_pool_checkouts_total": ("counter", "Conexiones obtenidas del pool", None),
+    "db_pool_timeouts_total": ("counter", "Esperas por una conexión que terminaron en timeout", None),
+    "db_pool_wait_seconds_total": ("counter", "Tiempo acumulado esperando una conexión libre", None),
+    "db_pool_connections": ("gauge", "Conexiones del pool por estado", None),
+}
+
+LE_INF = 'le="+Inf"'
+SIN_RUTA = "sin_ruta"  # 404 y preflight: no se usa el path crudo para no explotar la cardinalidad
+
+
+# 🧩 Fragmentos por hilo: sólo su dueño escribe, la lectura copia los dicts
+class _Fragmento:
+    __slots__ = ("contadores", "histogramas")
+
+    def __init__(self):
+        self.contadores: Dict[Tuple[str, Etiquetas], float] = {}
+        # (nombre, etiquetas) -> [cuenta por bucket..., cuenta +Inf, suma]
+        self.histogramas: Dict[Tuple[str, Etiquetas], List[float]] = {}
+
+
+_fragmentos: List[_Fragmento] = []
+_local = threading.local()
+
+
+def _fragmento() -> _Fragmento:
+    fragmento = getattr(_local, "fragmento", None)
+    if fragmento is None:
+        fragmento = _local.fragmento = _Fragmento()
+        _fragmentos.append(fragmento)  # list.append es atómico bajo el GIL
+    return fragmento
+
+
+def incrementar(nombre: str, etiquetas: Etiquetas = (), valor: float = 1) -> None:
+    contadores = _fragmento().contadores
+    clave = (nombre, etiquetas)
+    contadores[clave] = contadores.get(clave, 0) + valor
+
+
+def observar(nombre: str, etiquetas: Etiquetas, valor: float) -> None:
+    histogramas = _fragmento().histogramas
+    clave = (nombre, etiquetas)
+    buckets = METRICAS[nombre][2]
+    celdas = histogramas.get(clave)
+    if celdas is None:
+        celdas = histogramas[clave] = [0] * (len(buckets) + 2)
+    celdas[bisect_left(buckets, valor)] += 1
+    celdas[-1] += valor
+
+
+# 🗄️ Consultas y tiempo en la base por request
+# El middleware deja un acumulador [consultas, segundos] en el contexto; el threadpool
+# de Starlette y los greenlets de SQLAlchemy async heredan ese contexto.
+_db_request: ContextVar[Optional[List[float]]] = ContextVar("metricas_db_request", default=None)
+
+_FONDO = (("contexto", "fondo"),)
+_REQUEST = (("contexto", "request"),)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_consulta(conn, cursor, sentencia, parametros, contexto, executemany):
+    if contexto is not None:
+        contexto._metricas_inicio = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues_de_consulta(conn, cursor, sentencia, parametros, contexto, executemany):
+    inicio = getattr(contexto, "_metricas_inicio", None)
+    duracion = time.perf_counter() - inicio if inicio is not None else 0.0
+    acumulado = _db_request.get()
+    if acumulado is not None:
+        acumulado[0] += 1
+        acumulado[1] += duracion
+    else:
+        # Outbox, planificador, scripts: se cuentan en el fragmento del hilo que consulta
+        incrementar("db_queries_total", _FONDO)
+        incrementar("db_query_seconds_total", _FONDO, duracion)
+
+
+# ⏱️ Middleware ASGI puro (sin BaseHTTPMiddleware: no envuelve la respuesta en otra tarea)
+class MetricasMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = 500  # si la app revienta antes de responder
+        async def enviar(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        fragmento = _fragmento()
+        en_curso = ("http_requests_in_flight", ())
+        fragmento.contadores[en_curso] = fragmento.contadores.get(en_curso, 0) + 1
+        acumulado = [0, 0.0]
+        marca = _db_request.set(acumulado)
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracion = time.perf_counter() - inicio
+            _db_request.reset(marca)
+            fragmento.contadores[en_curso] -= 1
+
+            # La plantilla (/pagos/{pago_id}) la deja el router de Starlette en el scope
+            ruta = getattr(scope.get("route"), "path", None) or SIN_RUTA
+            etiquetas = (("method", scope["method"]), ("route", ruta))
+            incrementar("http_requests_total", etiquetas + (("status", str(estado)),))
+            observar("http_request_duration_seconds", etiquetas, duracion)
+            observar("http_request_db_queries", etiquetas, acumulado[0])
+            observar("http_request_db_seconds", etiquetas, acumulado[1])
+            if acumulado[0]:
+                incrementar("db_queries_total", _REQUEST, acumulado[0])
+                incrementar("db_query_seconds_total", _REQUEST, acumulado[1])
+
+
+# 📸 Instantánea del proceso (lo que se vuelca a disco y se combina entre workers)
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _clave_texto(nombre: str, etiquetas: Etiquetas) -> str:
+    if not etiquetas:
+        return nombre
+    pares = ",".join(f'{k}="{_escapar(str(v))}"' for k, v in etiquetas)
+    return f"{nombre}{{{pares}}}"
+
+
+def _metricas_pool() -> Dict[str, float]:
+    valores = {}
+    for nombre, resumen in estado_pools().items():
+        pool = (("pool", nombre),)
+        valores[_clave_texto("db_pool_checkouts_total", pool)] = resumen["checkouts"]
+        valores[_clave_texto("db_pool_timeouts_total", pool)] = resumen["timeouts"]
+        valores[_clave_texto("db_pool_wait_seconds_total", pool)] = resumen["espera_total_ms"] / 1000
+        for estado_conexion in ("en_uso", "libres", "overflow"):
+            if estado_conexion in resumen:
+                etiquetas = pool + (("estado", estado_conexion),)
+                valores[_clave_texto("db_pool_connections", etiquetas)] = resumen[estado_conexion]
+    return valores
+
+
+def instantanea(con_gauges: bool = True) -> dict:
+    """Suma de los fragmentos de todos los hilos de este proceso."""
+    escalares: Dict[str, float] = {}
+    histogramas: Dict[str, List[float]] = {}
+    for fragmento in list(_fragmentos):
+        # list(dict.items()) copia sin soltar el GIL: el dueño puede seguir escribiendo
+        for (nombre, etiquetas), valor in list(fragmento.contadores.items()):
+            clave = _clave_texto(nombre, etiquetas)
+            escalares[clave] = escalares.get(clave, 0) + valor
+        for (nombre, etiquetas), celdas in list(fragmento.histogramas.items()):
+            clave = _clave_texto(nombre, etiquetas)
+            acumuladas = histogramas.get(clave)
+            if acumuladas is None:
+                histogramas[clave] = list(celdas)
+            else:
+                for i, valor in enumerate(celdas):
+                    acumuladas[i] += valor
+    escalares.update(_metricas_pool())
+    if not con_gauges:
+        # Un worker que termina no debe dejar sus gauges sumando para siempre
+        escalares = {k: v for k, v in escalares.items() if _tipo(k) != "gauge"}
+    return {"escalares": escalares, "histogramas": histogramas}
+
+
+def _nombre(clave: str) -> str:
+    return clave.split("{", 1)[0]
+
+
+def _tipo(clave: str) -> str:
+    return METRICAS[_nombre(clave)][0]
+
+
+# 🗂️ Multiproceso (gunicorn): un archivo <pid>.json por worker en METRICAS_DIR
+# El directorio debe vaciarse al arrancar el master (p. ej. en on_starting de
+# gunicorn.conf.py con limpiar_directorio()); los archivos de workers ya terminados
+# se conservan para que los contadores no retrocedan.
+def _archivo_propio() -> str:
+    return os.path.join(settings.metricas_dir, f"{os.getpid()}.json")
+
+
+def volcar(final: bool = False) -> None:
+    archivo = _archivo_propio()
+    temporal = f"{archivo}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(instantanea(con_gauges=not final), f)
+    os.replace(temporal, archivo)  # quien combina nunca ve un archivo a medio escribir
+
+
+def limpiar_directorio() -> None:
+    for archivo in glob.glob(os.path.join(settings.metricas_dir, "*.json")):
+        os.remove(archivo)
+
+
+def combinar() -> dict:
+    escalares: Dict[str, float] = {}
+    histogramas: Dict[str, List[float]] = {}
+    for archivo in glob.glob(os.path.join(settings.metricas_dir, "*.json")):
+        try:
+            with open(archivo, encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Métricas: no se pudo leer {archivo}:", e)
+            continue
+        for clave, valor in datos["escalares"].items():
+            escalares[clave] = escalares.get(clave, 0) + valor
+        for clave, celdas in datos["histogramas"].items():
+            acumuladas = histogramas.get(clave)
+            if acumuladas is None:
+                histogramas[clave] = list(celdas)
+            else:
+                for i, valor in enumerate(celdas):
+                    acumuladas[i] += valor
+    return {"escalares": escalares, "histogramas": histogramas}
+
+
+async def volcar_en_segundo_plano(detener: asyncio.Event):
+    while not detener.is_set():
+        try:
+            await asyncio.to_thread(volcar)
+        except Exception as e:
+            print("Error al volcar métricas:", e)
+        try:
+            await asyncio.wait_for(detener.wait(), timeout=settings.metricas_intervalo)
+        except asyncio.TimeoutError:
+            pass
+    try:
+        await asyncio.to_thread(volcar, True)
+    except Exception as e:
+        print("Error al volcar métricas:", e)
+
+
+# 📝 Formato de texto de Prometheus (exposition format 0.0.4)
+def _numero(valor: float) -> str:
+    if isinstance(valor, float) and not valor.is_integer():
+        return repr(valor)
+    return str(int(valor))
+
+
+def _con_etiqueta(clave: str, sufijo: str, extra: str = "") -> str:
+    nombre, _, resto = clave.partition("{")
+    etiquetas = resto[:-1] if resto else ""
+    if extra:
+        etiquetas = f"{etiquetas},{extra}" if etiquetas else extra
+    return f"{nombre}{sufijo}{{{etiquetas}}}" if etiquetas else f"{nombre}{sufijo}"
+
+
+def exponer() -> str:
+    if settings.metricas_dir:
+        volcar()  # el worker que atiende el scrape aporta sus números al día
+        datos = combinar()
+    else:
+        datos = instantanea()
+
+    # nombre -> {serie: líneas}; las series se ordenan, los buckets quedan en su orden
+    por_nombre: Dict[str, Dict[str, List[str]]] = {}
+    for clave, valor in datos["escalares"].items():
+        por_nombre.setdefault(_nombre(clave), {})[clave] = [f"{clave} {_numero(valor)}"]
+    for clave, celdas in datos["histogramas"].items():
+        nombre = _nombre(clave)
+        lineas = por_nombre.setdefault(nombre, {})[clave] = []
+        acumulado = 0
+        for limite, cuenta in zip(METRICAS[nombre][2], celdas):
+            acumulado += cuenta
+            le = f'le="{limite}"'
+            lineas.append(f"{_con_etiqueta(clave, '_bucket', le)} {_numero(acumulado)}")
+        total = acumulado + celdas[-2]
+        lineas.append(f"{_con_etiqueta(clave, '_bucket', LE_INF)} {_numero(total)}")
+        lineas.append(f"{_con_etiqueta(clave, '_sum')} {_numero(celdas[-1])}")
+        lineas.append(f"{_con_etiqueta(clave, '_count')} {_numero(total)}")
+
+    salida = []
+    for nombre, (tipo, ayuda, _) in METRICAS.items():
+        if nombre not in por_nombre:
+            continue
+        salida.append(f"# HELP {nombre} {ayuda}")
+        salida.append(f"# TYPE {nombre} {tipo}")
+        for clave in sorted(por_nombre[nombre]):
+            salida.extend(por_nombre[nombre][clave])
+    return "\n".join(salida) + "\n"
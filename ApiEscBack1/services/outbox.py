@@ -0,0 +1,291 @@
+# services/outbox.py
+# Outbox transaccional de notificaciones.
+# Las rutas sólo guardan un evento compacto en la misma transacción que el pago
+# (registrar_evento, sin commit propio). El despachador toma los eventos pendientes
+# por lotes, los expande en filas de NotificacionPago con un INSERT masivo y
+# reprograma con backoff exponencial los que fallan.
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, NamedTuple, Optional
+import asyncio
+import sys
+
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.orm import Session
+
+from config.db import SessionLocal
+from config.settings import settings
+from models.eventoOutbox import EventoOutbox
+from models.notificacionPago import NotificacionPago
+from models.userDetail import UserDetail
+
+
+class _Reclamado(NamedTuple):
+    id: int
+    tipo: str
+    payload: dict
+    intentos: int    # incluye el intento en curso
+
+
+def registrar_evento(db, tipo: str, **datos) -> EventoOutbox:
+    """
+    Agrega el evento a la sesión (Session o AsyncSession) sin hacer commit:
+    se confirma o se descarta junto con la operación que lo origina.
+    """
+    if tipo not in MANEJADORES:
+        raise ValueError(f"Tipo de evento desconocido: {tipo}")
+    evento = EventoOutbox(tipo=tipo, payload=_serializable(datos))
+    db.add(evento)
+    return evento
+
+
+def registrar_eventos(db: Session, tipo: str, lista_datos: List[dict]) -> int:
+    """Versión masiva de registrar_evento: un solo INSERT para todos los eventos."""
+    if tipo not in MANEJADORES:
+        raise ValueError(f"Tipo de evento desconocido: {tipo}")
+    if lista_datos:
+        db.execute(insert(EventoOutbox), [
+            {"tipo": tipo, "payload": _serializable(datos)} for datos in lista_datos
+        ])
+    return len(lista_datos)
+
+
+def _serializable(datos: dict) -> dict:
+    # Decimal y fechas viajan como texto para no perder precisión en el JSON
+    return {
+        clave: str(valor) if isinstance(valor, Decimal) else
+        valor.isoformat() if isinstance(valor, (date, datetime)) else valor
+        for clave, valor in datos.items()
+    }
+
+
+# 🔔 Expansión de cada tipo de evento en notificaciones (mismos textos que antes)
+def _pago_registrado(datos: dict, nombres: Dict[int, str]) -> List[dict]:
+    monto = Decimal(datos["monto"])
+    return [
+        {
+            "alumno_id": datos["alumno_id"],
+            "cuota_id": datos["cuota_id"],
+            "tipo": "pago_registrado",
+            "destinatario": "alumno",
+            "mensaje": (
+                f"Se registró un pago de ${monto:,.2f} "
+                f"para tu cuota del período {datos['periodo']}."
+            ),
+        },
+        {
+            "alumno_id": datos["alumno_id"],
+            "cuota_id": datos["cuota_id"],
+            "tipo": "pago_registrado",
+            "destinatario": "admin",
+            "mensaje": (
+                f"El alumno ID {datos['alumno_id']} realizó un pago de ${monto:,.2f} "
+                f"para la cuota {datos['periodo']}."
+            ),
+        },
+    ]
+
+
+def _pago_eliminado(datos: dict, nombres: Dict[int, str]) -> List[dict]:
+    return [
+        {
+            "alumno_id": datos["alumno_id"],
+            "cuota_id": datos["cuota_id"],
+            "tipo": "pago_eliminado",
+            "destinatario": "admin",
+            "mensaje": (
+                f"Se eliminó el pago ID {datos['pago_id']} del alumno ID {datos['alumno_id']}. "
+                f"Monto: ${Decimal(datos['monto']):,.2f}. Motivo: {datos.get('motivo') or 'No especificado'}."
+            ),
+        },
+    ]
+
+
+# Desde services/recordatorios.py los recordatorios se generan directo en la base;
+# este manejador sólo despacha los eventos que quedaron encolados de antes.
+def _recordatorio_vencimiento(datos: dict, nombres: Dict[int, str]) -> List[dict]:
+    vencimiento = date.fromisoformat(datos["fecha_vencimiento"]).strftime("%d/%m/%Y")
+    nombre_alumno = nombres.get(datos["alumno_id"]) or f"ID {datos['alumno_id']}"
+    return [
+        {
+            "alumno_id": datos["alumno_id"],
+            "cuota_id": datos["cuota_id"],
+            "tipo": "recordatorio_vencimiento",
+            "destinatario": "alumno",
+            "ventana": datos.get("ventana", 7),
+            "mensaje": (
+                f"Recordatorio: Tu cuota del período {datos['periodo']} vence el "
+                f"{vencimiento}. Monto a pagar: ${Decimal(datos['monto_a_pagar']):,.2f}"
+            ),
+        },
+        {
+            "alumno_id": datos["alumno_id"],
+            "cuota_id": datos["cuota_id"],
+            "tipo": "recordatorio_vencimiento",
+            "destinatario": "admin",
+            "ventana": datos.get("ventana", 7),
+            "mensaje": f"El alumno {nombre_alumno} tiene una cuota próxima a vencer el {vencimiento}.",
+        },
+    ]
+
+
+MANEJADORES: Dict[str, Callable[[dict, Dict[int, str]], List[dict]]] = {
+    "pago_registrado": _pago_registrado,
+    "pago_eliminado": _pago_eliminado,
+    "recordatorio_vencimiento": _recordatorio_vencimiento,
+}
+
+# Tipos cuyo mensaje lleva el nombre del alumno (se resuelve una vez por lote)
+_CON_NOMBRE = {"recordatorio_vencimiento"}
+
+
+def _nombres(db: Session, eventos) -> Dict[int, str]:
+    ids = {e.payload["alumno_id"] for e in eventos if e.tipo in _CON_NOMBRE}
+    if not ids:
+        return {}
+    filas = db.execute(
+        select(UserDetail.user_id, UserDetail.firstName, UserDetail.lastName)
+        .where(UserDetail.user_id.in_(ids))
+    ).all()
+    return {f.user_id: f"{f.firstName} {f.lastName}" for f in filas}
+
+
+def _entregar(db: Session, eventos) -> int:
+    """Inserta las notificaciones de los eventos con un único INSERT masivo."""
+    nombres = _nombres(db, eventos)
+    filas = [
+        fila
+        for evento in eventos
+        for fila in MANEJADORES[evento.tipo](evento.payload, nombres)
+    ]
+    if filas:
+        db.execute(insert(NotificacionPago), filas)
+    return len(filas)
+
+
+def _espera_reintento(intentos: int) -> timedelta:
+    return timedelta(seconds=min(settings.outbox_backoff_max, 2 ** intentos))
+
+
+def _reprogramar(db: Session, evento, error: Exception, ahora: datetime):
+    agotado = evento.intentos >= settings.outbox_max_intentos
+    db.execute(
+        update(EventoOutbox)
+        .where(EventoOutbox.id == evento.id)
+        .values(
+            estado="fallido" if agotado else "pendiente",
+            disponible_desde=ahora + _espera_reintento(evento.intentos),
+            ultimo_error=f"{type(error).__name__}: {error}"[:255],
+        )
+    )
+    print(f"⚠️ Evento outbox {evento.id} ({evento.tipo}) falló en el intento {evento.intentos}: {error}")
+
+
+def procesar_lote(limite: Optional[int] = None) -> int:
+    """
+    Despacha hasta `limite` eventos pendientes en una sola transacción y devuelve
+    cuántos tomó. En Postgres los eventos se reclaman con FOR UPDATE SKIP LOCKED,
+    así varios workers despachan en paralelo sin pisarse.
+    """
+    limite = limite or settings.outbox_lote
+    ahora = datetime.now()
+
+    with SessionLocal() as db:
+        consulta = (
+            select(EventoOutbox.id, EventoOutbox.tipo, EventoOutbox.payload, EventoOutbox.intentos)
+            .where(EventoOutbox.estado == "pendiente", EventoOutbox.disponible_desde <= ahora)
+            .order_by(EventoOutbox.id)
+            .limit(limite)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            consulta = consulta.with_for_update(skip_locked=True)
+        reclamados = db.execute(consulta).all()
+        if not reclamados:
+            return 0
+
+        ids = [e.id for e in reclamados]
+        tomados = db.execute(
+            update(EventoOutbox)
+            .where(EventoOutbox.id.in_(ids), EventoOutbox.estado == "pendiente")
+            .values(intentos=EventoOutbox.intentos + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if tomados != len(ids):
+            # Otro proceso los despachó entre la lectura y el UPDATE (sin SKIP LOCKED)
+            db.rollback()
+            return 0
+        eventos = [_Reclamado(e.id, e.tipo, e.payload, e.intentos + 1) for e in reclamados]
+
+        entregados = []
+        try:
+            with db.begin_nested():
+                _entregar(db, eventos)
+            entregados = ids
+        except Exception:
+            # Algún evento del lote falla: se aísla reintentando uno por uno
+            for evento in eventos:
+                try:
+                    with db.begin_nested():
+                        _entregar(db, [evento])
+                    entregados.append(evento.id)
+                except Exception as e:
+                    _reprogramar(db, evento, e, ahora)
+
+        if entregados:
+            db.execute(
+                update(EventoOutbox)
+                .where(EventoOutbox.id.in_(entregados))
+                .values(estado="procesado", procesado=datetime.now(), ultimo_error=None)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        return len(eventos)
+
+
+def procesar_pendientes() -> int:
+    """Despacha lotes hasta vaciar los eventos disponibles."""
+    total = 0
+    while True:
+        procesados = procesar_lote()
+        total += procesados
+        if procesados < settings.outbox_lote:
+            return total
+
+
+def resumen_outbox(db: Session) -> dict:
+    """Cantidad de eventos por estado y antigüedad del pendiente más viejo."""
+    por_estado = dict(
+        db.execute(
+            select(EventoOutbox.estado, func.count()).group_by(EventoOutbox.estado)
+        ).all()
+    )
+    mas_viejo = db.execute(
+        select(func.min(EventoOutbox.creado)).where(EventoOutbox.estado == "pendiente")
+    ).scalar()
+    return {
+        "por_estado": por_estado,
+        "pendiente_mas_viejo": mas_viejo,
+    }
+
+
+# 🔁 Despachador en segundo plano (se inicia desde el lifespan de app.py)
+async def despachar_en_segundo_plano(detener: asyncio.Event):
+    while not detener.is_set():
+        try:
+            procesados = await asyncio.to_thread(procesar_lote)
+        except Exception as e:
+            print("Error en el despachador de outbox:", e)
+            procesados = 0
+        if procesados < settings.outbox_lote:
+            # Lote incompleto: no queda trabajo inmediato, se espera al próximo ciclo
+            try:
+                await asyncio.wait_for(detener.wait(), timeout=settings.outbox_intervalo)
+            except asyncio.TimeoutError:
+                pass
+
+
+if __name__ == "__main__":
+    # python -m services.outbox   despacha todo lo pendiente (p. ej. con OUTBOX_ENABLED=0)
+    import config.init_db  # noqa: F401  registra todos los modelos
+    print(f"✅ {procesar_pendientes()} eventos despachados.")
+    sys.exit(0)
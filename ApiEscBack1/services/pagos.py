@@ -0,0 +1,108 @@
+# services/pagos.py
+# Actualización atómica del saldo de una cuota.
+# Monto pagado, saldo y estado se calculan en la base con un único
+# UPDATE … RETURNING: no hay lectura previa en Python, y la fila queda bloqueada
+# hasta el commit, así dos pagos simultáneos sobre la misma cuota no se pisan.
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import Numeric, Select, case, func, literal, select, update
+from sqlalchemy.orm import Session
+
+from models.cuota import Cuota
+from models.pago import Pago
+
+
+def estado_segun_saldo(pagado, saldo, hoy: Optional[date] = None):
+    """
+    Expresión SQL del estado de una cuota a partir de lo pagado y el saldo.
+    Con saldo y el vencimiento ya pasado queda 'vencida', igual que en el barrido
+    de services/vencimientos.py (eliminar un pago no la vuelve a 'pendiente').
+    """
+    return case(
+        (saldo <= 0, "pagada"),
+        (Cuota.fecha_vencimiento < (hoy or date.today()), "vencida"),
+        (pagado > 0, "parcial"),
+        else_="pendiente",
+    )
+
+
+def sentencia_aplicar_pago(cuota_id: int, delta: Decimal, alumno_id: Optional[int] = None):
+    """
+    UPDATE que suma `delta` (negativo al eliminar un pago) a la cuota y devuelve
+    id, alumno_id, periodo, monto_pagado, saldo_pendiente y estado ya actualizados.
+    Sirve tanto para Session como para AsyncSession.
+    """
+    pagado = func.coalesce(Cuota.monto_pagado, 0) + literal(delta, Numeric(10, 2))
+    saldo = Cuota.monto_a_pagar - pagado
+
+    sentencia = (
+        update(Cuota)
+        .where(Cuota.id == cuota_id)
+        .values(
+            monto_pagado=pagado,
+            saldo_pendiente=case((saldo > 0, saldo), else_=0),
+            estado=estado_segun_saldo(pagado, saldo),
+        )
+        .returning(
+            Cuota.id, Cuota.alumno_id, Cuota.periodo,
+            Cuota.monto_pagado, Cuota.saldo_pendiente, Cuota.estado,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if alumno_id is not None:
+        sentencia = sentencia.where(Cuota.alumno_id == alumno_id)
+    return sentencia
+
+
+def aplicar_pago(db: Session, cuota_id: int, delta: Decimal, alumno_id: Optional[int] = None):
+    """Aplica el movimiento y devuelve la fila actualizada, o None si la cuota no existe."""
+    return db.execute(sentencia_aplicar_pago(cuota_id, delta, alumno_id)).first()
+
+
+def consulta_pagos_out(alumno_id: int) -> Select:
+    """
+    Pagos del alumno con las columnas de PagoOut (período de la cuota incluido),
+    sin armar objetos Pago ni Cuota: las filas van directo al response_model.
+    """
+    return (
+        select(
+            Pago.id,
+            Pago.alumno_id,
+            Pago.cuota_id,
+            Pago.monto_pagado,
+            Pago.fecha_pago,
+            Pago.metodo,
+            Pago.comprobante,
+            func.coalesce(Cuota.periodo, "Sin período").label("periodo"),
+        )
+        .outerjoin(Cuota, Cuota.id == Pago.cuota_id)
+        .where(Pago.alumno_id == alumno_id)
+    )
+
+
+def recalcular_saldos(db: Session, cuota_ids: Iterable[int]) -> int:
+    """
+    Recalcula monto_pagado, saldo y estado de las cuotas indicadas a partir de la
+    suma de sus pagos, con un único UPDATE. Devuelve la cantidad de cuotas tocadas.
+    """
+    cuota_ids = list(cuota_ids)
+    if not cuota_ids:
+        return 0
+    pagado = (
+        select(func.coalesce(func.sum(Pago.monto_pagado), 0))
+        .where(Pago.cuota_id == Cuota.id)
+        .scalar_subquery()
+    )
+    saldo = Cuota.monto_a_pagar - pagado
+    return db.execute(
+        update(Cuota)
+        .where(Cuota.id.in_(cuota_ids))
+        .values(
+            monto_pagado=pagado,
+            saldo_pendiente=case((saldo > 0, saldo), else_=0),
+            estado=estado_segun_saldo(pagado, saldo),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
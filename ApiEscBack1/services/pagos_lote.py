@@ -0,0 +1,284 @@
+# services/pagos_lote.py
+# Importación masiva de pagos desde archivos CSV de bancos / procesadores de pago.
+#
+# El archivo se lee como stream, fila por fila; las cuotas se resuelven con una
+# sola consulta por clave, los pagos se insertan en un único INSERT masivo y los
+# saldos de las cuotas afectadas se recalculan con un único UPDATE.
+#
+# Columnas (encabezado obligatorio, separador "," o ";"):
+#   cuota_id | alumno_id + periodo   identifican la cuota (alcanza con una de las dos formas)
+#   monto_pagado (o monto)           "1234.56", "1234,56" o "1.234,56"
+#   metodo                           obligatorio
+#   comprobante, fecha_pago          opcionales
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import chain
+from typing import BinaryIO, Dict, Iterator, List, Optional
+import csv
+import io
+import re
+
+from fastapi import HTTPException
+from sqlalchemy import insert, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.cuota import Cuota
+from models.pago import Pago
+from services.outbox import registrar_eventos
+from services.pagos import recalcular_saldos
+from services.recaudacion import Movimiento, acumular_recaudacion
+from services.saldos import refrescar_saldos
+
+_PERIODO = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+_MONTO_MAXIMO = Decimal("99999999.99")  # Numeric(10, 2)
+
+
+@dataclass
+class FilaLote:
+    fila: int                                  # número de línea en el archivo (1 = encabezado)
+    cuota_id: Optional[int] = None
+    alumno_id: Optional[int] = None
+    periodo: Optional[str] = None
+    monto: Optional[Decimal] = None
+    metodo: Optional[str] = None
+    comprobante: Optional[str] = None
+    fecha_pago: Optional[datetime] = None
+    estado: str = "ok"                         # ok, error, duplicado
+    errores: List[str] = field(default_factory=list)
+    pago_id: Optional[int] = None
+
+    def rechazar(self, motivo: str, estado: str = "error"):
+        self.estado = estado
+        self.errores.append(motivo)
+
+
+# 🧾 Lectura y validación fila por fila
+def _entero(valor: str, columna: str, fila: FilaLote) -> Optional[int]:
+    if not valor:
+        return None
+    try:
+        return int(valor)
+    except ValueError:
+        fila.rechazar(f"{columna} no es un entero: {valor!r}")
+        return None
+
+
+def _monto(valor: str, fila: FilaLote) -> Optional[Decimal]:
+    if not valor:
+        fila.rechazar("monto_pagado es obligatorio")
+        return None
+    normalizado = valor.replace(" ", "").replace("$", "")
+    if "," in normalizado:
+        # Formato local: "1.234,56" o "1234,56"
+        normalizado = normalizado.replace(".", "").replace(",", ".")
+    try:
+        monto = Decimal(normalizado)
+    except InvalidOperation:
+        fila.rechazar(f"monto_pagado inválido: {valor!r}")
+        return None
+    if not monto.is_finite() or monto <= 0 or monto > _MONTO_MAXIMO:
+        fila.rechazar(f"monto_pagado fuera de rango: {valor!r}")
+        return None
+    if monto != monto.quantize(Decimal("0.01")):
+        fila.rechazar(f"monto_pagado admite hasta 2 decimales: {valor!r}")
+        return None
+    return monto
+
+
+def _fecha(valor: str, fila: FilaLote) -> Optional[datetime]:
+    if not valor:
+        return None
+    for formato in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%d/%m/%Y %H:%M", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(valor, formato)
+        except ValueError:
+            continue
+    fila.rechazar(f"fecha_pago inválida: {valor!r}")
+    return None
+
+
+def _validar(numero: int, registro: Dict[str, str]) -> FilaLote:
+    valores = {clave: (valor or "").strip() for clave, valor in registro.items() if clave}
+    fila = FilaLote(fila=numero)
+    fila.cuota_id = _entero(valores.get("cuota_id"), "cuota_id", fila)
+    fila.alumno_id = _entero(valores.get("alumno_id"), "alumno_id", fila)
+    fila.periodo = valores.get("periodo") or None
+    fila.monto = _monto(valores.get("monto_pagado") or valores.get("monto"), fila)
+    fila.metodo = valores.get("metodo") or None
+    fila.comprobante = valores.get("comprobante") or None
+    fila.fecha_pago = _fecha(valores.get("fecha_pago"), fila)
+
+    if fila.periodo and not _PERIODO.match(fila.periodo):
+        fila.rechazar(f"periodo debe tener formato YYYY-MM: {fila.periodo!r}")
+    if fila.cuota_id is None and (fila.alumno_id is None or not fila.periodo):
+        fila.rechazar("falta cuota_id o el par alumno_id + periodo")
+    if not fila.metodo:
+        fila.rechazar("metodo es obligatorio")
+    elif len(fila.metodo) > 30:
+        fila.rechazar("metodo supera los 30 caracteres")
+    if fila.comprobante and len(fila.comprobante) > 100:
+        fila.rechazar("comprobante supera los 100 caracteres")
+    return fila
+
+
+def leer_csv(archivo: BinaryIO) -> Iterator[FilaLote]:
+    """Recorre el CSV como stream y devuelve cada fila ya validada (sin tocar la base)."""
+    texto = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    try:
+        encabezado = texto.readline()
+        if not encabezado.strip():
+            raise HTTPException(status_code=400, detail="El archivo está vacío")
+        separador = ";" if encabezado.count(";") > encabezado.count(",") else ","
+        lector = csv.DictReader(chain([encabezado], texto), delimiter=separador)
+        columnas = {c.strip() for c in lector.fieldnames or [] if c}
+        if not columnas & {"monto_pagado", "monto"} or "metodo" not in columnas:
+            raise HTTPException(status_code=400, detail="El encabezado debe incluir monto_pagado y metodo")
+        if "cuota_id" not in columnas and not {"alumno_id", "periodo"} <= columnas:
+            raise HTTPException(status_code=400, detail="El encabezado debe incluir cuota_id o alumno_id y periodo")
+        lector.fieldnames = [c.strip() if c else c for c in lector.fieldnames]
+
+        for indice, registro in enumerate(lector):
+            if indice >= settings.pagos_lote_max_filas:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"El archivo supera el máximo de {settings.pagos_lote_max_filas} filas",
+                )
+            if not any((v or "").strip() for v in registro.values() if isinstance(v, str)):
+                continue  # línea en blanco
+            yield _validar(lector.line_num, registro)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="El archivo debe estar codificado en UTF-8")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"CSV inválido: {e}")
+    finally:
+        texto.detach()
+
+
+# 🔎 Resolución de cuotas y duplicados (una consulta cada una)
+def _resolver_cuotas(db: Session, filas: List[FilaLote], bloquear: bool):
+    ids = {f.cuota_id for f in filas if f.cuota_id is not None}
+    pares = {(f.alumno_id, f.periodo) for f in filas if f.cuota_id is None}
+    condiciones = []
+    if ids:
+        condiciones.append(Cuota.id.in_(ids))
+    if pares:
+        condiciones.append(tuple_(Cuota.alumno_id, Cuota.periodo).in_(pares))
+    if not condiciones:
+        return {}, {}
+
+    consulta = (
+        select(Cuota.id, Cuota.alumno_id, Cuota.periodo)
+        .where(or_(*condiciones))
+        .order_by(Cuota.id)
+    )
+    if bloquear:
+        # Bloqueo en orden de id: los pagos sueltos concurrentes esperan y no hay deadlocks entre lotes
+        consulta = consulta.with_for_update()
+    cuotas = db.execute(consulta).all()
+    por_id = {c.id: c for c in cuotas}
+    por_par = {(c.alumno_id, c.periodo): c for c in cuotas}
+    return por_id, por_par
+
+
+def _comprobantes_existentes(db: Session, filas: List[FilaLote]) -> set:
+    claves = {(f.cuota_id, f.comprobante) for f in filas if f.comprobante}
+    if not claves:
+        return set()
+    existentes = db.execute(
+        select(Pago.cuota_id, Pago.comprobante)
+        .where(Pago.comprobante.in_({c for _, c in claves}))
+    ).all()
+    return {tuple(e) for e in existentes} & claves
+
+
+def importar_pagos(db: Session, archivo: BinaryIO, registrado_por: int, dry_run: bool = False) -> dict:
+    """
+    Valida e importa los pagos del archivo. Las filas con errores o ya importadas
+    (mismo comprobante para la misma cuota) se informan y no se insertan; el resto
+    se guarda en una sola transacción. Con dry_run no se escribe nada.
+    """
+    filas = list(leer_csv(archivo))
+    candidatas = [f for f in filas if f.estado == "ok"]
+
+    por_id, por_par = _resolver_cuotas(db, candidatas, bloquear=not dry_run)
+    for f in candidatas:
+        cuota = por_id.get(f.cuota_id) if f.cuota_id is not None else por_par.get((f.alumno_id, f.periodo))
+        if cuota is None:
+            f.rechazar("cuota no encontrada")
+        elif f.alumno_id is not None and f.alumno_id != cuota.alumno_id:
+            f.rechazar(f"la cuota {cuota.id} no pertenece al alumno {f.alumno_id}")
+        elif f.periodo and f.periodo != cuota.periodo:
+            f.rechazar(f"la cuota {cuota.id} es del período {cuota.periodo}, no {f.periodo}")
+        else:
+            f.cuota_id, f.alumno_id, f.periodo = cuota.id, cuota.alumno_id, cuota.periodo
+
+    candidatas = [f for f in candidatas if f.estado == "ok"]
+    ya_importados = _comprobantes_existentes(db, candidatas)
+    vistos = set()
+    for f in candidatas:
+        if not f.comprobante:
+            continue
+        clave = (f.cuota_id, f.comprobante)
+        if clave in ya_importados:
+            f.rechazar(f"el comprobante {f.comprobante!r} ya está registrado para la cuota", "duplicado")
+        elif clave in vistos:
+            f.rechazar(f"comprobante {f.comprobante!r} repetido en el archivo", "duplicado")
+        vistos.add(clave)
+
+    aceptadas = [f for f in candidatas if f.estado == "ok"]
+    cuotas_actualizadas = 0
+    if aceptadas and not dry_run:
+        ahora = datetime.now()
+        ids = db.scalars(
+            insert(Pago).returning(Pago.id, sort_by_parameter_order=True),
+            [
+                {
+                    "alumno_id": f.alumno_id,
+                    "cuota_id": f.cuota_id,
+                    "monto_pagado": f.monto,
+                    "metodo": f.metodo,
+                    "comprobante": f.comprobante,
+                    "fecha_pago": f.fecha_pago or ahora,
+                    "registrado_por": registrado_por,
+                }
+                for f in aceptadas
+            ],
+        ).all()
+        for f, pago_id in zip(aceptadas, ids):
+            f.pago_id = pago_id
+
+        cuotas_actualizadas = recalcular_saldos(db, {f.cuota_id for f in aceptadas})
+        refrescar_saldos(db, {f.alumno_id for f in aceptadas})
+        acumular_recaudacion(db, [
+            Movimiento(f.fecha_pago or ahora, f.periodo, f.metodo, f.monto) for f in aceptadas
+        ])
+        registrar_eventos(db, "pago_registrado", [
+            {"alumno_id": f.alumno_id, "cuota_id": f.cuota_id, "monto": f.monto, "periodo": f.periodo}
+            for f in aceptadas
+        ])
+        db.commit()
+    elif dry_run:
+        db.rollback()
+
+    return {
+        "dry_run": dry_run,
+        "total": len(filas),
+        "aceptadas": len(aceptadas),
+        "rechazadas": sum(1 for f in filas if f.estado == "error"),
+        "duplicadas": sum(1 for f in filas if f.estado == "duplicado"),
+        "cuotas_actualizadas": cuotas_actualizadas,
+        "filas": [
+            {
+                "fila": f.fila,
+                "estado": f.estado,
+                "cuota_id": f.cuota_id,
+                "monto_pagado": f.monto,
+                "comprobante": f.comprobante,
+                "pago_id": f.pago_id,
+                "errores": f.errores,
+            }
+            for f in filas
+        ],
+    }
@@ -0,0 +1,304 @@
+# services/planificador.py
+# Planificador de tareas periódicas (recordatorios, vencimientos, ...).
+#
+# Cada worker de uvicorn corre el mismo ciclo desde el lifespan de app.py. Para que
+# una tarea se ejecute una sola vez por turno aunque haya varios workers en varios
+# hosts:
+#   1. en Postgres, pg_try_advisory_lock por tarea elige un único ejecutor (los
+#      demás siguen de largo sin esperar);
+#   2. antes de correr se inserta la fila (tarea, programada) en jobs_ejecuciones,
+#      con índice único: si otro worker ya tomó ese turno, el INSERT falla y se omite.
+# Las tareas reciben una Session y devuelven un resumen (dict) que queda guardado
+# junto con la hora, la duración y el estado de la corrida. Lo que dejen sin
+# confirmar se confirma al terminar; las tareas largas pueden hacer commit por lotes.
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+import asyncio
+import json
+import os
+import socket
+import time
+import zlib
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.db import SessionLocal, engine
+from config.settings import settings
+from models.ejecucionJob import EjecucionJob
+from services.recordatorios import generar_recordatorios
+from services.vencimientos import marcar_vencidas
+
+
+# ⏰ Expresiones cron de 5 campos: minuto hora día-del-mes mes día-de-la-semana
+_ALIAS = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+_CAMPOS = [("minuto", 0, 59), ("hora", 0, 23), ("día", 1, 31), ("mes", 1, 12), ("día de la semana", 0, 7)]
+
+
+def _campo(texto: str, nombre: str, minimo: int, maximo: int) -> Set[int]:
+    valores = set()
+    for parte in texto.split(","):
+        rango, _, paso = parte.partition("/")
+        paso = int(paso) if paso else 1
+        if rango == "*":
+            desde, hasta = minimo, maximo
+        elif "-" in rango:
+            desde, hasta = (int(v) for v in rango.split("-", 1))
+        else:
+            desde = hasta = int(rango)
+            if paso > 1:
+                hasta = maximo
+        if desde < minimo or hasta > maximo or desde > hasta or paso < 1:
+            raise ValueError(f"Valor fuera de rango en el campo {nombre}: {parte!r}")
+        valores.update(range(desde, hasta + 1, paso))
+    return valores
+
+
+@dataclass(frozen=True)
+class Cron:
+    expresion: str
+    minutos: frozenset
+    horas: frozenset
+    dias: frozenset
+    meses: frozenset
+    dias_semana: frozenset      # 0 = domingo
+    dia_libre: bool             # "*" en día del mes
+    dia_semana_libre: bool      # "*" en día de la semana
+
+    @classmethod
+    def parsear(cls, expresion: str) -> "Cron":
+        partes = _ALIAS.get(expresion.strip(), expresion).split()
+        if len(partes) != 5:
+            raise ValueError(f"La expresión cron debe tener 5 campos: {expresion!r}")
+        try:
+            minutos, horas, dias, meses, dias_semana = (
+                _campo(texto, nombre, minimo, maximo)
+                for texto, (nombre, minimo, maximo) in zip(partes, _CAMPOS)
+            )
+        except ValueError as e:
+            raise ValueError(f"Expresión cron inválida {expresion!r}: {e}")
+        return cls(
+            expresion=expresion,
+            minutos=frozenset(minutos),
+            horas=frozenset(horas),
+            dias=frozenset(dias),
+            meses=frozenset(meses),
+            dias_semana=frozenset(d % 7 for d in dias_semana),
+            dia_libre=partes[2] == "*",
+            dia_semana_libre=partes[4] == "*",
+        )
+
+    def _dia_coincide(self, momento: datetime) -> bool:
+        por_dia = momento.day in self.dias
+        por_semana = (momento.isoweekday() % 7) in self.dias_semana
+        # Igual que cron: si se restringen los dos campos alcanza con que coincida uno
+        if self.dia_libre or self.dia_semana_libre:
+            return por_dia and por_semana
+        return por_dia or por_semana
+
+    def proxima(self, desde: datetime) -> datetime:
+        """Primer turno estrictamente posterior a `desde`."""
+        momento = desde.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limite = momento + timedelta(days=366 * 4)
+        while momento < limite:
+            if momento.month not in self.meses:
+                anio, mes = (momento.year + 1, 1) if momento.month == 12 else (momento.year, momento.month + 1)
+                momento = momento.replace(year=anio, month=mes, day=1, hour=0, minute=0)
+            elif not self._dia_coincide(momento):
+                momento = momento.replace(hour=0, minute=0) + timedelta(days=1)
+            elif momento.hour not in self.horas:
+                momento = momento.replace(minute=0) + timedelta(hours=1)
+            elif momento.minute not in self.minutos:
+                momento += timedelta(minutes=1)
+            else:
+                return momento
+        raise ValueError(f"La expresión cron {self.expresion!r} nunca se cumple")
+
+
+# 📋 Registro de tareas
+@dataclass
+class Tarea:
+    nombre: str
+    cron: Cron
+    funcion: Callable[[Session], dict]
+    proxima: Optional[datetime] = None              # próximo turno según este worker
+    ejecutando: bool = field(default=False, repr=False)
+
+    @property
+    def clave_lock(self) -> int:
+        return zlib.crc32(f"planificador:{self.nombre}".encode())
+
+
+TAREAS: Dict[str, Tarea] = {}
+
+
+def registrar_tarea(nombre: str, cron: str, funcion: Callable[[Session], dict]):
+    """Agrega una tarea; un cron vacío o "-" la deja desactivada."""
+    if not cron or cron.strip() == "-":
+        TAREAS.pop(nombre, None)
+        return
+    TAREAS[nombre] = Tarea(nombre=nombre, cron=Cron.parsear(cron), funcion=funcion)
+
+
+def _worker() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+def _resumen_json(resumen) -> Optional[dict]:
+    # Fechas, Decimal, etc. se guardan como texto
+    return json.loads(json.dumps(resumen, default=str)) if resumen is not None else None
+
+
+# ▶️ Ejecución de una tarea
+def ejecutar_tarea(tarea: Tarea, programada: datetime) -> Optional[dict]:
+    """
+    Corre la tarea para el turno `programada` si este worker gana la elección.
+    Devuelve el registro de la corrida, o None si la tomó otro worker.
+    """
+    es_postgres = engine.dialect.name == "postgresql"
+    with engine.connect() as lock_conn:
+        if es_postgres:
+            adquirido = lock_conn.scalar(select(func.pg_try_advisory_lock(tarea.clave_lock)))
+            lock_conn.commit()
+            if not adquirido:
+                return None
+        try:
+            return _ejecutar_turno(tarea, programada)
+        finally:
+            if es_postgres:
+                lock_conn.execute(select(func.pg_advisory_unlock(tarea.clave_lock)))
+                lock_conn.commit()
+
+
+def _ejecutar_turno(tarea: Tarea, programada: datetime) -> Optional[dict]:
+    with SessionLocal() as db:
+        try:
+            ejecucion_id = db.execute(
+                insert(EjecucionJob)
+                .values(tarea=tarea.nombre, programada=programada, estado="ejecutando", worker=_worker())
+                .returning(EjecucionJob.id)
+            ).scalar_one()
+            db.commit()
+        except IntegrityError:
+            # Otro worker ya ejecutó (o está ejecutando) este turno
+            db.rollback()
+            return None
+
+        inicio = time.perf_counter()
+        estado, resumen, error = "ok", None, None
+        try:
+            resumen = tarea.funcion(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            estado, error = "error", f"{type(e).__name__}: {e}"[:255]
+            print(f"❌ Tarea {tarea.nombre} ({programada:%Y-%m-%d %H:%M}) falló:", e)
+        duracion_ms = int((time.perf_counter() - inicio) * 1000)
+
+        registro = {
+            "fin": datetime.now(),
+            "duracion_ms": duracion_ms,
+            "estado": estado,
+            "filas": _resumen_json(resumen),
+            "error": error,
+        }
+        db.execute(update(EjecucionJob).where(EjecucionJob.id == ejecucion_id).values(**registro))
+        db.commit()
+        if estado == "ok":
+            print(f"✅ Tarea {tarea.nombre} ({programada:%Y-%m-%d %H:%M}) en {duracion_ms} ms: {registro['filas']}")
+        return {"id": ejecucion_id, "tarea": tarea.nombre, "programada": programada, **registro}
+
+
+# 🔁 Ciclo en segundo plano (se inicia desde el lifespan de app.py con SCHEDULER_ENABLED=1)
+def _ultimo_turno(cron: Cron, desde: datetime, hasta: datetime) -> Optional[datetime]:
+    """Último turno del cron dentro de [desde, hasta], o None si no hay ninguno."""
+    turno = cron.proxima(desde - timedelta(minutes=1))
+    if turno > hasta:
+        return None
+    while (siguiente := cron.proxima(turno)) <= hasta:
+        turno = siguiente
+    return turno
+
+
+def _preparar(ahora: datetime):
+    # Al arrancar se recupera el último turno perdido dentro de la tolerancia
+    # (si ya lo corrió otro worker, el índice único lo descarta)
+    desde = ahora - timedelta(seconds=settings.scheduler_tolerancia)
+    for tarea in TAREAS.values():
+        if tarea.proxima is None:
+            tarea.proxima = _ultimo_turno(tarea.cron, desde, ahora) or tarea.cron.proxima(ahora)
+
+
+async def _correr(tarea: Tarea, programada: datetime):
+    tarea.ejecutando = True
+    try:
+        await asyncio.to_thread(ejecutar_tarea, tarea, programada)
+    except Exception as e:
+        print(f"Error en el planificador ({tarea.nombre}):", e)
+    finally:
+        tarea.ejecutando = False
+
+
+async def planificar_en_segundo_plano(detener: asyncio.Event):
+    _preparar(datetime.now())
+    en_curso: List[asyncio.Task] = []
+    while not detener.is_set():
+        ahora = datetime.now()
+        for tarea in TAREAS.values():
+            if tarea.ejecutando or tarea.proxima is None or tarea.proxima > ahora:
+                continue
+            # Si se perdieron varios turnos (worker ocupado, reloj adelantado) se corre sólo el último
+            programada = _ultimo_turno(tarea.cron, tarea.proxima, ahora)
+            tarea.proxima = tarea.cron.proxima(ahora)
+            en_curso.append(asyncio.create_task(_correr(tarea, programada)))
+        en_curso = [t for t in en_curso if not t.done()]
+        try:
+            await asyncio.wait_for(detener.wait(), timeout=settings.scheduler_tick)
+        except asyncio.TimeoutError:
+            pass
+    if en_curso:
+        await asyncio.gather(*en_curso)
+
+
+def estado_tareas(db: Session) -> List[dict]:
+    """Configuración de cada tarea y su última corrida (una sola consulta)."""
+    ultimas_ids = (
+        select(func.max(EjecucionJob.id))
+        .where(EjecucionJob.tarea.in_(list(TAREAS)))
+        .group_by(EjecucionJob.tarea)
+    )
+    ultimas = {
+        e.tarea: e
+        for e in db.execute(select(EjecucionJob).where(EjecucionJob.id.in_(ultimas_ids))).scalars()
+    }
+    salida = []
+    for tarea in TAREAS.values():
+        ultima = ultimas.get(tarea.nombre)
+        salida.append({
+            "tarea": tarea.nombre,
+            "cron": tarea.cron.expresion,
+            "proxima": tarea.proxima or tarea.cron.proxima(datetime.now()),
+            "ultima_ejecucion": {
+                "programada": ultima.programada,
+                "inicio": ultima.inicio,
+                "fin": ultima.fin,
+                "duracion_ms": ultima.duracion_ms,
+                "estado": ultima.estado,
+                "filas": ultima.filas,
+                "error": ultima.error,
+                "worker": ultima.worker,
+            } if ultima else None,
+        })
+    return salida
+
+
+# 🗓️ Tareas de la aplicación (cron configurable por variable de entorno; "-" desactiva)
+registrar_tarea("recordatorios", settings.cron_recordatorios, generar_recordatorios)
+registrar_tarea("vencidas", settings.cron_vencidas, marcar_vencidas)
@@ -0,0 +1,221 @@
+# services/presupuesto_consultas.py
+# Presupuesto de consultas SQL por request y detector de N+1 (desarrollo y tests).
+# Con CONSULTAS_PRESUPUESTO=log|raise el middleware cuenta las sentencias de cada
+# request, agrupa las que tienen la misma forma (misma SQL salvo literales y listas
+# de parámetros) y marca como N+1 las que se repiten CONSULTAS_N_MAS_UNO veces o más.
+# Cada ruta declara su tope con @presupuesto_consultas(n); sin tope propio rige
+# CONSULTAS_PRESUPUESTO_DEFAULT (0 = sin tope). En modo raise un exceso responde 500
+# con el informe; en modo log sólo se imprime. En tests, contar_consultas() hace lo
+# mismo alrededor de cualquier bloque de código.
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+import json
+import os
+import re
+import sys
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.settings import settings
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ESTE_ARCHIVO = os.path.abspath(__file__)
+
+_PARAMETRO = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_LISTA_PARAMETROS = re.compile(rf"\(\s*{_PARAMETRO}(?:\s*,\s*{_PARAMETRO})+\s*\)")
+_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_CADENA = re.compile(r"'(?:[^']|'')*'")
+_ESPACIOS = re.compile(r"\s+")
+
+SENTENCIAS_EN_INFORME = 50
+
+
+def forma(sentencia: str) -> str:
+    """SQL sin literales ni listas de parámetros: dos sentencias de un N+1 tienen la misma forma."""
+    sentencia = _LISTA_PARAMETROS.sub("(…)", sentencia)
+    sentencia = _CADENA.sub("'…'", sentencia)
+    sentencia = _NUMERO.sub("N", sentencia)
+    return _ESPACIOS.sub(" ", sentencia).strip()
+
+
+def _origen() -> Optional[str]:
+    """Primer frame del código de la app (routes/, services/, ...) que disparó la sentencia."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        archivo = os.path.abspath(frame.f_code.co_filename)
+        if archivo.startswith(_RAIZ) and archivo != _ESTE_ARCHIVO and "site-packages" not in archivo:
+            return f"{os.path.relpath(archivo, _RAIZ)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class RegistroConsultas:
+    def __init__(self, presupuesto: Optional[int] = None):
+        self.presupuesto = presupuesto
+        self.sentencias: List[tuple] = []  # (sql, forma, origen)
+
+    def anotar(self, sentencia: str):
+        self.sentencias.append((sentencia, forma(sentencia), _origen()))
+
+    @property
+    def cantidad(self) -> int:
+        return len(self.sentencias)
+
+    @property
+    def excedido(self) -> bool:
+        return bool(self.presupuesto) and self.cantidad > self.presupuesto
+
+    def n_mas_uno(self) -> List[dict]:
+        repetidas = Counter(f for _, f, _ in self.sentencias)
+        origenes = {}
+        for _, f, origen in self.sentencias:
+            origenes.setdefault(f, origen)
+        return [
+            {"forma": f, "repeticiones": veces, "origen": origenes[f]}
+            for f, veces in repetidas.most_common()
+            if veces >= settings.consultas_n_mas_uno
+        ]
+
+    def informe(self) -> dict:
+        return {
+            "consultas": self.cantidad,
+            "presupuesto": self.presupuesto or None,
+            "n_mas_uno": self.n_mas_uno(),
+            "sentencias": [
+                {"sql": _ESPACIOS.sub(" ", sql)[:300], "origen": origen}
+                for sql, _, origen in self.sentencias[:SENTENCIAS_EN_INFORME]
+            ],
+        }
+
+    def texto(self, titulo: str) -> str:
+        datos = self.informe()
+        tope = f" (presupuesto {self.presupuesto})" if self.presupuesto else ""
+        lineas = [f"{titulo}: {self.cantidad} consultas{tope}"]
+        for grupo in datos["n_mas_uno"]:
+            lineas.append(f"  N+1 x{grupo['repeticiones']} desde {grupo['origen']}: {grupo['forma'][:200]}")
+        for i, sentencia in enumerate(datos["sentencias"], 1):
+            lineas.append(f"  {i:>3}. [{sentencia['origen']}] {sentencia['sql'][:200]}")
+        if self.cantidad > SENTENCIAS_EN_INFORME:
+            lineas.append(f"  ... y {self.cantidad - SENTENCIAS_EN_INFORME} más")
+        return "\n".join(lineas)
+
+
+_registro_actual: ContextVar[Optional[RegistroConsultas]] = ContextVar("presupuesto_consultas", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _anotar_en_request(conn, cursor, sentencia, parametros, contexto, executemany):
+    registro = _registro_actual.get()
+    if registro is not None:
+        registro.anotar(sentencia)
+
+
+# 🏷️ Tope declarado por la ruta. Va debajo del decorador de FastAPI:
+#   @user.get("/alumnos")
+#   @presupuesto_consultas(1)
+#   def obtener_alumnos(...)
+def presupuesto_consultas(maximo: int):
+    def decorar(funcion):
+        funcion.presupuesto_consultas = maximo
+        return funcion
+    return decorar
+
+
+def _presupuesto_de(scope) -> int:
+    endpoint = getattr(scope.get("route"), "endpoint", None)
+    return getattr(endpoint, "presupuesto_consultas", settings.consultas_presupuesto_default)
+
+
+class PresupuestoConsultasMiddleware:
+    """
+    Se evalúa al enviar el inicio de la respuesta: para entonces la ruta y el
+    response_model (lazy loads incluidos) ya corrieron, y todavía se puede
+    reemplazar la respuesta por un 500. Lo que consulte un StreamingResponse
+    después de empezar a enviar sólo se informa por consola.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registro = RegistroConsultas()
+        marca = _registro_actual.set(registro)
+        descartar = False
+        informado = False
+        titulo = f"{scope['method']} {scope['path']}"
+
+        async def enviar(mensaje):
+            nonlocal descartar, informado
+            if descartar:
+                return
+            if mensaje["type"] == "http.response.start":
+                registro.presupuesto = _presupuesto_de(scope)
+                if registro.excedido or registro.n_mas_uno():
+                    informado = True
+                    print(registro.texto(f"⚠️ Consultas en {titulo}"))
+                if registro.excedido and settings.consultas_presupuesto == "raise":
+                    descartar = True
+                    cuerpo = json.dumps({
+                        "detail": f"Presupuesto de consultas excedido: {registro.cantidad} > {registro.presupuesto}",
+                        "informe": registro.informe(),
+                    }, default=str).encode()
+                    await send({
+                        "type": "http.response.start",
+                        "status": 500,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(cuerpo)).encode()),
+                            (b"x-consultas-sql", str(registro.cantidad).encode()),
+                        ],
+                    })
+                    await send({"type": "http.response.body", "body": cuerpo})
+                    return
+                mensaje = {
+                    **mensaje,
+                    "headers": [*mensaje.get("headers", []), (b"x-consultas-sql", str(registro.cantidad).encode())],
+                }
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _registro_actual.reset(marca)
+            if not informado and registro.presupuesto is not None and registro.excedido:
+                print(registro.texto(f"⚠️ Consultas en {titulo} (después de empezar a responder)"))
+
+
+# 🧪 Tests: cuenta todas las sentencias del proceso dentro del bloque (también las
+# que corren en el hilo del TestClient) y falla si se pasa del tope o hay un N+1.
+class PresupuestoExcedido(AssertionError):
+    pass
+
+
+@contextmanager
+def contar_consultas(maximo: Optional[int] = None, n_mas_uno: bool = True):
+    """
+        with contar_consultas(maximo=2) as registro:
+            cliente.get("/user/alumnos", headers=headers)
+        assert registro.cantidad == 1
+    """
+    registro = RegistroConsultas(maximo)
+
+    def anotar(conn, cursor, sentencia, parametros, contexto, executemany):
+        registro.anotar(sentencia)
+
+    event.listen(Engine, "before_cursor_execute", anotar)
+    try:
+        yield registro
+    finally:
+        event.remove(Engine, "before_cursor_execute", anotar)
+
+    if registro.excedido:
+        raise PresupuestoExcedido(registro.texto("Presupuesto de consultas excedido"))
+    if n_mas_uno and registro.n_mas_uno():
+        raise PresupuestoExcedido(registro.texto("Posible N+1"))
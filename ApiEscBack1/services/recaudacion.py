@@ -0,0 +1,252 @@
+# services/recaudacion.py
+# Estadísticas de recaudación sin recorrer la tabla de pagos.
+#
+# recaudacion_diaria guarda cantidad y total cobrado por (día, período de la
+# cuota, método). Cada alta, baja o edición de un pago suma su movimiento (con
+# signo) en la misma transacción, con un INSERT … ON CONFLICT DO UPDATE que
+# incrementa la fila: las sumas conmutan, así que pagos simultáneos no se pisan.
+#
+# El reporte agrupa esas filas (una por día y combinación, no una por pago) y se
+# guarda unos segundos en memoria (RECAUDACION_CACHE_TTL) por si varios admins
+# abren el tablero a la vez. No se invalida al registrar pagos (cada worker tiene
+# su propia caché): el reporte puede atrasarse hasta ese TTL.
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import argparse
+import sys
+import threading
+import time
+
+from sqlalchemy import Date, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.cuota import Cuota
+from models.pago import Pago
+from models.recaudacionDiaria import RecaudacionDiaria
+
+_CENTAVOS = Decimal("0.01")
+_MAX_ENTRADAS = 256
+
+
+class Movimiento(NamedTuple):
+    """Efecto de un pago sobre la recaudación; con cantidad -1 y monto negativo lo descuenta."""
+    fecha_pago: datetime
+    periodo: str
+    metodo: str
+    monto: Decimal
+    cantidad: int = 1
+
+    def inverso(self) -> "Movimiento":
+        return self._replace(monto=-Decimal(str(self.monto)), cantidad=-self.cantidad)
+
+
+def _dia(fecha) -> date:
+    return fecha.date() if isinstance(fecha, datetime) else fecha
+
+
+# ➕ Mantenimiento incremental
+def sentencia_acumular(movimientos: Iterable[Movimiento], dialecto: str):
+    """
+    UPSERT que suma los movimientos a recaudacion_diaria, o None si no hay nada
+    que sumar. Sirve tanto para Session como para AsyncSession.
+    """
+    acumulado: Dict[Tuple[date, str, str], List] = {}
+    for m in movimientos:
+        if m.fecha_pago is None:
+            continue
+        fila = acumulado.setdefault((_dia(m.fecha_pago), m.periodo, m.metodo), [0, Decimal(0)])
+        fila[0] += m.cantidad
+        fila[1] += Decimal(str(m.monto))
+    # Una fila por clave (Postgres no admite tocar dos veces la misma fila en un
+    # mismo INSERT) y en orden, para que dos lotes bloqueen filas en el mismo orden
+    valores = [
+        {"dia": dia, "periodo": periodo, "metodo": metodo, "cantidad": cantidad, "total": total}
+        for (dia, periodo, metodo), (cantidad, total) in sorted(acumulado.items())
+        if cantidad or total
+    ]
+    if not valores:
+        return None
+
+    upsert = (postgresql.insert if dialecto == "postgresql" else sqlite.insert)(RecaudacionDiaria).values(valores)
+    return upsert.on_conflict_do_update(
+        index_elements=[RecaudacionDiaria.dia, RecaudacionDiaria.periodo, RecaudacionDiaria.metodo],
+        set_={
+            "cantidad": RecaudacionDiaria.cantidad + upsert.excluded.cantidad,
+            "total": RecaudacionDiaria.total + upsert.excluded.total,
+        },
+    )
+
+
+def acumular_recaudacion(db: Session, movimientos: Iterable[Movimiento]) -> None:
+    """Suma los movimientos en la transacción de `db` (sin commit)."""
+    sentencia = sentencia_acumular(movimientos, db.get_bind().dialect.name)
+    if sentencia is not None:
+        db.execute(sentencia)
+
+
+# 📊 Reporte
+def _consultar(db: Session, desde: Optional[date], hasta: Optional[date], periodo: Optional[str]) -> dict:
+    filtros = []
+    if desde is not None:
+        filtros.append(RecaudacionDiaria.dia >= desde)
+    if hasta is not None:
+        filtros.append(RecaudacionDiaria.dia <= hasta)
+    if periodo is not None:
+        filtros.append(RecaudacionDiaria.periodo == periodo)
+
+    cantidad = func.sum(RecaudacionDiaria.cantidad)
+    total = func.sum(RecaudacionDiaria.total)
+
+    def agrupar(columna):
+        return db.execute(
+            select(columna, cantidad, total)
+            .where(*filtros)
+            .group_by(columna)
+            .having(cantidad != 0)
+            .order_by(columna)
+        ).all()
+
+    por_periodo = agrupar(RecaudacionDiaria.periodo)
+    # Lo facturado sale de las cuotas de esos períodos (una fila por alumno y período,
+    # mucho menos que los pagos)
+    a_pagar = dict(db.execute(
+        select(Cuota.periodo, func.sum(Cuota.monto_a_pagar))
+        .where(Cuota.periodo.in_([p for p, _, _ in por_periodo]))
+        .group_by(Cuota.periodo)
+    ).all()) if por_periodo else {}
+
+    def monto(valor) -> Decimal:
+        return Decimal(str(valor or 0)).quantize(_CENTAVOS)
+
+    periodos = []
+    for p, c, t in por_periodo:
+        facturado = monto(a_pagar.get(p))
+        periodos.append({
+            "periodo": p,
+            "cantidad": c,
+            "total": monto(t),
+            "a_pagar": facturado,
+            "tasa_cobro": float(round(monto(t) / facturado, 4)) if facturado else None,
+        })
+
+    return {
+        "desde": desde,
+        "hasta": hasta,
+        "periodo": periodo,
+        "cantidad": sum(p["cantidad"] for p in periodos),
+        "total": sum((p["total"] for p in periodos), Decimal(0)),
+        "por_periodo": periodos,
+        "por_metodo": [
+            {"metodo": m, "cantidad": c, "total": monto(t)}
+            for m, c, t in agrupar(RecaudacionDiaria.metodo)
+        ],
+        "por_dia": [
+            {"dia": d, "cantidad": c, "total": monto(t)}
+            for d, c, t in agrupar(RecaudacionDiaria.dia)
+        ],
+        "generado": datetime.now(),
+    }
+
+
+_cache: Dict[tuple, Tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def reporte_recaudacion(
+    db: Session,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    periodo: Optional[str] = None,
+) -> dict:
+    """Totales por período (con tasa de cobro), por método y por día, con caché de pocos segundos."""
+    clave = (desde, hasta, periodo)
+    ahora = time.monotonic()
+    with _cache_lock:
+        entrada = _cache.get(clave)
+        if entrada is not None and entrada[0] > ahora:
+            return entrada[1]
+
+    resultado = _consultar(db, desde, hasta, periodo)
+    if settings.recaudacion_cache_ttl > 0:
+        with _cache_lock:
+            for vencida in [k for k, e in _cache.items() if e[0] <= ahora]:
+                del _cache[vencida]
+            if len(_cache) >= _MAX_ENTRADAS:
+                _cache.clear()
+            _cache[clave] = (ahora + settings.recaudacion_cache_ttl, resultado)
+    return resultado
+
+
+# 🔍 Verificación contra los pagos
+def _desde_pagos():
+    dia = func.date(Pago.fecha_pago, type_=Date)
+    return (
+        select(dia, Cuota.periodo, Pago.metodo, func.count(), func.sum(Pago.monto_pagado))
+        .join(Cuota, Cuota.id == Pago.cuota_id)
+        .where(Pago.fecha_pago.is_not(None))
+        .group_by(dia, Cuota.periodo, Pago.metodo)
+    )
+
+
+def diferencias(db: Session) -> List[dict]:
+    """Claves (día, período, método) donde la tabla no coincide con recalcular desde los pagos."""
+    def normalizar(filas):
+        return {
+            (_dia(d), p, m): (c, Decimal(str(t)).quantize(_CENTAVOS))
+            for d, p, m, c, t in filas
+            if c or t
+        }
+
+    esperado = normalizar(db.execute(_desde_pagos()).all())
+    guardado = normalizar(db.execute(select(
+        RecaudacionDiaria.dia, RecaudacionDiaria.periodo, RecaudacionDiaria.metodo,
+        RecaudacionDiaria.cantidad, RecaudacionDiaria.total,
+    )).all())
+    return [
+        {"dia": k[0], "periodo": k[1], "metodo": k[2], "esperado": esperado.get(k), "guardado": guardado.get(k)}
+        for k in sorted(esperado.keys() | guardado.keys())
+        if esperado.get(k) != guardado.get(k)
+    ]
+
+
+def reconstruir_recaudacion(db: Session) -> int:
+    """Vuelve a armar la tabla completa desde los pagos (sin commit). Devuelve la cantidad de filas."""
+    db.execute(delete(RecaudacionDiaria))
+    return db.execute(
+        insert(RecaudacionDiaria).from_select(
+            ["dia", "periodo", "metodo", "cantidad", "total"], _desde_pagos()
+        )
+    ).rowcount
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import config.init_db  # noqa: F401  registra todos los modelos
+    from config.db import SessionLocal
+
+    parser = argparse.ArgumentParser(prog="python -m services.recaudacion", description="Totales de recaudación")
+    parser.add_argument("--reconstruir", action="store_true", help="rearmar recaudacion_diaria desde los pagos")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        if args.reconstruir:
+            filas = reconstruir_recaudacion(db)
+            db.commit()
+            print(f"✅ Recaudación reconstruida ({filas} filas).")
+            return 0
+        distintas = diferencias(db)
+        if distintas:
+            print(f"❌ {len(distintas)} filas no coinciden con los pagos:")
+            for d in distintas[:20]:
+                print(f"  - {d}")
+            return 1
+        print("✅ La recaudación coincide con los pagos.")
+        return 0
+
+
+if __name__ == "__main__":
+    # python -m services.recaudacion                 verifica la tabla contra los pagos
+    # python -m services.recaudacion --reconstruir   la vuelve a armar completa
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# services/recordatorios.py
+# Generación de recordatorios de vencimiento, resuelta entera en la base.
+#
+# Cada ventana (p. ej. 7, 3 y 1 días antes del vencimiento) se envía una sola vez
+# por cuota: la columna notificaciones_pago.ventana registra cuál se mandó. A una
+# cuota le corresponde la ventana más chica que alcanza su vencimiento, así que si
+# el job no corrió algún día, la próxima corrida manda el recordatorio pendiente
+# en lugar de saltearlo.
+#
+# Un único INSERT … SELECT crea las dos notificaciones de cada cuota (alumno
+# y admin) y un UPDATE masivo marca las cuotas como notificadas.
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import String, and_, case, cast, exists, func, insert, literal, select, text, true, union_all, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+from config.settings import settings
+from models.cuota import Cuota
+from models.notificacionPago import NotificacionPago
+from models.userDetail import UserDetail
+
+TIPO = "recordatorio_vencimiento"
+
+# Clave del advisory lock de Postgres: dos corridas simultáneas no duplican recordatorios
+_LOCK_RECORDATORIOS = 0x5245434F  # "RECO"
+
+
+# 🔤 Formato de fechas y montos en SQL, igual que los mensajes armados en Python
+class fecha_dd_mm_aaaa(FunctionElement):
+    type = String()
+    inherit_cache = True
+
+
+@compiles(fecha_dd_mm_aaaa, "sqlite")
+def _fecha_sqlite(elemento, compilador, **kw):
+    return f"strftime('%d/%m/%Y', {compilador.process(elemento.clauses, **kw)})"
+
+
+@compiles(fecha_dd_mm_aaaa, "postgresql")
+def _fecha_postgres(elemento, compilador, **kw):
+    return f"to_char({compilador.process(elemento.clauses, **kw)}, 'DD/MM/YYYY')"
+
+
+class monto_con_miles(FunctionElement):
+    """Equivalente a f"{monto:,.2f}" (montos no negativos)."""
+    type = String()
+    inherit_cache = True
+
+
+@compiles(monto_con_miles, "sqlite")
+def _monto_sqlite(elemento, compilador, **kw):
+    monto = compilador.process(elemento.clauses, **kw)
+    return (
+        f"(printf('%,d', CAST({monto} AS INTEGER)) || '.' || "
+        f"printf('%02d', CAST(ROUND({monto} * 100) AS INTEGER) % 100))"
+    )
+
+
+@compiles(monto_con_miles, "postgresql")
+def _monto_postgres(elemento, compilador, **kw):
+    return f"to_char({compilador.process(elemento.clauses, **kw)}, 'FM999,999,999,990.00')"
+
+
+def ventanas_configuradas(ventanas: Optional[Iterable[int]] = None) -> List[int]:
+    """Ventanas en días, sin repetir y de la más chica a la más grande."""
+    ventanas = sorted({int(v) for v in (ventanas or settings.recordatorio_ventanas)})
+    if not ventanas or ventanas[0] < 0:
+        raise ValueError("Las ventanas de recordatorio deben ser días >= 0")
+    return ventanas
+
+
+def _candidatas(hoy: date, ventanas: List[int]):
+    """Cuotas abiertas que vencen dentro de la ventana más grande y a las que les falta recordatorio."""
+    ventana = case(
+        *[(Cuota.fecha_vencimiento <= hoy + timedelta(days=v), v) for v in ventanas]
+    ).label("ventana")
+
+    ya_enviado = exists().where(
+        NotificacionPago.cuota_id == Cuota.id,
+        NotificacionPago.tipo == TIPO,
+        NotificacionPago.ventana <= ventana,
+    )
+    nombre = func.coalesce(
+        UserDetail.firstName + literal(" ") + UserDetail.lastName,
+        literal("ID ") + cast(Cuota.alumno_id, String),
+    )
+    return (
+        select(
+            Cuota.id.label("cuota_id"),
+            Cuota.alumno_id,
+            Cuota.periodo,
+            Cuota.fecha_vencimiento,
+            Cuota.monto_a_pagar,
+            ventana,
+            nombre.label("nombre"),
+        )
+        .outerjoin(UserDetail, UserDetail.user_id == Cuota.alumno_id)
+        .where(
+            Cuota.fecha_vencimiento >= hoy,
+            Cuota.fecha_vencimiento <= hoy + timedelta(days=ventanas[-1]),
+            Cuota.estado != "pagada",
+            ~ya_enviado,
+        )
+        .subquery("candidatas")
+    )
+
+
+def generar_recordatorios(db: Session, hoy: Optional[date] = None, ventanas: Optional[Iterable[int]] = None) -> dict:
+    """
+    Crea los recordatorios que falten para hoy y marca las cuotas como notificadas,
+    en la transacción de `db` (sin commit). Devuelve un resumen con los totales.
+    """
+    hoy = hoy or date.today()
+    ventanas = ventanas_configuradas(ventanas)
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:clave)"), {"clave": _LOCK_RECORDATORIOS})
+
+    candidatas = _candidatas(hoy, ventanas)
+    c = candidatas.c
+    # Una fila por destinatario: el producto con esta tabla de dos filas duplica cada cuota
+    destinatarios = union_all(
+        select(literal("alumno").label("destinatario")),
+        select(literal("admin").label("destinatario")),
+    ).subquery("destinatarios")
+
+    vencimiento = fecha_dd_mm_aaaa(c.fecha_vencimiento)
+    mensaje = case(
+        (
+            destinatarios.c.destinatario == "alumno",
+            literal("Recordatorio: Tu cuota del período ") + c.periodo
+            + literal(" vence el ") + vencimiento
+            + literal(". Monto a pagar: $") + monto_con_miles(c.monto_a_pagar),
+        ),
+        else_=(
+            literal("El alumno ") + c.nombre
+            + literal(" tiene una cuota próxima a vencer el ") + vencimiento + literal(".")
+        ),
+    )
+    filas = select(
+        c.alumno_id,
+        c.cuota_id,
+        literal(TIPO),
+        destinatarios.c.destinatario,
+        func.substr(mensaje, 1, 255),
+        literal(datetime.now()),
+        c.ventana,
+    ).select_from(candidatas.join(destinatarios, true()))
+
+    creadas = db.execute(
+        insert(NotificacionPago).from_select(
+            ["alumno_id", "cuota_id", "tipo", "destinatario", "mensaje", "fecha_envio", "ventana"],
+            filas,
+        )
+    ).rowcount
+
+    marcadas = db.execute(
+        update(Cuota)
+        .where(
+            Cuota.fecha_vencimiento >= hoy,
+            Cuota.fecha_vencimiento <= hoy + timedelta(days=ventanas[-1]),
+            Cuota.notificada.is_not(True),
+            exists().where(
+                and_(NotificacionPago.cuota_id == Cuota.id, NotificacionPago.tipo == TIPO)
+            ),
+        )
+        .values(notificada=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    return {
+        "fecha": hoy,
+        "ventanas": ventanas,
+        "cuotas": creadas // 2,
+        "notificaciones": creadas,
+        "cuotas_marcadas": marcadas,
+    }
@@ -0,0 +1,176 @@
+# services/saldos.py
+# Resumen de deuda por alumno (tabla saldo_alumno).
+#
+# Cada operación que toca cuotas o pagos recalcula, en su misma transacción, la
+# fila de los alumnos afectados a partir de sus cuotas (pocas por alumno, vía
+# uq_cuotas_alumno_periodo) con un único INSERT … SELECT … ON CONFLICT DO UPDATE.
+# Recalcular en lugar de sumar deltas mantiene bien el período abierto más
+# antiguo y la cantidad de vencidas, que no se pueden ajustar con una resta.
+#
+# Deuda arrastrada: al generar un período el saldo de la cuota anterior pasa a
+# ajuste_anterior de la nueva, que guarda en arrastre_de de qué cuota vino
+# (routes/cuotas.py). total_a_pagar = Σ monto_a_pagar menos esos ajustes
+# arrastrados (los ajustes cargados a mano sí cuentan) y saldo = total_a_pagar −
+# total_pagado, así un pago tardío a la cuota arrastrada también descuenta. La
+# cuota arrastrada ya no cuenta como vencida ni como período abierto: esa deuda
+# la representa la cuota nueva.
+#
+# En Postgres las filas del resumen se bloquean antes de recalcular (en orden de
+# alumno_id): dos pagos simultáneos de cuotas distintas del mismo alumno se
+# serializan y el segundo lee lo que confirmó el primero.
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
+import argparse
+import sys
+
+from sqlalchemy import Select, and_, case, delete, exists, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased
+
+from models.cuota import Cuota
+from models.saldoAlumno import SaldoAlumno
+
+_COLUMNAS = [
+    "alumno_id",
+    "total_a_pagar",
+    "total_pagado",
+    "saldo",
+    "periodo_abierto_mas_antiguo",
+    "cuotas_vencidas",
+    "actualizado",
+]
+
+Alumnos = Union[Iterable[int], Select, None]
+
+
+def _filtro(alumno_ids: Alumnos):
+    if isinstance(alumno_ids, Select):
+        return alumno_ids
+    return sorted({int(a) for a in alumno_ids})
+
+
+def _columnas_resumen():
+    """total_a_pagar, total_pagado, período abierto más antiguo y vencidas, agregando por alumno."""
+    siguiente = aliased(Cuota)
+    vigente = ~exists().where(siguiente.arrastre_de == Cuota.id)  # su saldo no pasó a otra cuota
+    arrastrado = case((Cuota.arrastre_de.is_not(None), func.coalesce(Cuota.ajuste_anterior, 0)), else_=0)
+    return (
+        func.sum(func.coalesce(Cuota.monto_a_pagar, 0)) - func.sum(arrastrado),
+        func.sum(func.coalesce(Cuota.monto_pagado, 0)),
+        func.min(case((and_(Cuota.estado != "pagada", vigente), Cuota.periodo))),
+        func.sum(case((and_(Cuota.estado == "vencida", vigente), 1), else_=0)),
+    )
+
+
+def sentencias_refrescar(alumno_ids: Alumnos, dialecto: str) -> list:
+    """
+    Sentencias que recalculan el resumen de los alumnos indicados (todos con None;
+    también acepta un SELECT de alumno_id). Sirven tanto para Session como para
+    AsyncSession: se ejecutan en orden y en la misma transacción.
+    """
+    total, pagado, periodo_abierto, vencidas = _columnas_resumen()
+    filas = (
+        select(
+            Cuota.alumno_id,
+            total,
+            pagado,
+            total - pagado,
+            periodo_abierto,
+            vencidas,
+            literal(datetime.now()),
+        )
+        .group_by(Cuota.alumno_id)
+    )
+    sentencias = []
+    if alumno_ids is not None:
+        ids = _filtro(alumno_ids)
+        if not isinstance(ids, Select) and not ids:
+            return []
+        filas = filas.where(Cuota.alumno_id.in_(ids))
+        if dialecto == "postgresql":
+            sentencias.append(
+                select(SaldoAlumno.alumno_id)
+                .where(SaldoAlumno.alumno_id.in_(ids))
+                .order_by(SaldoAlumno.alumno_id)
+                .with_for_update()
+            )
+
+    insertar = (postgresql.insert if dialecto == "postgresql" else sqlite.insert)(SaldoAlumno)
+    upsert = insertar.from_select(_COLUMNAS, filas)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[SaldoAlumno.alumno_id],
+        set_={c: upsert.excluded[c] for c in _COLUMNAS[1:]},
+    )
+    sentencias.append(upsert)
+    return sentencias
+
+
+def refrescar_saldos(db: Session, alumno_ids: Alumnos) -> None:
+    """Recalcula el resumen de los alumnos indicados en la transacción de `db` (sin commit)."""
+    for sentencia in sentencias_refrescar(alumno_ids, db.get_bind().dialect.name):
+        db.execute(sentencia)
+
+
+def reconstruir_saldos(db: Session) -> int:
+    """Vuelve a armar la tabla completa desde las cuotas (sin commit). Devuelve la cantidad de alumnos."""
+    db.execute(delete(SaldoAlumno))
+    refrescar_saldos(db, None)
+    return db.scalar(select(func.count()).select_from(SaldoAlumno))
+
+
+def diferencias(db: Session) -> List[int]:
+    """Alumnos cuyo resumen no coincide con lo que dicen sus cuotas."""
+    total, pagado, periodo_abierto, vencidas = _columnas_resumen()
+    esperado = (
+        select(
+            Cuota.alumno_id.label("alumno_id"),
+            total.label("total_a_pagar"),
+            pagado.label("total_pagado"),
+            (total - pagado).label("saldo"),
+            periodo_abierto.label("periodo_abierto_mas_antiguo"),
+            vencidas.label("cuotas_vencidas"),
+        )
+        .group_by(Cuota.alumno_id)
+        .subquery("esperado")
+    )
+    return list(db.scalars(
+        select(esperado.c.alumno_id)
+        .outerjoin(SaldoAlumno, SaldoAlumno.alumno_id == esperado.c.alumno_id)
+        .where(
+            (SaldoAlumno.alumno_id.is_(None))
+            | (SaldoAlumno.total_a_pagar != esperado.c.total_a_pagar)
+            | (SaldoAlumno.saldo != esperado.c.saldo)
+            | (SaldoAlumno.total_pagado != esperado.c.total_pagado)
+            | (SaldoAlumno.cuotas_vencidas != esperado.c.cuotas_vencidas)
+            | ~SaldoAlumno.periodo_abierto_mas_antiguo.is_not_distinct_from(esperado.c.periodo_abierto_mas_antiguo)
+        )
+        .order_by(esperado.c.alumno_id)
+    ))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import config.init_db  # noqa: F401  registra todos los modelos
+    from config.db import SessionLocal
+
+    parser = argparse.ArgumentParser(prog="python -m services.saldos", description="Resumen de deuda por alumno")
+    parser.add_argument("--reconstruir", action="store_true", help="rearmar saldo_alumno desde las cuotas")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        if args.reconstruir:
+            total = reconstruir_saldos(db)
+            db.commit()
+            print(f"✅ Resumen reconstruido para {total} alumnos.")
+            return 0
+        distintos = diferencias(db)
+        if distintos:
+            print(f"❌ {len(distintos)} alumnos con el resumen desactualizado: {distintos[:20]}")
+            return 1
+        print("✅ El resumen coincide con las cuotas.")
+        return 0
+
+
+if __name__ == "__main__":
+    # python -m services.saldos                 verifica el resumen contra las cuotas
+    # python -m services.saldos --reconstruir   lo vuelve a armar completo
+    sys.exit(main())
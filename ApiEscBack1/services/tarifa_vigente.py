@@ -0,0 +1,136 @@
+# services/tarifa_vigente.py
+# Resolución de la tarifa vigente con caché en memoria.
+# Las tarifas cambian pocas veces al año: la respuesta para una fecha sólo cambia
+# en el próximo vigente_desde / vigente_hasta, o cuando se crea una tarifa nueva.
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+import threading
+import time
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.tarifa import Tarifa
+
+
+_MAX_FECHAS = 512
+
+
+@dataclass(frozen=True)
+class TarifaVigente:
+    """Copia inmutable de la fila Tarifa, independiente de la sesión que la cargó."""
+    id: int
+    monto_mensual: Decimal
+    vigente_desde: date
+    vigente_hasta: Optional[date]
+    creado_por: Optional[int]
+
+
+@dataclass(frozen=True)
+class _Entrada:
+    tarifa: Optional[TarifaVigente]
+    desde: date                 # primera fecha cubierta por la respuesta
+    hasta: Optional[date]       # primera fecha NO cubierta (próximo límite); None = sin límite
+    vence: float                # time.monotonic() de expiración (red de seguridad entre workers)
+
+    def cubre(self, fecha: date) -> bool:
+        return self.desde <= fecha and (self.hasta is None or fecha < self.hasta)
+
+
+class CacheTarifaVigente:
+    """
+    Caché por fecha de la tarifa vigente.
+    Cada entrada vale hasta el próximo límite de vigencia; crear una tarifa la invalida.
+    El TTL máximo cubre las escrituras hechas por otros workers, que no pueden invalidarla.
+    """
+
+    def __init__(self, ttl_max: float):
+        self.ttl_max = ttl_max
+        self._entradas: Dict[date, _Entrada] = {}
+        self._lock = threading.Lock()
+        self._generacion = 0    # cambia con cada invalidar()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, db: Session, fecha: Optional[date] = None) -> Optional[TarifaVigente]:
+        fecha = fecha or date.today()
+        ahora = time.monotonic()
+
+        with self._lock:
+            entrada = self._entradas.get(fecha)
+            if entrada is None:
+                # Otra fecha del mismo tramo ya resolvió la respuesta
+                entrada = next((e for e in self._entradas.values() if e.cubre(fecha)), None)
+            if entrada is not None and ahora < entrada.vence:
+                self._entradas[fecha] = entrada
+                self.aciertos += 1
+                return entrada.tarifa
+            self.fallos += 1
+            generacion = self._generacion
+
+        tarifa, hasta = _consultar_tarifa_vigente(db, fecha)
+        entrada = _Entrada(tarifa=tarifa, desde=fecha, hasta=hasta, vence=ahora + self.ttl_max)
+
+        with self._lock:
+            # Si se invalidó mientras se consultaba, la respuesta puede ser previa a la escritura
+            if self._generacion != generacion:
+                return tarifa
+            # Descartar tramos que ya terminaron antes de la fecha consultada
+            self._entradas = {
+                f: e for f, e in self._entradas.items()
+                if (e.hasta is None or e.hasta > fecha) and e.vence > ahora
+            }
+            if len(self._entradas) >= _MAX_FECHAS:
+                self._entradas.clear()
+            self._entradas[fecha] = entrada
+        return tarifa
+
+    def invalidar(self):
+        with self._lock:
+            self._generacion += 1
+            self._entradas.clear()
+
+
+def _consultar_tarifa_vigente(db: Session, fecha: date) -> Tuple[Optional[TarifaVigente], Optional[date]]:
+    """Devuelve la tarifa vigente en `fecha` y la próxima fecha en que la respuesta puede cambiar."""
+    tarifa = db.execute(
+        select(Tarifa)
+        .filter(Tarifa.vigente_desde <= fecha)
+        .filter((Tarifa.vigente_hasta == None) | (Tarifa.vigente_hasta >= fecha))
+        .order_by(Tarifa.vigente_desde.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+    limites = []
+    proximo_inicio = db.scalar(
+        select(func.min(Tarifa.vigente_desde)).where(Tarifa.vigente_desde > fecha)
+    )
+    if proximo_inicio is not None:
+        limites.append(proximo_inicio)
+    if tarifa is not None and tarifa.vigente_hasta is not None:
+        limites.append(tarifa.vigente_hasta + timedelta(days=1))
+
+    snapshot = None
+    if tarifa is not None:
+        snapshot = TarifaVigente(
+            id=tarifa.id,
+            monto_mensual=tarifa.monto_mensual,
+            vigente_desde=tarifa.vigente_desde,
+            vigente_hasta=tarifa.vigente_hasta,
+            creado_por=tarifa.creado_por,
+        )
+    return snapshot, (min(limites) if limites else None)
+
+
+cache_tarifa_vigente = CacheTarifaVigente(ttl_max=settings.tarifa_cache_ttl)
+
+
+def resolver_tarifa_vigente(db: Session, fecha: Optional[date] = None) -> Optional[TarifaVigente]:
+    return cache_tarifa_vigente.obtener(db, fecha)
+
+
+def invalidar_tarifa_vigente():
+    cache_tarifa_vigente.invalidar()
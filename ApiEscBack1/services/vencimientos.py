@@ -0,0 +1,98 @@
+# services/vencimientos.py
+# Barrido incremental de cuotas vencidas: las cuotas pendientes o parciales cuya
+# fecha de vencimiento ya pasó pasan a estado 'vencida'.
+#
+# La marca de agua (tabla marcas_agua) guarda hasta qué fecha de vencimiento se
+# barrió la última vez, así cada corrida recorre sólo los días nuevos y no toda
+# la tabla. Se relee además un margen hacia atrás (VENCIDAS_RELECTURA_DIAS) para
+# levantar cuotas cargadas tarde con un vencimiento ya pasado.
+#
+# Las cuotas se procesan en lotes de VENCIDAS_LOTE con un commit por lote: cada
+# UPDATE bloquea pocas filas y por poco tiempo, y los pagos concurrentes no
+# quedan esperando a que termine todo el barrido. El índice parcial
+# ix_cuotas_abiertas_vencimiento sólo contiene cuotas abiertas, así que las ya
+# pagadas o vencidas no se leen.
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.cuota import Cuota
+from models.marcaAgua import MarcaAgua
+from services.saldos import refrescar_saldos
+
+MARCA = "cuotas_vencidas"
+ESTADOS_ABIERTOS = ("pendiente", "parcial")
+
+
+def marcar_vencidas(db: Session, hoy: Optional[date] = None, lote: Optional[int] = None) -> dict:
+    """
+    Marca como 'vencida' las cuotas abiertas que vencieron antes de `hoy` y avanza
+    la marca de agua. Confirma cada lote por separado. Devuelve un resumen.
+    """
+    hoy = hoy or date.today()
+    lote = lote or settings.vencidas_lote
+    if lote < 1:
+        raise ValueError("El tamaño de lote debe ser >= 1")
+
+    marca = db.get(MarcaAgua, MARCA)
+    desde = None
+    if marca is not None and marca.valor is not None:
+        desde = marca.valor - timedelta(days=settings.vencidas_relectura_dias)
+
+    condiciones = [Cuota.estado.in_(ESTADOS_ABIERTOS), Cuota.fecha_vencimiento < hoy]
+    if desde is not None:
+        condiciones.append(Cuota.fecha_vencimiento >= desde)
+
+    vencidas, lotes = 0, 0
+    while True:
+        ids = db.scalars(
+            select(Cuota.id)
+            .where(*condiciones)
+            .order_by(Cuota.fecha_vencimiento, Cuota.id)
+            .limit(lote)
+        ).all()
+        if not ids:
+            break
+        # Se vuelve a filtrar por estado: si un pago saldó la cuota entre el SELECT
+        # y el UPDATE, queda 'pagada'
+        alumnos = db.scalars(
+            update(Cuota)
+            .where(Cuota.id.in_(ids), *condiciones)
+            .values(estado="vencida")
+            .returning(Cuota.alumno_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        vencidas += len(alumnos)
+        refrescar_saldos(db, alumnos)
+        db.commit()
+        lotes += 1
+        if len(ids) < lote:
+            break
+
+    hasta = hoy - timedelta(days=1)
+    if marca is None:
+        db.add(MarcaAgua(nombre=MARCA, valor=hasta))
+    elif marca.valor is None or marca.valor < hasta:
+        marca.valor = hasta
+        marca.actualizado = datetime.now()
+    db.commit()
+
+    return {
+        "fecha": hoy,
+        "desde": desde,
+        "hasta": hasta,
+        "cuotas_vencidas": vencidas,
+        "lotes": lotes,
+    }
+
+
+if __name__ == "__main__":
+    # Corrida manual: python -m services.vencimientos (desde ApiEscBack1/)
+    import config.init_db  # noqa: F401  (registra todos los modelos en el mapper)
+    from config.db import SessionLocal
+
+    with SessionLocal() as sesion:
+        print(marcar_vencidas(sesion))
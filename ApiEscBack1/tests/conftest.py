@@ -0,0 +1,65 @@
+# tests/conftest.py
+# Cada test corre contra una SQLite nueva (esquema desde los modelos) y llama a la
+# app en proceso con TestClient, sin lifespan: no arranca el outbox ni el planificador.
+# config.db arma su engine al importarse, por eso DATABASE_URL se fija antes de todo.
+import os
+import sys
+import tempfile
+
+_DIRECTORIO = tempfile.mkdtemp(prefix="apiescuela-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DIRECTORIO, 'tests.db')}"
+os.environ.pop("DATABASE_URL_READ", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import config.init_db  # noqa: F401  registra todos los modelos
+from app import api_escu
+from auth.seguridad import Seguridad
+from config.db import SessionLocal, engine, metadata
+from models.user import User
+from models.userDetail import UserDetail
+from services.tarifa_vigente import invalidar_tarifa_vigente
+
+
+@pytest.fixture(autouse=True)
+def base_limpia():
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    invalidar_tarifa_vigente()
+    Seguridad.cache.limpiar()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as sesion:
+        yield sesion
+
+
+@pytest.fixture
+def cliente():
+    return TestClient(api_escu)
+
+
+def crear_usuario(db, username: str, tipo: str = "Alumno", password: str = "-") -> User:
+    usuario = User(username=username, password=password)
+    db.add(usuario)
+    db.flush()
+    db.add(UserDetail(
+        dni=10_000_000 + usuario.id, firstName=username.capitalize(), lastName="Test",
+        type=tipo, email=f"{username}@escuela.test", user_id=usuario.id,
+    ))
+    db.commit()
+    return usuario
+
+
+def encabezados(usuario: User) -> dict:
+    return {"Authorization": f"Bearer {Seguridad.generar_token(usuario)}"}
+
+
+@pytest.fixture
+def admin(db):
+    return encabezados(crear_usuario(db, "admin", "Admin"))
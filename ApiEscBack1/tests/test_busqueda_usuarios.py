@@ -0,0 +1,17 @@
+# tests/test_busqueda_usuarios.py
+from services.busqueda_usuarios import buscar_usuarios
+from tests.conftest import crear_usuario
+
+
+def test_comodines_del_termino_no_cuentan_como_prefijo(db):
+    # Los dos contienen "a_" literal; ninguno empieza con "a_" ("ab_a_" sólo si "_" fuera comodín)
+    crear_usuario(db, "zza_")
+    crear_usuario(db, "ab_a_")
+    crear_usuario(db, "abc")
+    assert [u.username for u in buscar_usuarios(db, "a_")] == ["zza_", "ab_a_"]
+
+
+def test_prefijo_primero(db):
+    crear_usuario(db, "zana")
+    crear_usuario(db, "ana")
+    assert [u.username for u in buscar_usuarios(db, "ana")] == ["ana", "zana"]
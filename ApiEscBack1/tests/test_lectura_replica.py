@@ -0,0 +1,55 @@
+# tests/test_lectura_replica.py
+# El atraso de la réplica se mide en segundo plano: usar_replica() (get_read_db) no
+# ejecuta SQL dentro del request, así que no gasta su presupuesto de consultas.
+import asyncio
+
+from sqlalchemy import text
+
+import config.db as config_db
+from config.db import AtrasoReplica, engine, medir_atraso_en_segundo_plano, usar_replica
+from services.presupuesto_consultas import contar_consultas
+
+
+def _replica(monkeypatch):
+    """La misma SQLite hace de réplica; la medición consulta la base como en Postgres."""
+    mediciones = []
+
+    def medir():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        mediciones.append(0.0)
+        return 0.0
+
+    monkeypatch.setattr(AtrasoReplica, "_medir", staticmethod(medir))
+    monkeypatch.setattr(config_db, "read_engine", engine)
+    monkeypatch.setattr(config_db, "atraso_replica", AtrasoReplica())
+    return mediciones
+
+
+def test_usar_replica_no_consulta_la_base(monkeypatch):
+    mediciones = _replica(monkeypatch)
+
+    with contar_consultas() as registro:
+        # Sin medición todavía se lee del primario
+        assert usar_replica() is False
+    assert registro.cantidad == 0 and mediciones == []
+
+    config_db.atraso_replica.refrescar()
+    with contar_consultas() as registro:
+        assert usar_replica() is True
+    assert registro.cantidad == 0 and mediciones == [0.0]
+
+
+def test_medicion_en_segundo_plano(monkeypatch):
+    mediciones = _replica(monkeypatch)
+
+    async def correr():
+        detener = asyncio.Event()
+        tarea = asyncio.create_task(medir_atraso_en_segundo_plano(detener))
+        await asyncio.sleep(0.05)
+        detener.set()
+        await tarea
+
+    asyncio.run(correr())
+    assert mediciones
+    assert config_db.atraso_replica.actual() == 0.0
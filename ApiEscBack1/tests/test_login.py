@@ -0,0 +1,64 @@
+# tests/test_login.py
+from unittest import mock
+
+import pytest
+
+from auth import contrasenas
+from auth.contrasenas import hashear
+from services.presupuesto_consultas import contar_consultas
+from tests.conftest import crear_usuario
+
+
+def _login(cliente, username: str, password: str):
+    return cliente.post("/user/loginUser", json={"username": username, "password": password})
+
+
+def test_login_correcto(cliente, db):
+    crear_usuario(db, "ana", password=hashear("secreta"))
+    respuesta = _login(cliente, "ana", "secreta")
+    assert respuesta.status_code == 200
+    assert respuesta.json()["user"] == {"type": "Alumno"}
+
+
+def test_usuario_inexistente_tambien_verifica_argon2(cliente, db):
+    crear_usuario(db, "ana", password=hashear("secreta"))
+    with mock.patch.object(contrasenas, "verificar", wraps=contrasenas.verificar) as verificar:
+        inexistente = _login(cliente, "nadie", "secreta")
+        erronea = _login(cliente, "ana", "otra")
+    assert inexistente.status_code == erronea.status_code == 401
+    assert inexistente.json() == erronea.json()
+    # Una verificación Argon2 en cada caso: la de relleno para el usuario inexistente
+    assert [c.args[0].startswith("$argon2") for c in verificar.call_args_list] == [True, True]
+    assert verificar.call_args_list[0].args[0] == contrasenas.hash_relleno()
+
+
+def test_login_heredado_erroneo_tambien_verifica_argon2(cliente, db):
+    crear_usuario(db, "ana", password="texto-plano")
+    relleno = contrasenas.hash_relleno()
+    with mock.patch.object(contrasenas, "hasher", wraps=contrasenas.hasher) as hasher:
+        respuesta = _login(cliente, "ana", "otra")
+    assert respuesta.status_code == 401
+    assert [c.args[0] for c in hasher.verify.call_args_list] == [relleno]
+
+
+def test_login_heredado_migra_el_hash_sin_releer_el_usuario(cliente, db):
+    crear_usuario(db, "ana", password="texto-plano")
+    with contar_consultas() as registro:
+        respuesta = _login(cliente, "ana", "texto-plano")
+    assert respuesta.status_code == 200
+    assert respuesta.json()["user"] == {"type": "Alumno"}
+    # SELECT con el detalle + UPDATE del hash; ningún SELECT posterior al commit
+    selects = [sql for sql, _, _ in registro.sentencias if sql.lstrip().upper().startswith("SELECT")]
+    updates = [sql for sql, _, _ in registro.sentencias if sql.lstrip().upper().startswith("UPDATE")]
+    assert (len(selects), len(updates)) == (1, 1)
+    assert _login(cliente, "ana", "texto-plano").status_code == 200
+
+
+def test_pool_cerrado_no_pierde_cupos(monkeypatch):
+    cerrado = mock.Mock()
+    cerrado.submit.side_effect = RuntimeError("cannot schedule new futures after shutdown")
+    monkeypatch.setattr(contrasenas, "_pool", cerrado)
+    # Más intentos que cupos: si alguno se perdiera, terminaría en 503
+    for _ in range(contrasenas.settings.hash_workers * contrasenas.settings.hash_cola_por_worker + 1):
+        with pytest.raises(RuntimeError):
+            contrasenas.hashear_en_pool("x")
@@ -0,0 +1,61 @@
+# tests/test_pagos.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app import api_escu
+from models.cuota import Cuota
+from models.pago import Pago
+from services.saldos import diferencias, refrescar_saldos
+from tests.conftest import crear_usuario, encabezados
+
+PAGOS_SIMULTANEOS = 16
+
+
+def test_nuevo_pago_cuota_inexistente_responde_404(cliente, admin, db):
+    alumno = crear_usuario(db, "alumno")
+    respuesta = cliente.post("/pagos/nuevo", headers=admin, json={
+        "alumno_id": alumno.id, "cuota_id": 999, "monto_pagado": "100", "metodo": "efectivo",
+    })
+    assert respuesta.status_code == 404
+    assert respuesta.json()["detail"] == "Cuota no encontrada"
+
+
+def test_nuevo_pago_solo_admin_o_alumno(cliente, db):
+    docente = crear_usuario(db, "docente", "Docente")
+    respuesta = cliente.post("/pagos/nuevo", headers=encabezados(docente), json={
+        "alumno_id": docente.id, "cuota_id": 1, "monto_pagado": "100", "metodo": "efectivo",
+    })
+    assert respuesta.status_code == 403
+
+
+def test_pagos_simultaneos_no_pierden_actualizaciones(admin, db):
+    """Lo mismo que benchmarks/stress_pagos_concurrentes.py, en chico y con hilos."""
+    alumno = crear_usuario(db, "alumno")
+    monto = Decimal("10.00")
+    total = monto * PAGOS_SIMULTANEOS
+    cuota = Cuota(alumno.id, "2026-09", date(2026, 9, 10), total, total)
+    cuota.saldo_pendiente = total
+    db.add(cuota)
+    db.flush()
+    refrescar_saldos(db, [alumno.id])
+    db.commit()
+
+    cuerpo = {"alumno_id": alumno.id, "cuota_id": cuota.id, "monto_pagado": str(monto), "metodo": "efectivo"}
+
+    def pagar(_):
+        return TestClient(api_escu).post("/pagos/nuevo", headers=admin, json=cuerpo).status_code
+
+    with ThreadPoolExecutor(max_workers=PAGOS_SIMULTANEOS) as hilos:
+        codigos = list(hilos.map(pagar, range(PAGOS_SIMULTANEOS)))
+    assert codigos == [200] * PAGOS_SIMULTANEOS
+
+    db.expire_all()
+    cuota = db.get(Cuota, cuota.id)
+    pagado = db.scalar(select(func.sum(Pago.monto_pagado)).where(Pago.cuota_id == cuota.id))
+    assert cuota.monto_pagado == pagado == total
+    assert (cuota.saldo_pendiente, cuota.estado) == (0, "pagada")
+    assert diferencias(db) == []
@@ -0,0 +1,73 @@
+# tests/test_recaudacion.py
+# recaudacion_diaria se mantiene en cada alta, baja, edición e importación de
+# pagos: después de cada paso tiene que coincidir con recalcular desde los pagos.
+import io
+
+from sqlalchemy import select
+
+from models.cuota import Cuota
+from models.pago import Pago
+from services.recaudacion import diferencias
+from tests.conftest import crear_usuario
+
+
+def _cuotas(cliente, admin, db):
+    respuesta = cliente.post("/tarifas/", headers=admin, json={"monto_mensual": 1000, "vigente_desde": "2026-01-01"})
+    assert respuesta.status_code == 201, respuesta.text
+    for periodo, vencimiento in (("2026-09", "2026-09-10"), ("2026-10", "2026-10-10")):
+        respuesta = cliente.post(
+            "/cuotas/generar-periodo", headers=admin,
+            json={"periodo": periodo, "fecha_vencimiento": vencimiento},
+        )
+        assert respuesta.status_code == 200, respuesta.text
+    return dict(db.execute(select(Cuota.periodo, Cuota.id)).all())
+
+
+def _pagar(cliente, admin, alumno_id, cuota_id, monto, metodo):
+    respuesta = cliente.post("/pagos/nuevo", headers=admin, json={
+        "alumno_id": alumno_id, "cuota_id": cuota_id, "monto_pagado": monto, "metodo": metodo,
+    })
+    assert respuesta.status_code == 200, respuesta.text
+
+
+def test_recaudacion_coincide_con_los_pagos(cliente, admin, db):
+    alumno = crear_usuario(db, "alumno")
+    cuotas = _cuotas(cliente, admin, db)
+
+    # ➕ Altas
+    _pagar(cliente, admin, alumno.id, cuotas["2026-09"], "300", "efectivo")
+    _pagar(cliente, admin, alumno.id, cuotas["2026-09"], "200", "transferencia")
+    _pagar(cliente, admin, alumno.id, cuotas["2026-10"], "150", "efectivo")
+    assert diferencias(db) == []
+
+    primero, segundo, tercero = db.scalars(select(Pago.id).order_by(Pago.id)).all()
+
+    # ⚙️ Edición: cambia monto, método y cuota (mueve el movimiento de período)
+    respuesta = cliente.patch(f"/pagos/editar/{primero}", headers=admin, json={"monto_pagado": 250, "metodo": "tarjeta"})
+    assert respuesta.status_code == 200, respuesta.text
+    respuesta = cliente.patch(f"/pagos/editar/{segundo}", headers=admin, json={"cuota_id": cuotas["2026-10"]})
+    assert respuesta.status_code == 200, respuesta.text
+    db.expire_all()
+    assert diferencias(db) == []
+
+    # ➖ Baja
+    respuesta = cliente.delete(f"/pagos/eliminar/{tercero}", headers=admin)
+    assert respuesta.status_code == 200, respuesta.text
+    db.expire_all()
+    assert diferencias(db) == []
+
+    # 📦 Lote (con una fila repetida que no debe sumar)
+    archivo = (
+        "cuota_id;alumno_id;periodo;monto_pagado;metodo;comprobante;fecha_pago\n"
+        f"{cuotas['2026-09']};;;100,50;transferencia;B-1;2026-09-05\n"
+        f";{alumno.id};2026-10;1.000,00;efectivo;B-2;2026-10-01\n"
+        f"{cuotas['2026-09']};;;100,50;transferencia;B-1;2026-09-05\n"
+    )
+    respuesta = cliente.post(
+        "/pagos/lote", headers=admin,
+        files={"archivo": ("banco.csv", io.BytesIO(archivo.encode()), "text/csv")},
+    )
+    assert respuesta.status_code == 200, respuesta.text
+    db.expire_all()
+    assert db.scalar(select(Pago.id).where(Pago.comprobante == "B-2")) is not None
+    assert diferencias(db) == []
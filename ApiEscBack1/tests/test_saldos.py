@@ -0,0 +1,82 @@
+# tests/test_saldos.py
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select, update
+
+from models.cuota import Cuota
+from models.saldoAlumno import SaldoAlumno
+from services.saldos import diferencias, reconstruir_saldos, refrescar_saldos
+from tests.conftest import crear_usuario
+
+
+def _generar(cliente, admin, periodo: str, vencimiento: str):
+    respuesta = cliente.post(
+        "/cuotas/generar-periodo", headers=admin,
+        json={"periodo": periodo, "fecha_vencimiento": vencimiento},
+    )
+    assert respuesta.status_code == 200, respuesta.text
+
+
+def test_deuda_arrastrada_se_cuenta_una_vez(cliente, admin, db):
+    alumno = crear_usuario(db, "alumno")
+    respuesta = cliente.post("/tarifas/", headers=admin, json={"monto_mensual": 1000, "vigente_desde": "2026-01-01"})
+    assert respuesta.status_code == 201, respuesta.text
+
+    _generar(cliente, admin, "2026-09", "2026-09-10")
+    _generar(cliente, admin, "2026-11", "2026-11-10")
+    # La cuota de noviembre arrastra los 1000 impagos de septiembre
+    septiembre = db.scalar(select(Cuota.id).where(Cuota.periodo == "2026-09"))
+    noviembre = db.scalar(select(Cuota).where(Cuota.periodo == "2026-11"))
+    assert (noviembre.monto_a_pagar, noviembre.arrastre_de) == (Decimal("2000"), septiembre)
+
+    saldo = db.get(SaldoAlumno, alumno.id)
+    assert (saldo.total_a_pagar, saldo.saldo) == (Decimal("2000"), Decimal("2000"))
+    # Septiembre ya no está abierta: su deuda es la de noviembre
+    assert saldo.periodo_abierto_mas_antiguo == "2026-11"
+
+    respuesta = cliente.post("/pagos/nuevo", headers=admin, json={
+        "alumno_id": alumno.id, "cuota_id": septiembre, "monto_pagado": "300", "metodo": "efectivo",
+    })
+    assert respuesta.status_code in (200, 201), respuesta.text
+
+    resumen = cliente.get(f"/cuotas/resumen/{alumno.id}", headers=admin).json()
+    assert resumen["saldo"] == 1700
+    assert resumen["total_pagado"] == 300
+    assert diferencias(db) == []
+
+
+def test_ajuste_manual_y_vencidas_arrastradas(cliente, admin, db):
+    alumno = crear_usuario(db, "alumno")
+    respuesta = cliente.post("/tarifas/", headers=admin, json={"monto_mensual": 1000, "vigente_desde": "2026-01-01"})
+    assert respuesta.status_code == 201, respuesta.text
+
+    _generar(cliente, admin, "2026-08", "2026-08-10")
+    _generar(cliente, admin, "2026-09", "2026-09-10")  # arrastra los 1000 de agosto
+    # Un recargo cargado a mano sí es deuda
+    respuesta = cliente.post("/cuotas/", json={
+        "alumno_id": alumno.id, "periodo": "2026-10", "fecha_vencimiento": "2026-10-10",
+        "monto_base": 1000, "ajuste_anterior": 250, "monto_a_pagar": 1250,
+    })
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.json()["arrastre_de"] is None
+
+    db.execute(update(Cuota).where(Cuota.periodo.in_(["2026-08", "2026-09"])).values(estado="vencida"))
+    refrescar_saldos(db, [alumno.id])
+    db.commit()
+
+    saldo = db.get(SaldoAlumno, alumno.id)
+    assert (saldo.total_a_pagar, saldo.saldo) == (Decimal("3250"), Decimal("3250"))
+    # Agosto se arrastró a septiembre: no cuenta como vencida ni como período abierto
+    assert (saldo.cuotas_vencidas, saldo.periodo_abierto_mas_antiguo) == (1, "2026-09")
+    assert diferencias(db) == []
+
+
+def test_diferencias_detecta_resumen_desactualizado(db):
+    alumno = crear_usuario(db, "alumno")
+    db.add(Cuota(alumno.id, "2026-09", date(2026, 9, 10), 1000, 1000))
+    db.commit()
+    assert diferencias(db) == [alumno.id]
+    reconstruir_saldos(db)
+    db.commit()
+    assert diferencias(db) == []
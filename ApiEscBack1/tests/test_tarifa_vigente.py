@@ -0,0 +1,23 @@
+# tests/test_tarifa_vigente.py
+from datetime import date
+
+import services.tarifa_vigente as tarifa_vigente
+from services.tarifa_vigente import CacheTarifaVigente
+
+
+def test_invalidar_durante_la_consulta_no_guarda_la_respuesta_vieja(db, monkeypatch):
+    cache = CacheTarifaVigente(ttl_max=3600)
+    consultar = tarifa_vigente._consultar_tarifa_vigente
+
+    def consultar_y_crear_tarifa(db, fecha):
+        respuesta = consultar(db, fecha)
+        cache.invalidar()  # crear_tarifa confirma entre la consulta y el guardado
+        return respuesta
+
+    monkeypatch.setattr(tarifa_vigente, "_consultar_tarifa_vigente", consultar_y_crear_tarifa)
+    assert cache.obtener(db, date(2026, 9, 1)) is None
+    assert cache.fallos == 1
+
+    monkeypatch.setattr(tarifa_vigente, "_consultar_tarifa_vigente", consultar)
+    cache.obtener(db, date(2026, 9, 1))
+    assert (cache.aciertos, cache.fallos) == (0, 2)
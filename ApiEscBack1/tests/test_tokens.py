@@ -0,0 +1,25 @@
+# tests/test_tokens.py
+from auth.seguridad import Seguridad
+from tests.conftest import crear_usuario, encabezados
+
+
+def test_logout_revoca_el_token_hasta_su_vencimiento(cliente, db):
+    alumno = crear_usuario(db, "ana")
+    propio, otro = encabezados(alumno), encabezados(alumno)
+    assert propio != otro  # cada login emite un token distinto (jti)
+
+    assert cliente.get("/user/profile", headers=propio).status_code == 200  # queda en la caché
+    assert cliente.post("/user/logout", headers=propio).status_code == 200
+
+    for _ in range(2):  # ni la caché ni un jwt.decode nuevo lo vuelven a aceptar
+        respuesta = cliente.get("/user/profile", headers=propio)
+        assert respuesta.status_code == 401
+        assert respuesta.json()["detail"] == "Token revocado."
+    assert cliente.get("/user/profile", headers=otro).status_code == 200
+
+
+def test_revocado_sin_cache(cliente, db, monkeypatch):
+    monkeypatch.setattr(Seguridad.cache, "maximo", 0)
+    headers = encabezados(crear_usuario(db, "ana"))
+    Seguridad.revocar_token(headers["Authorization"].split(" ")[1])
+    assert cliente.get("/user/profile", headers=headers).status_code == 401